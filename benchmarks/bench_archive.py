@@ -0,0 +1,104 @@
+"""Compare loading hourly history from a UsageArchive with pickle and JSON.
+
+Years of synthetic hourly reads are stored as a pickled list of CostReads,
+a JSON list and a UsageArchive. The benchmark times loading everything, a
+one-week range query and, for the archive, NumPy views of the whole file.
+
+Run with: PYTHONPATH=. python benchmarks/bench_archive.py [--years N]
+"""
+
+import argparse
+import pickle
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from pydantic import TypeAdapter
+
+from bidgely import CostRead, UsageArchive
+
+TZ = ZoneInfo("America/Toronto")
+READS = TypeAdapter(list[CostRead])
+
+
+def make_reads(years: int) -> list[CostRead]:
+    """Hourly reads starting 2020-01-01, about 5% missing temperature."""
+    rng = random.Random(0)
+    first = int(datetime(2020, 1, 1, tzinfo=TZ).timestamp())
+    return [
+        CostRead(
+            start_time=datetime.fromtimestamp(ts, TZ),
+            end_time=datetime.fromtimestamp(ts + 3599, TZ),
+            consumption=rng.uniform(0.1, 3.0),
+            cost=rng.uniform(0.01, 0.5),
+            temperature=rng.randint(-20, 30) if rng.random() > 0.05 else None,
+            itemization=None,
+        )
+        for ts in range(first, first + years * 365 * 86400, 3600)
+    ]
+
+
+def best(label: str, func: Any, repeat: int = 3) -> Any:
+    times = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - begin)
+    print(f"{label:<34} {min(times) * 1000:10.2f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    reads = make_reads(args.years)
+    week = (datetime(2022, 6, 1, tzinfo=TZ), datetime(2022, 6, 8, tzinfo=TZ))
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        pickled = directory / "reads.pickle"
+        pickled.write_bytes(pickle.dumps(reads))
+        as_json = directory / "reads.json"
+        as_json.write_bytes(READS.dump_json(reads))
+        with UsageArchive(directory / "reads.bda") as archive:
+            archive.append_reads(reads)
+        sizes = {p.name: p.stat().st_size for p in directory.iterdir()}
+        print(f"{len(reads)} hourly reads; bytes on disk: {sizes}")
+
+        def from_pickle() -> list[CostRead]:
+            loaded: list[CostRead] = pickle.loads(pickled.read_bytes())
+            return loaded
+
+        def from_json() -> list[CostRead]:
+            return READS.validate_json(as_json.read_bytes())
+
+        def archive_numpy() -> int:
+            with UsageArchive(directory / "reads.bda") as archive:
+                return int(archive.to_numpy()["consumption"].sum() > 0)
+
+        def archive_week() -> int:
+            with UsageArchive(directory / "reads.bda") as archive:
+                return len(archive.read(*week))
+
+        def pickle_week() -> int:
+            return len([r for r in from_pickle() if week[0] <= r.start_time < week[1]])
+
+        best("pickle: load all", from_pickle)
+        best("json: load all", from_json)
+        best("pickle: one week", pickle_week)
+        best("archive: open + numpy views", archive_numpy)
+        assert best("archive: open + one week", archive_week) == pickle_week()
+        with UsageArchive(directory / "reads.bda") as archive:
+            assert list(archive.read(*week)) == [
+                r for r in reads if week[0] <= r.start_time < week[1]
+            ]
+            best("archive: read all as UsageColumns", lambda: len(archive.read()), 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare the original usage-chart-data decode loop with bidgely's current one.
+
+Run with: PYTHONPATH=. python benchmarks/bench_decode.py [--reads N] [--itemization]
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+from typing import Any
+
+from bidgely import decode
+from bidgely.bidgely import CostRead, Itemization, MeasurementCategory, _parse_payload
+
+
+def make_body(n_reads: int, itemization: bool) -> bytes:
+    """Return a usage-chart-data response body with n_reads hourly reads."""
+    start = datetime(2023, 1, 1)
+    payload = []
+    for i in range(n_reads):
+        t0 = start + timedelta(hours=i)
+        t1 = t0 + timedelta(hours=1, seconds=-1)
+        items = [
+            {
+                "id": n,
+                "category": str(category),
+                "usage": 12,
+                "cost": 3,
+                "percentage": 14,
+                "costPercentage": 14,
+            }
+            for n, category in enumerate(MeasurementCategory)
+        ]
+        payload.append(
+            {
+                "intervalStart": int(t0.timestamp()),
+                "intervalEnd": int(t1.timestamp()),
+                "intervalStartDate": t0.isoformat(),
+                "intervalEndDate": t1.isoformat(),
+                "consumption": 0.42,
+                "cost": 0.05,
+                "temperature": 12,
+                "itemizationDetailsList": items if itemization else None,
+            }
+        )
+    return json.dumps({"requestId": "bench", "payload": payload}).encode()
+
+
+def legacy(body: bytes, skip_itemization: bool) -> list[CostRead]:
+    """The decode loop async_fetch used before the bulk path."""
+    reads: dict[str, Any] = json.loads(body.decode())
+    result = []
+    for read in reads["payload"]:
+        if not skip_itemization and read["itemizationDetailsList"] is not None:
+            items = []
+            for item in read["itemizationDetailsList"]:
+                items.append(
+                    Itemization(
+                        id=item["id"],
+                        category=item["category"],
+                        usage=int(item["usage"]),
+                        cost=int(item["cost"]),
+                        percentage=int(item["percentage"]),
+                        cost_percentage=int(item["costPercentage"]),
+                    )
+                )
+        else:
+            items = None
+        result.append(
+            CostRead(
+                start_time=datetime.fromisoformat(read["intervalStartDate"]),
+                end_time=datetime.fromisoformat(read["intervalEndDate"]),
+                consumption=read["consumption"],
+                cost=read["cost"],
+                temperature=read["temperature"],
+                itemization=items,
+            )
+        )
+    return result
+
+
+def current(body: bytes, skip_itemization: bool) -> list[CostRead]:
+    """The decode path async_fetch uses now."""
+    return _parse_payload(decode.loads(body)["payload"], skip_itemization)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reads", type=int, default=8760)
+    parser.add_argument("--itemization", action="store_true")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = make_body(args.reads, args.itemization)
+    skip = not args.itemization
+    assert legacy(body, skip) == current(body, skip)
+
+    print(f"{args.reads} reads, itemization={args.itemization}, json={decode.BACKEND}")
+    for name, func in (("legacy", legacy), ("current", current)):
+        best = min(
+            timeit.repeat(lambda: func(body, skip), number=1, repeat=args.repeat)
+        )
+        print(f"{name:>8}: {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
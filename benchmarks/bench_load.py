@@ -0,0 +1,235 @@
+"""End-to-end load benchmark against the local stand-in server.
+
+The stand-in runs in a subprocess so its CPU and memory stay out of the
+numbers. Scenarios: async_login, async_get_usage_data in every AggregateType
+and fleet-sized usage and forecast runs. For each it reports requests/sec,
+p50/p99 request latency as seen by the client, and peak memory, followed
+by how many connections the pool opened and reused.
+
+Run with: PYTHONPATH=. python benchmarks/bench_load.py [--accounts N] [--latency S]
+    [--error-rate R] [--throttle-rate R] [--rate-limit N] [--tracemalloc]
+"""
+
+import argparse
+import asyncio
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from bidgely import (
+    AggregateType,
+    Bidgely,
+    BidgelyFleet,
+    Credentials,
+    LoginManager,
+    RequestScheduler,
+    RetryPolicy,
+    connection_stats,
+    create_session,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from standin import use_standin  # noqa: E402
+
+PASSWORD = "password"
+
+
+class Recorder:
+    """Time every request on a session with an aiohttp TraceConfig."""
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.failures = 0
+        self.trace = aiohttp.TraceConfig()
+        self.trace.on_request_start.append(self._start)
+        self.trace.on_request_end.append(self._end)
+        self.trace.on_request_exception.append(self._exception)
+
+    async def _start(self, session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        ctx.start = time.perf_counter()
+
+    async def _end(self, session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        self.latencies.append(time.perf_counter() - ctx.start)
+        if params.response.status >= 400:
+            self.failures += 1
+
+    async def _exception(self, session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        self.failures += 1
+
+    def reset(self) -> None:
+        self.latencies.clear()
+        self.failures = 0
+
+
+def _quantile(values: list[float], q: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q * 100) - 1]
+
+
+@asynccontextmanager
+async def standin_process(args: argparse.Namespace) -> AsyncIterator[str]:
+    """Start benchmarks/standin.py and yield its URL."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(Path(__file__).resolve().parent / "standin.py"),
+        "--latency",
+        str(args.latency),
+        "--jitter",
+        str(args.jitter),
+        "--error-rate",
+        str(args.error_rate),
+        "--throttle-rate",
+        str(args.throttle_rate),
+        "--retry-after",
+        "0.2",
+        "--password",
+        PASSWORD,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    assert process.stdout is not None
+    line = (await process.stdout.readline()).decode()
+    try:
+        yield line.rsplit(" ", 1)[1].strip()
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+async def run(
+    name: str,
+    recorder: Recorder,
+    scenario: Callable[[], Awaitable[int]],
+    use_tracemalloc: bool,
+) -> None:
+    """Run one scenario and print its row."""
+    recorder.reset()
+    if use_tracemalloc:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    items = await scenario()
+    elapsed = time.perf_counter() - start
+    if use_tracemalloc:
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+    else:
+        # ru_maxrss is in KiB on Linux: the process high-water mark so far.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+    latencies = recorder.latencies
+    print(
+        f"{name:<16}{len(latencies):>8}{recorder.failures:>7}{items:>9}"
+        f"{len(latencies) / elapsed:>9.1f}"
+        f"{_quantile(latencies, 0.5) * 1e3:>9.1f}"
+        f"{_quantile(latencies, 0.99) * 1e3:>9.1f}"
+        f"{elapsed:>8.2f}{peak:>9.1f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.tracemalloc:
+        tracemalloc.start()
+    recorder = Recorder()
+    async with (
+        standin_process(args) as url,
+        create_session(trace_configs=[recorder.trace]) as session,
+    ):
+        kwargs: dict[str, Any] = use_standin(url)
+        kwargs["scheduler"] = RequestScheduler(args.max_concurrency, args.rate_limit)
+        kwargs["retry"] = RetryPolicy(attempts=4, base_delay=0.05)
+        end = datetime.now() - timedelta(days=1)
+        spans = {
+            AggregateType.MONTH: timedelta(days=3 * 365),
+            AggregateType.DAY: timedelta(days=365),
+            AggregateType.HOUR: timedelta(days=60),
+        }
+        clients = [
+            Bidgely(
+                session,
+                "HydroOttawa",
+                f"user{n}@example.com",
+                PASSWORD,
+                str(n),
+                **kwargs,
+            )
+            for n in range(args.accounts)
+        ]
+
+        print(
+            f"{'scenario':<16}{'requests':>8}{'failed':>7}{'items':>9}"
+            f"{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'secs':>8}"
+            f"{'peak MB' if args.tracemalloc else 'rss MB':>9}"
+        )
+
+        async def login() -> int:
+            manager = LoginManager(args.accounts)
+            errors = await manager.async_login_all(clients)
+            # Cognito calls go through boto3, not aiohttp, so time whole logins.
+            logins = list(manager.pool.stats.stages["login"])
+            recorder.latencies[:] = logins[-len(clients) :]
+            return sum(error is None for error in errors)
+
+        await run("login", recorder, login, args.tracemalloc)
+
+        for agg, span in spans.items():
+
+            async def usage(agg: AggregateType = agg, span: timedelta = span) -> int:
+                reads = await clients[0].async_get_usage_data(
+                    "ELECTRIC", agg, end - span, end
+                )
+                return len(reads)
+
+            await run(f"usage {agg}", recorder, usage, args.tracemalloc)
+
+        credentials = [
+            Credentials(
+                utility="HydroOttawa",
+                username=f"user{n}@example.com",
+                password=PASSWORD,
+                account_id=str(n),
+            )
+            for n in range(args.accounts)
+        ]
+        async with BidgelyFleet(credentials, session=session, **kwargs) as fleet:
+
+            async def fleet_usage() -> int:
+                total = 0
+                async for result in fleet.aiter_usage_data(
+                    "ELECTRIC", AggregateType.DAY, end - timedelta(days=90), end
+                ):
+                    total += len(result.value.reads) if result.ok else 0
+                return total
+
+            async def fleet_forecast() -> int:
+                return sum([result.ok async for result in fleet.aiter_forecast()])
+
+            await run("fleet usage", recorder, fleet_usage, args.tracemalloc)
+            await run("fleet forecast", recorder, fleet_forecast, args.tracemalloc)
+
+        stats = connection_stats(session)
+        assert stats is not None
+        print(
+            f"connections: {stats.created} created, {stats.reused} reused "
+            f"({stats.reuse_ratio:.0%})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    parser.add_argument("--rate-limit", type=float, default=200.0)
+    parser.add_argument("--tracemalloc", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,91 @@
+"""Compare rolling HOUR reads up locally with summing CostReads pairwise.
+
+A year of synthetic hourly reads in America/Toronto is rolled up into days
+and months. Totals are checked against CostRead.__add__ before timing,
+including the 23 and 25 hour days at the DST changes.
+
+Run with: PYTHONPATH=. python benchmarks/bench_rollup.py [--days N]
+"""
+
+import argparse
+import math
+import random
+import timeit
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from bidgely import AggregateType, CostRead, UsageColumns
+from bidgely.rollup import rollup
+
+TZ = ZoneInfo("America/Toronto")
+
+
+def make_reads(days: int) -> list[CostRead]:
+    """Hourly reads starting 2024-01-01, about 5% missing temperature."""
+    rng = random.Random(0)
+    first = int(datetime(2024, 1, 1, tzinfo=TZ).timestamp())
+    return [
+        CostRead(
+            start_time=datetime.fromtimestamp(ts, TZ),
+            end_time=datetime.fromtimestamp(ts + 3599, TZ),
+            consumption=rng.uniform(0.1, 3.0),
+            cost=rng.uniform(0.01, 0.5),
+            temperature=rng.randint(-20, 30) if rng.random() > 0.05 else None,
+            itemization=None,
+        )
+        for ts in range(first, first + days * 86400, 3600)
+    ]
+
+
+def pairwise(reads: list[CostRead], key: str) -> dict[date, CostRead]:
+    """The rollup callers had to write before: CostRead.__add__ per bucket."""
+    buckets: dict[date, CostRead] = {}
+    for read in reads:
+        day = read.start_time.date()
+        bucket = day.replace(day=1) if key == "month" else day
+        buckets[bucket] = buckets[bucket] + read if bucket in buckets else read
+    return buckets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=366)
+    args = parser.parse_args()
+
+    reads = make_reads(args.days)
+    columns = UsageColumns.from_reads(reads)
+    for agg, key in ((AggregateType.DAY, "day"), (AggregateType.MONTH, "month")):
+        expected = pairwise(reads, key)
+        result = list(rollup(columns, agg, TZ))
+        assert len(result) == len(expected)
+        for read in result:
+            other = expected[read.start_time.date()]
+            assert read.start_time == other.start_time
+            # Buckets end at the calendar boundary, so a last month cut short
+            # by --days ends after its last read.
+            assert read.end_time == other.end_time or read is result[-1]
+            assert read.consumption is not None and other.consumption is not None
+            assert math.isclose(read.consumption, other.consumption)
+        # Same-zone datetime subtraction is wall-clock time, so use epochs.
+        seconds = {
+            read.start_time.date(): int(
+                read.end_time.timestamp() - read.start_time.timestamp() + 1
+            )
+            for read in result
+        }
+        if agg == AggregateType.DAY and args.days >= 366:
+            assert seconds[date(2024, 3, 10)] == 23 * 3600
+            assert seconds[date(2024, 11, 3)] == 25 * 3600
+        print(f"{agg}: {len(result)} buckets match CostRead.__add__")
+
+    for agg, key in ((AggregateType.DAY, "day"), (AggregateType.MONTH, "month")):
+        legacy = timeit.timeit(lambda: pairwise(reads, key), number=3) / 3
+        current = timeit.timeit(lambda: rollup(columns, agg, TZ), number=3) / 3
+        print(
+            f"{agg:<6} pairwise: {legacy * 1e3:8.1f} ms"
+            f"  rollup: {current * 1e3:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Measure the CPU cost of a Cognito SRP login and how long it blocks the loop.
+
+A fake Cognito client answers the SRP challenge locally, so only the client
+side math is timed: the original per-login setup against the precomputed
+constants and key pairs, and the event loop lag while many logins run at once.
+
+Run with: PYTHONPATH=. python benchmarks/bench_srp.py [--logins N] [--workers N]
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from bidgely.utilities import aws_srp
+from bidgely.utilities.aws_srp import (
+    AWSSRP,
+    BIG_N,
+    G,
+    G_HEX,
+    K,
+    calculate_u,
+    compute_hkdf,
+    get_random,
+    hash_sha256,
+    hex_hash,
+    hex_to_long,
+    long_to_hex,
+    n_hex,
+    pad_hex,
+)
+
+POOL_ID = "ca-central-1_benchmark"
+CLIENT_ID = "benchmark"
+SALT = "5ba3c14e9a1f2b7c"
+
+
+class FakeCognito:
+    """Answers USER_SRP_AUTH like Cognito, for one fixed password.
+
+    With verify set the password claim is checked, so a wrong client side
+    key fails loudly. Without it the fake does no big-int work of its own
+    and only the client is measured.
+    """
+
+    def __init__(self, password: str, verify: bool = True) -> None:
+        self.password = password
+        self.verify = verify
+        self.small_b = get_random(128) % BIG_N
+        self.g_b = pow(G, self.small_b, BIG_N)
+        self.verifiers: dict[str, int] = {}
+        # username -> (A, B) of the login in progress.
+        self.sessions: dict[str, tuple[int, int]] = {}
+
+    def _verifier(self, username: str) -> int:
+        if username not in self.verifiers:
+            identity = "%s%s:%s" % (POOL_ID.split("_")[1], username, self.password)
+            x = hex_to_long(hex_hash(pad_hex(SALT) + hash_sha256(identity.encode())))
+            self.verifiers[username] = pow(G, x, BIG_N)
+        return self.verifiers[username]
+
+    def initiate_auth(self, **kwargs: Any) -> dict[str, Any]:
+        username = kwargs["AuthParameters"]["USERNAME"]
+        big_a = hex_to_long(kwargs["AuthParameters"]["SRP_A"])
+        big_b = (K * self._verifier(username) + self.g_b) % BIG_N
+        self.sessions[username] = (big_a, big_b)
+        return {
+            "ChallengeName": "PASSWORD_VERIFIER",
+            "ChallengeParameters": {
+                "USER_ID_FOR_SRP": username,
+                "SALT": SALT,
+                "SRP_B": long_to_hex(big_b),
+                "SECRET_BLOCK": base64.standard_b64encode(os.urandom(32)).decode(),
+            },
+        }
+
+    def respond_to_auth_challenge(self, **kwargs: Any) -> dict[str, Any]:
+        claim = kwargs["ChallengeResponses"]
+        username = claim["USERNAME"]
+        big_a, big_b = self.sessions.pop(username)
+        if not self.verify:
+            return {"AuthenticationResult": {"AccessToken": "token"}}
+        u = calculate_u(big_a, big_b)
+        s = pow(big_a * pow(self._verifier(username), u, BIG_N), self.small_b, BIG_N)
+        key = compute_hkdf(
+            bytes.fromhex(pad_hex(s)), bytes.fromhex(pad_hex(long_to_hex(u)))
+        )
+        msg = (
+            POOL_ID.split("_")[1].encode()
+            + username.encode()
+            + base64.standard_b64decode(claim["PASSWORD_CLAIM_SECRET_BLOCK"])
+            + claim["TIMESTAMP"].encode()
+        )
+        expected = hmac.new(key, msg, hashlib.sha256).digest()
+        if (
+            base64.standard_b64encode(expected).decode()
+            != claim["PASSWORD_CLAIM_SIGNATURE"]
+        ):
+            raise ValueError("password claim does not verify")
+        return {"AuthenticationResult": {"AccessToken": "token"}}
+
+
+def legacy_setup() -> None:
+    """The per-instance work AWSSRP.__init__ used to do."""
+    big_n = hex_to_long(n_hex)
+    g = hex_to_long(G_HEX)
+    hex_to_long(hex_hash("00" + n_hex + "0" + G_HEX))
+    small_a = get_random(128) % big_n
+    pow(g, small_a, big_n)
+
+
+async def login_lag(logins: int, workers: int, prefill: bool) -> tuple[float, float]:
+    """Run logins concurrently; return (seconds, worst event loop lag)."""
+    loop = asyncio.get_running_loop()
+    client = FakeCognito("hunter2", verify=False)
+    for n in range(logins):
+        client._verifier(f"user{n}")
+    executor = ThreadPoolExecutor(max_workers=workers)
+    aws_srp._key_pairs.clear()
+    if prefill:
+        await asyncio.wrap_future(aws_srp.prefill_key_pairs(executor, logins))
+    lags: list[float] = []
+    done = False
+
+    async def probe() -> None:
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - before - 0.001)
+
+    async def login(n: int) -> None:
+        aws = AWSSRP(
+            f"user{n}",
+            "hunter2",
+            POOL_ID,
+            CLIENT_ID,
+            loop,
+            client=client,  # type: ignore[arg-type]
+            executor=executor,
+        )
+        await aws.authenticate_user()
+
+    probe_task = asyncio.ensure_future(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(login(n) for n in range(logins)))
+    elapsed = time.perf_counter() - start
+    done = True
+    await probe_task
+    executor.shutdown()
+    return elapsed, max(lags, default=0.0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"big int backend: {aws_srp.BIG_INT_BACKEND}")
+    n = 20
+    legacy = timeit.timeit(legacy_setup, number=n) / n
+    generate = timeit.timeit(aws_srp.generate_key_pair, number=n) / n
+    aws_srp.fill_key_pairs(n)
+    warm = timeit.timeit(aws_srp.take_key_pair, number=n) / n
+    print(f"per-login setup, legacy: {legacy * 1e3:.2f} ms")
+    print(
+        f"key pair, generated: {generate * 1e3:.2f} ms, prefilled: {warm * 1e3:.4f} ms"
+    )
+
+    loop = asyncio.new_event_loop()
+    aws = AWSSRP("u", "hunter2", POOL_ID, CLIENT_ID, loop, client="fake")
+    auth = {"AuthParameters": aws.get_auth_params()}
+    params = FakeCognito("hunter2").initiate_auth(**auth)["ChallengeParameters"]
+    challenge = timeit.timeit(lambda: aws.process_challenge(params), number=n)
+    fake = FakeCognito("hunter2")
+    params = fake.initiate_auth(**auth)["ChallengeParameters"]
+    fake.respond_to_auth_challenge(ChallengeResponses=aws.process_challenge(params))
+    loop.close()
+    print(f"process_challenge: {challenge / n * 1e3:.2f} ms")
+
+    for prefill in (False, True):
+        elapsed, lag = asyncio.run(login_lag(args.logins, args.workers, prefill))
+        print(
+            f"{args.logins} logins, prefill={prefill}: {elapsed * 1e3:.0f} ms, "
+            f"worst loop lag {lag * 1e3:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
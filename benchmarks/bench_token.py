@@ -0,0 +1,73 @@
+"""Compare the original SSO token encryption with create_bidgely_token(s).
+
+Every token is checked byte for byte against the original implementation
+before anything is timed.
+
+Run with: PYTHONPATH=. python benchmarks/bench_token.py [--tokens N]
+"""
+
+import argparse
+import base64
+import json
+import secrets
+import timeit
+from collections import OrderedDict
+
+from py3rijndael import RijndaelCbc, ZeroPadding
+
+from bidgely.utilities.hydroottawa import (
+    create_bidgely_payload,
+    create_bidgely_token,
+    create_bidgely_tokens,
+)
+
+
+def legacy_token(payload: OrderedDict[str, str]) -> str:
+    """create_bidgely_token before the key schedule was shared."""
+    cipher = RijndaelCbc(
+        key="tG@$=gQGyu_Lcqvt/4Vb6y4sWV6j-VmC",
+        iv="%rAn_BLzP+JwAAGGXe5PQ(ZrBgtpfUzq",
+        padding=ZeroPadding(32),
+        block_size=32,
+    )
+    text = json.dumps(payload, separators=(",", ":")).encode()
+    result = cipher.encrypt(text.ljust(32, b"\x1b"))
+    return base64.b64encode(result).decode()
+
+
+def make_payloads(n: int) -> list[OrderedDict[str, str]]:
+    """Payloads with Cognito-sized tokens, plus short edge cases."""
+    payloads = [create_bidgely_payload("", "", ""), create_bidgely_payload("1", "", "")]
+    for i in range(n):
+        payloads.append(
+            create_bidgely_payload(
+                str(1000000 + i),
+                secrets.token_urlsafe(800 + i % 64),
+                secrets.token_urlsafe(1300 + i % 32),
+            )
+        )
+    return payloads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.tokens)
+    expected = [legacy_token(payload) for payload in payloads]
+    assert [create_bidgely_token(payload) for payload in payloads] == expected
+    assert create_bidgely_tokens(payloads) == expected
+    # Short payloads exercise the b"\x1b" fill to one block.
+    assert create_bidgely_token(OrderedDict()) == legacy_token(OrderedDict())
+    print(f"{len(payloads) + 1} tokens identical to the original implementation")
+
+    legacy = timeit.timeit(lambda: [legacy_token(p) for p in payloads], number=1)
+    current = timeit.timeit(lambda: create_bidgely_tokens(payloads), number=1)
+    per = len(payloads)
+    print(f"legacy:  {legacy / per * 1e3:.2f} ms/token")
+    print(f"current: {current / per * 1e3:.2f} ms/token")
+
+
+if __name__ == "__main__":
+    main()
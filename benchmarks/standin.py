@@ -0,0 +1,672 @@
+"""Local stand-in for the Bidgely NA Read API, Hydro Ottawa SSO and Cognito.
+
+One aiohttp app serves all three on a single port:
+
+* every GET path in bidgely-openapi.yaml, with query parameters checked
+  against the spec. usage-chart-data, billingcycles, billprojections,
+  itemization-widget-data, users and endpoints return generated data;
+  paths without a handler answer 501.
+* POST /api/v1/sso/dashboard, which decrypts the sessionToken like the
+  Hydro Ottawa portal and redirects with a Bidgely uuid and token.
+* POST /, a Cognito InitiateAuth/RespondToAuthChallenge responder that runs
+  the server side of USER_SRP_AUTH and REFRESH_TOKEN_AUTH. Every username
+  exists and StandInConfig.password is the only valid password.
+
+latency applies to every response; error_rate and throttle_rate only to the
+Bidgely data paths, so logins stay reliable while data calls degrade.
+
+Run on its own with: PYTHONPATH=. python benchmarks/standin.py [--port N] [--latency S]
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import math
+import random
+import re
+import secrets
+import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import yaml
+from aiohttp import web
+from py3rijndael import RijndaelCbc, ZeroPadding
+from pydantic.dataclasses import dataclass
+
+from bidgely.bidgely import MeasurementCategory
+from bidgely.utilities import hydroottawa
+from bidgely.utilities.aws_srp import (
+    BIG_N,
+    G,
+    K,
+    calculate_u,
+    compute_hkdf,
+    get_random,
+    hash_sha256,
+    hex_hash,
+    hex_to_long,
+    long_to_hex,
+    pad_hex,
+    powmod,
+)
+from bidgely.utilities.cognito import CognitoPool, set_cognito_pool
+
+SPEC = Path(__file__).resolve().parent.parent / "bidgely-openapi.yaml"
+SSO_PATH = "/api/v1/sso/dashboard"
+COGNITO_TARGET = "AWSCognitoIdentityProviderService."
+# Paths whose responses are degraded by error_rate and throttle_rate.
+DATA_PREFIXES = ("/v2.0/", "/2.1/", "/billingdata/", "/streams/")
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+@dataclass(slots=True)
+class StandInConfig:
+    """Behaviour knobs; they can be changed while the server runs."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    password: str = "password"
+    verify_srp: bool = True
+    token_lifetime: int = 3600
+    timezone: str = "America/Toronto"
+    # Day of the month every billing cycle starts on; 1 is calendar months.
+    cycle_day: int = 1
+    # How many cycles back billingcycles reaches when t0 is 0.
+    cycle_history: int = 36
+    # Homes and meters reported by /v2.0/users and its endpoints.
+    homes: int = 1
+    gas: bool = False
+
+
+def load_operations(spec: Path = SPEC) -> dict[str, list[dict[str, Any]]]:
+    """Map every GET path in the spec to its query parameters."""
+    document = yaml.safe_load(spec.read_text())
+    shared = document["components"]["parameters"]
+    operations = {}
+    for path, item in document["paths"].items():
+        if "get" not in item:
+            continue
+        parameters = [
+            shared[p["$ref"].rsplit("/", 1)[1]] if "$ref" in p else p
+            for p in item["get"].get("parameters", [])
+        ]
+        operations[path] = [p for p in parameters if p["in"] == "query"]
+    return operations
+
+
+def check_query(parameters: list[dict[str, Any]], query: Any) -> str | None:
+    """Return why query does not match the spec, or None."""
+    for parameter in parameters:
+        name = parameter["name"]
+        schema = parameter.get("schema", {})
+        if name not in query:
+            if parameter.get("required"):
+                return f"Missing required parameter {name}"
+            continue
+        value = query[name]
+        if "enum" in schema and value not in [str(v) for v in schema["enum"]]:
+            return f"Invalid value {value} for {name}"
+        if schema.get("type") == "integer" and not re.fullmatch(r"-?\d+", value):
+            return f"{name} must be an integer"
+        if schema.get("type") == "boolean" and value not in ("true", "false"):
+            return f"{name} must be true or false"
+    return None
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response(
+        {
+            "requestId": None,
+            "payload": None,
+            "error": {"code": str(status), "message": message},
+        },
+        status=status,
+    )
+
+
+def _cognito_error(kind: str, message: str) -> web.Response:
+    return web.json_response(
+        {"__type": kind, "message": message},
+        status=400,
+        content_type="application/x-amz-json-1.1",
+    )
+
+
+class StandIn:
+    """The stand-in app plus the state behind its fake logins."""
+
+    def __init__(self, config: StandInConfig | None = None, spec: Path = SPEC) -> None:
+        self.config = config if config is not None else StandInConfig()
+        self.operations = load_operations(spec)
+        self.stats: Counter[str] = Counter()
+        self.url: str | None = None
+        self._runner: web.AppRunner | None = None
+        self._random = random.Random()
+        self._pool_name = hydroottawa.POOL_ID.split("_")[1]
+        self._token_cipher = RijndaelCbc(
+            key=hydroottawa.TOKEN_KEY,
+            iv=hydroottawa.TOKEN_IV,
+            padding=ZeroPadding(hydroottawa.BLOCK_SIZE),
+            block_size=hydroottawa.BLOCK_SIZE,
+        )
+        # One server secret b for every login; fine for a stand-in.
+        self._small_b = get_random(128) % BIG_N
+        self._g_b = powmod(G, self._small_b, BIG_N)
+        self._verifiers: dict[str, int] = {}
+        self._srp: dict[str, tuple[str, int, int]] = {}
+        self._access: dict[str, str] = {}
+        self._refresh: dict[str, str] = {}
+        self._bearers: dict[str, str] = {}
+        self.app = self._build_app()
+
+    def _build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        handlers: dict[str, Handler] = {
+            "/v2.0/dashboard/users/{user-id}/usage-chart-data": self.usage_chart_data,
+            "/2.1/users/{user-id}/homes/{home-id}/billprojections": (
+                self.billprojections
+            ),
+            "/billingdata/users/{user-id}/homes/{home-id}/billingcycles": (
+                self.billingcycles
+            ),
+            "/v2.0/dashboard/users/{user-id}/itemization-widget-data": (
+                self.itemization_widget_data
+            ),
+            "/v2.0/users/{user-id}": self.user,
+            "/v2.0/users/{user-id}/endpoints": self.endpoints,
+        }
+        for path in self.operations:
+            route = re.sub(
+                r"\{([^}]+)\}", lambda m: "{" + m[1].replace("-", "_") + "}", path
+            )
+            app.router.add_get(route, self._spec_handler(path, handlers.get(path)))
+        app.router.add_post(SSO_PATH, self.sso)
+        app.router.add_post("/", self.cognito)
+        app.router.add_get("/_stats", self.get_stats)
+        app.router.add_post("/_config", self.set_config)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on host:port (0 picks a free port) and return the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{bound}"
+        return self.url
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Handler
+    ) -> web.StreamResponse:
+        self.stats["requests"] += 1
+        config = self.config
+        if config.latency:
+            spread = config.latency * config.jitter
+            await asyncio.sleep(
+                max(0.0, config.latency + self._random.uniform(-spread, spread))
+            )
+        if request.path.startswith(DATA_PREFIXES):
+            roll = self._random.random()
+            if roll < config.throttle_rate:
+                self.stats["429"] += 1
+                throttled = _error(429, "Too Many Requests")
+                throttled.headers["Retry-After"] = f"{config.retry_after:g}"
+                return throttled
+            if roll < config.throttle_rate + config.error_rate:
+                self.stats["500"] += 1
+                return _error(500, "Internal Server Error")
+        response = await handler(request)
+        self.stats[str(response.status)] += 1
+        return response
+
+    def _spec_handler(self, path: str, handler: Handler | None) -> Handler:
+        parameters = self.operations[path]
+
+        async def checked(request: web.Request) -> web.StreamResponse:
+            problem = check_query(parameters, request.query)
+            if problem is not None:
+                return _error(400, problem)
+            user_id = request.match_info.get("user_id")
+            bearer = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            if user_id is not None and self._bearers.get(bearer) != user_id:
+                return web.json_response(
+                    {
+                        "error": "unauthorized",
+                        "error-description": (
+                            "Full authentication is required to access this resource"
+                        ),
+                    },
+                    status=401,
+                )
+            if handler is None:
+                return _error(501, f"{path} is not implemented by the stand-in")
+            return await handler(request)
+
+        return checked
+
+    # Bidgely
+
+    def _intervals(
+        self, mode: str, start: int, end: int
+    ) -> list[tuple[datetime, datetime]]:
+        tz = ZoneInfo(self.config.timezone)
+        t = datetime.fromtimestamp(start, tz)
+        if mode == "year":
+            t = t.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        elif mode == "month":
+            t = t.replace(hour=0, minute=0, second=0, microsecond=0)
+        else:
+            t = t.replace(minute=0, second=0, microsecond=0)
+        intervals = []
+        while t.timestamp() <= end:
+            if mode == "year":
+                following = (t.replace(day=28) + timedelta(days=4)).replace(day=1)
+            elif mode == "month":
+                following = (t + timedelta(days=1)).replace(hour=0)
+            else:
+                following = datetime.fromtimestamp(t.timestamp() + 3600, tz)
+            intervals.append((t, following))
+            t = following
+        return intervals
+
+    async def usage_chart_data(self, request: web.Request) -> web.StreamResponse:
+        """Generated reads for each interval of the mode between start and end."""
+        query = request.query
+        if "start" not in query or "end" not in query:
+            return _error(400, "start and end are required unless mode is year")
+        itemize = query.get("skip-itemization") == "false"
+        categories = list(MeasurementCategory)[:4]
+        payload = []
+        for t0, t1 in self._intervals(
+            query["mode"], int(query["start"]), int(query["end"])
+        ):
+            hours = (t1.timestamp() - t0.timestamp()) / 3600
+            # Daily cycle peaking in the evening.
+            consumption = round(
+                hours * (0.8 + 0.4 * math.sin((t0.hour - 12) / 24 * 2 * math.pi)), 3
+            )
+            cost = round(consumption * 0.11, 4)
+            payload.append(
+                {
+                    "intervalStart": int(t0.timestamp()),
+                    "intervalEnd": int(t1.timestamp()) - 1,
+                    "intervalStartDate": t0.isoformat(),
+                    "intervalEndDate": (t1 - timedelta(seconds=1)).isoformat(),
+                    "cost": cost,
+                    "consumption": consumption,
+                    "isWeekend": t0.weekday() >= 5,
+                    "itemizationDetailsList": [
+                        {
+                            "id": n,
+                            "category": str(category),
+                            "usage": int(consumption * 1000) // len(categories),
+                            "cost": int(cost * 100) // len(categories),
+                            "percentage": 100 // len(categories),
+                            "costPercentage": 100 // len(categories),
+                        }
+                        for n, category in enumerate(categories)
+                    ]
+                    if itemize
+                    else None,
+                    "touDetails": None,
+                    "tierDetails": None,
+                    "temperature": int(
+                        10
+                        + 12
+                        * math.sin((t0.timetuple().tm_yday - 110) / 365 * 2 * math.pi)
+                    ),
+                    "isOngoingInterval": False,
+                    "isMissingDataInterval": False,
+                }
+            )
+        return web.json_response(
+            {"requestId": str(uuid.uuid4()), "payload": payload, "error": None}
+        )
+
+    def _cycle(self, t: datetime) -> tuple[datetime, datetime]:
+        """The billing cycle containing t; the end is its last second."""
+        day = self.config.cycle_day
+        start = t.replace(day=day, hour=0, minute=0, second=0, microsecond=0)
+        if start > t:
+            start = (start.replace(day=1) - timedelta(days=1)).replace(day=day)
+        following = (start.replace(day=28) + timedelta(days=4)).replace(day=day)
+        return start, following - timedelta(seconds=1)
+
+    async def billingcycles(self, request: web.Request) -> web.StreamResponse:
+        """Cycles overlapping t0 to t1, the last one still open."""
+        tz = ZoneInfo(self.config.timezone)
+        now = datetime.now(tz)
+        t1 = min(int(request.query.get("t1", now.timestamp())), int(now.timestamp()))
+        first = self._cycle(now)[0]
+        for _ in range(self.config.cycle_history - 1):
+            first = self._cycle(first - timedelta(days=1))[0]
+        t = max(first, datetime.fromtimestamp(int(request.query.get("t0", 0)), tz))
+        payload = []
+        while t.timestamp() <= t1:
+            start, end = self._cycle(t)
+            payload.append(
+                {
+                    "billingStartTs": int(start.timestamp()),
+                    "billingEndTs": int(end.timestamp()),
+                    "bcStartDate": start.date().isoformat(),
+                    "bcEndDate": end.date().isoformat(),
+                }
+            )
+            t = end + timedelta(seconds=1)
+        return web.json_response(
+            {"requestId": str(uuid.uuid4()), "payload": payload, "error": None}
+        )
+
+    async def itemization_widget_data(self, request: web.Request) -> web.StreamResponse:
+        """Category totals for the previous billing cycle."""
+        now = datetime.now(ZoneInfo(self.config.timezone))
+        start, end = self._cycle(self._cycle(now)[0] - timedelta(days=1))
+        categories = list(MeasurementCategory)
+        usage = 600
+        return web.json_response(
+            {
+                "requestId": str(uuid.uuid4()),
+                "payload": {
+                    "itemizationDetails": {
+                        "startTs": int(start.timestamp()),
+                        "endTs": int(end.timestamp()),
+                        "startDateFormatted": start.date().isoformat(),
+                        "endDateFormatted": end.date().isoformat(),
+                        "electric": [
+                            {
+                                "id": n,
+                                "category": str(category),
+                                "usage": usage // len(categories),
+                                "cost": int(usage * 0.11) // len(categories),
+                                "percentage": 100 // len(categories),
+                                "costPercentage": 100 // len(categories),
+                            }
+                            for n, category in enumerate(categories)
+                        ],
+                        "context": {"electricity": {"percentage": True}, "gas": None},
+                    },
+                },
+            }
+        )
+
+    async def user(self, request: web.Request) -> web.StreamResponse:
+        """The user and the ids of their homes."""
+        return web.json_response(
+            {
+                "requestId": str(uuid.uuid4()),
+                "payload": {
+                    "userId": request.match_info["user_id"],
+                    "homes": [
+                        {"homeId": home} for home in range(1, self.config.homes + 1)
+                    ],
+                },
+                "error": None,
+            }
+        )
+
+    async def endpoints(self, request: web.Request) -> web.StreamResponse:
+        """An electricity meter, and a gas meter when configured."""
+        kinds = ["ELECTRICITY", "GAS"] if self.config.gas else ["ELECTRICITY"]
+        return web.json_response(
+            {
+                "requestId": str(uuid.uuid4()),
+                "payload": [
+                    {
+                        "endpointId": f"{kind.lower()}-1",
+                        "measurementType": kind,
+                        "profile": "ami",
+                    }
+                    for kind in kinds
+                ],
+                "error": None,
+            }
+        )
+
+    async def billprojections(self, request: web.Request) -> web.StreamResponse:
+        """A projection for the open billing cycle, recomputed at midnight.
+
+        Like a CDN in front of Bidgely, it sends an ETag and Last-Modified
+        and answers 304 when the client already has today's projection.
+        """
+        tz = ZoneInfo(self.config.timezone)
+        now = datetime.now(tz)
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        etag = '"{}-{}-{}"'.format(
+            today.date().isoformat(),
+            request.match_info["home_id"],
+            request.query.get("measurement-type", "ELECTRIC"),
+        )
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(today.timestamp(), usegmt=True),
+        }
+        since = request.headers.get("If-Modified-Since")
+        if request.headers.get("If-None-Match") == etag or (
+            "If-None-Match" not in request.headers
+            and since is not None
+            and parsedate_to_datetime(since) >= today
+        ):
+            return web.Response(status=304, headers=headers)
+        start, end = self._cycle(now)
+        elapsed = (today - start) / (end - start)
+        usage = round(24 * 0.8 * (today - start).days + 5, 2)
+        projected = round(usage / max(elapsed, 0.01), 2)
+        return web.json_response(
+            {
+                "projectionPrice": round(projected * 0.11, 2),
+                "budgetThresholdAmount": None,
+                "currentPrice": round(usage * 0.11, 2),
+                "averageBillingPrice": round(600 * 0.11, 2),
+                "averageBillingConsumption": 600.0,
+                "projectionStatus": 1,
+                "projectionConsumption": projected,
+                "currentConsumption": usage,
+                "daysLeft": (end - today).days,
+                "billStart": int(start.timestamp()),
+                "billEnd": int(end.timestamp()),
+                "billStartDate": start.isoformat(),
+                "billEndDate": end.isoformat(),
+                "billStartDateFormatted": start.date().isoformat(),
+                "billEndDateFormatted": end.date().isoformat(),
+                "lastBillPrice": None,
+                "previousYearBillPrice": None,
+                "lastBillPriceDifference": None,
+                "previousYearBillPriceDifference": None,
+            },
+            headers=headers,
+        )
+
+    # Hydro Ottawa SSO
+
+    async def sso(self, request: web.Request) -> web.StreamResponse:
+        """Trade an encrypted Cognito session for a Bidgely uuid and token."""
+        form = await request.post()
+        try:
+            cipher_text = base64.b64decode(str(form["sessionToken"]))
+            text = self._token_cipher.decrypt(cipher_text).rstrip(b"\x1b")
+            session = json.loads(text)
+            username = self._access[session["accessToken"]]
+        except (KeyError, ValueError):
+            return web.Response(status=401)
+        user_id = str(uuid.uuid5(uuid.NAMESPACE_URL, username))
+        bearer = secrets.token_hex(16)
+        self._bearers[bearer] = user_id
+        location = f"{self.url}/dashboard?uuid={user_id}&token={bearer}&sso-token=1"
+        return web.Response(status=302, headers={"Location": location})
+
+    # Cognito
+
+    def _verifier(self, username: str) -> int:
+        if username not in self._verifiers:
+            identity = f"{self._pool_name}{username}:{self.config.password}"
+            x = hex_to_long(
+                hex_hash(pad_hex(_salt(username)) + hash_sha256(identity.encode()))
+            )
+            self._verifiers[username] = powmod(G, x, BIG_N)
+        return self._verifiers[username]
+
+    def _issue(self, username: str, refresh: bool) -> dict[str, Any]:
+        # Sized like a real Cognito JWT so token encryption costs the same.
+        access = secrets.token_urlsafe(800)
+        self._access[access] = username
+        result: dict[str, Any] = {
+            "AccessToken": access,
+            "ExpiresIn": self.config.token_lifetime,
+            "TokenType": "Bearer",
+            "IdToken": secrets.token_urlsafe(64),
+        }
+        if refresh:
+            token = secrets.token_urlsafe(1300)
+            self._refresh[token] = username
+            result["RefreshToken"] = token
+        return {"AuthenticationResult": result, "ChallengeParameters": {}}
+
+    async def cognito(self, request: web.Request) -> web.StreamResponse:
+        """Answer the Cognito calls AWSSRP and async_refresh make."""
+        target = request.headers.get("X-Amz-Target", "").removeprefix(COGNITO_TARGET)
+        body = json.loads(await request.read())
+        if target == "InitiateAuth" and body["AuthFlow"] == "USER_SRP_AUTH":
+            username = body["AuthParameters"]["USERNAME"]
+            big_a = hex_to_long(body["AuthParameters"]["SRP_A"])
+            big_b = (K * self._verifier(username) + self._g_b) % BIG_N
+            secret_block = base64.standard_b64encode(secrets.token_bytes(32)).decode()
+            self._srp[secret_block] = (username, big_a, big_b)
+            result = {
+                "ChallengeName": "PASSWORD_VERIFIER",
+                "ChallengeParameters": {
+                    "USER_ID_FOR_SRP": username,
+                    "SALT": _salt(username),
+                    "SRP_B": long_to_hex(big_b),
+                    "SECRET_BLOCK": secret_block,
+                },
+            }
+        elif target == "InitiateAuth" and body["AuthFlow"] == "REFRESH_TOKEN_AUTH":
+            username = self._refresh.get(body["AuthParameters"]["REFRESH_TOKEN"], "")
+            if not username:
+                return _cognito_error("NotAuthorizedException", "Invalid Refresh Token")
+            result = self._issue(username, refresh=False)
+        elif target == "RespondToAuthChallenge":
+            claim = body["ChallengeResponses"]
+            state = self._srp.pop(claim["PASSWORD_CLAIM_SECRET_BLOCK"], None)
+            if state is None or not self._check_claim(state, claim):
+                return _cognito_error(
+                    "NotAuthorizedException", "Incorrect username or password."
+                )
+            result = self._issue(state[0], refresh=True)
+        else:
+            return _cognito_error(
+                "InvalidParameterException", f"{target} is not supported"
+            )
+        return web.json_response(result, content_type="application/x-amz-json-1.1")
+
+    def _check_claim(self, state: tuple[str, int, int], claim: dict[str, str]) -> bool:
+        username, big_a, big_b = state
+        if not self.config.verify_srp:
+            return True
+        u = calculate_u(big_a, big_b)
+        verifier = self._verifier(username)
+        s = powmod(big_a * powmod(verifier, u, BIG_N), self._small_b, BIG_N)
+        key = compute_hkdf(
+            bytes.fromhex(pad_hex(s)), bytes.fromhex(pad_hex(long_to_hex(u)))
+        )
+        msg = (
+            self._pool_name.encode()
+            + username.encode()
+            + base64.standard_b64decode(claim["PASSWORD_CLAIM_SECRET_BLOCK"])
+            + claim["TIMESTAMP"].encode()
+        )
+        signature = base64.standard_b64encode(
+            hmac.new(key, msg, hashlib.sha256).digest()
+        )
+        return hmac.compare_digest(
+            signature.decode(), claim["PASSWORD_CLAIM_SIGNATURE"]
+        )
+
+    # Control
+
+    async def get_stats(self, request: web.Request) -> web.StreamResponse:
+        """Response counts: requests, plus one entry per status."""
+        return web.json_response(dict(self.stats))
+
+    async def set_config(self, request: web.Request) -> web.StreamResponse:
+        """Update config fields from a JSON object, e.g. {"latency": 0.05}."""
+        for name, value in (await request.json()).items():
+            setattr(self.config, name, value)
+        return web.json_response({"ok": True})
+
+
+def _salt(username: str) -> str:
+    """A stable per-user salt, as Cognito keeps one per user."""
+    return hashlib.sha256(username.encode()).hexdigest()[:32]
+
+
+def use_standin(url: str, max_workers: int = 8) -> dict[str, str]:
+    """Point logins at the stand-in; returns the Bidgely kwargs to do the same.
+
+    This replaces the process-wide Cognito pool and the Hydro Ottawa SSO URL.
+    """
+    set_cognito_pool(CognitoPool(max_workers=max_workers, endpoint_url=url))
+    hydroottawa.HydroOttawa.sso_url = url + SSO_PATH
+    return {"base_url": url}
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    config = StandInConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        password=args.password,
+        verify_srp=not args.no_verify_srp,
+        cycle_day=args.cycle_day,
+    )
+    standin = StandIn(config)
+    url = await standin.start(args.host, args.port)
+    print(f"listening on {url}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await standin.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="fraction of latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--no-verify-srp", action="store_true")
+    parser.add_argument("--cycle-day", type=int, default=1, choices=range(1, 29))
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
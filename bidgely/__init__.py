@@ -2,23 +2,75 @@ import logging
 
 from .bidgely import (
     AggregateType,
+    BillingCycle,
     Bidgely,
     CostRead,
     Forecast,
+    SyncResult,
     UnitOfMeasure,
+    UsageResult,
     get_supported_utilities,
 )
-from .exceptions import CannotConnect, InvalidAuth
+from .archive import UsageArchive
+from .auth import AccountInfo, AuthTokens, FileTokenStore, Meter, TokenStore
+from .cache import MemoryCache, SQLiteCache, UsageCache
+from .coalesce import RequestCoalescer
+from .columnar import UsageColumns
+from .exceptions import CannotConnect, IncompleteData, InvalidAuth
+from .fleet import AccountResult, BidgelyFleet, Credentials
+from .login import LoginManager
+from .metrics import MetricsSink, PrometheusSink, set_metrics_sink, trace_config
+from .retry import RetryPolicy
+from .scheduler import RequestScheduler
+from .transport import (
+    API_PROFILE,
+    BACKFILL_PROFILE,
+    ConnectionStats,
+    TransportProfile,
+    connection_stats,
+    create_session,
+)
 
 __all__ = [
+    "API_PROFILE",
+    "AccountInfo",
+    "AccountResult",
     "AggregateType",
+    "AuthTokens",
+    "BACKFILL_PROFILE",
     "Bidgely",
+    "BidgelyFleet",
+    "BillingCycle",
     "CannotConnect",
+    "ConnectionStats",
     "CostRead",
+    "Credentials",
+    "FileTokenStore",
     "Forecast",
+    "IncompleteData",
     "InvalidAuth",
+    "LoginManager",
+    "Meter",
+    "MemoryCache",
+    "MetricsSink",
+    "PrometheusSink",
+    "RequestCoalescer",
+    "RequestScheduler",
+    "RetryPolicy",
+    "SQLiteCache",
+    "SyncResult",
+    "TokenStore",
+    "TransportProfile",
     "UnitOfMeasure",
+    "UsageArchive",
+    "UsageCache",
+    "UsageColumns",
+    "UsageResult",
+    "connection_stats",
+    "create_session",
     "get_supported_utilities",
+    "set_metrics_sink",
+    "trace_config",
 ]
 
 logging.getLogger("bidgely").addHandler(logging.NullHandler())
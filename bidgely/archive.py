@@ -0,0 +1,425 @@
+"""An append-only, memory-mapped archive of one account's usage reads.
+
+Years of hourly reads are kept in two files of fixed-width little-endian
+records, so they load without parsing and range queries are a binary search:
+
+    <path>        64 byte header, then one 40 byte record per read
+    <path>.items  40 byte itemization records referenced by the reads
+
+A read record holds start (epoch seconds), item_start (index of its first
+itemization record; it runs to the next read's item_start), consumption,
+cost, duration (seconds to its end_time) and temperature. Missing values are
+NaN. Records are kept sorted by start, so the start column is the time index.
+
+The header stores how many records of each file are committed. Appends write
+past that point, fsync, and only then update the header, so a crash leaves
+the archive as it was before the append, less any reads from the first one
+it was replacing or moving on.
+Files never shrink, so NumPy views of the mapping stay readable.
+"""
+
+import math
+import mmap
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from datetime import datetime, timezone, tzinfo
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+from zoneinfo import ZoneInfo
+
+from .bidgely import CostRead, MeasurementCategory
+from .columnar import UsageColumns, _import
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAGIC = b"BIDGELY\x00"
+VERSION = 1
+# magic, version, record size, item record size, reads, items, timezone
+_HEADER = struct.Struct("<8sHHIqq32s")
+# start, item_start, consumption, cost, duration, temperature
+_RECORD = struct.Struct("<qqddif")
+# id, usage, cost, percentage, cost_percentage, category
+_ITEM = struct.Struct("<qqqiiB7x")
+_START = struct.Struct("<q")
+# Itemization categories by code. Only append to this: codes are on disk.
+_CATEGORIES = tuple(str(category) for category in MeasurementCategory)
+_CATEGORY_CODES = {category: code for code, category in enumerate(_CATEGORIES)}
+
+
+def _record_dtype(np: Any) -> Any:
+    return np.dtype(
+        [
+            ("start", "<i8"),
+            ("item_start", "<i8"),
+            ("consumption", "<f8"),
+            ("cost", "<f8"),
+            ("duration", "<i4"),
+            ("temperature", "<f4"),
+        ]
+    )
+
+
+def _item_dtype(np: Any) -> Any:
+    return np.dtype(
+        {
+            "names": ["id", "usage", "cost", "percentage", "cost_percentage", "code"],
+            "formats": ["<i8", "<i8", "<i8", "<i4", "<i4", "u1"],
+            "offsets": [0, 8, 16, 24, 28, 32],
+            "itemsize": _ITEM.size,
+        }
+    )
+
+
+def _tz_name(tz: tzinfo | None) -> str:
+    if isinstance(tz, ZoneInfo):
+        return tz.key
+    if isinstance(tz, timezone):
+        return datetime(2000, 1, 1, tzinfo=tz).isoformat()[19:] or "+00:00"
+    return ""
+
+
+def _tz_from_name(name: str) -> tzinfo | None:
+    if not name:
+        return None
+    if name[0] in "+-":
+        return datetime.fromisoformat(f"2000-01-01T00:00:00{name}").tzinfo
+    return ZoneInfo(name)
+
+
+def _timestamp(value: datetime | None) -> int | None:
+    return None if value is None else math.ceil(value.timestamp())
+
+
+class _Starts:
+    """The start column of the mapped records, indexable for bisect."""
+
+    def __init__(self, archive: "UsageArchive") -> None:
+        self._archive = archive
+
+    def __len__(self) -> int:
+        return self._archive._reads
+
+    def __getitem__(self, row: int) -> int:
+        offset = _HEADER.size + row * _RECORD.size
+        return int(_START.unpack_from(self._archive._map, offset)[0])
+
+
+class UsageArchive:
+    """Reads of one account and measurement in a memory-mapped file.
+
+    Opening creates the files if needed; tz is recorded for a new archive
+    and otherwise taken from the file. Use as a context manager or call
+    close(). One process may append at a time.
+    """
+
+    def __init__(self, path: str | Path, tz: tzinfo | None = None) -> None:
+        self.path: Path = Path(path)
+        self.items_path: Path = Path(f"{self.path}.items")
+        if not self.path.exists():
+            with open(self.path, "xb") as f:
+                f.write(
+                    _HEADER.pack(MAGIC, VERSION, _RECORD.size, _ITEM.size, 0, 0, b"")
+                )
+        self.items_path.touch()
+        self._file = open(self.path, "r+b")
+        self._items_file = open(self.items_path, "r+b")
+        magic, version, record_size, item_size, reads, items, name = _HEADER.unpack(
+            self._file.read(_HEADER.size)
+        )
+        if magic != MAGIC or (record_size, item_size) != (_RECORD.size, _ITEM.size):
+            self.close()
+            raise ValueError(f"{self.path} is not a usage archive")
+        if version > VERSION:
+            self.close()
+            raise ValueError(f"{self.path} has unsupported version {version}")
+        self._reads: int = reads
+        self._items: int = items
+        self.tz: tzinfo | None = _tz_from_name(name.rstrip(b"\0").decode())
+        if self.tz is None and tz is not None:
+            self.tz = tz
+            self._write_header()
+        self._map: mmap.mmap = self._mmap(self._file)
+        self._items_map: mmap.mmap | None = self._mmap(self._items_file)
+        self._starts = _Starts(self)
+
+    @staticmethod
+    def _mmap(f: Any) -> Any:
+        size = os.fstat(f.fileno()).st_size
+        return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) if size else None
+
+    def _remap(self) -> None:
+        # Views from to_numpy() keep the old mappings alive until released.
+        self._map = self._mmap(self._file)
+        self._items_map = self._mmap(self._items_file)
+
+    def _write_header(self) -> None:
+        self._file.seek(0)
+        self._file.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                _RECORD.size,
+                _ITEM.size,
+                self._reads,
+                self._items,
+                _tz_name(self.tz).encode(),
+            )
+        )
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the files; mappings still used by NumPy views stay valid."""
+        for mapping in (getattr(self, "_map", None), getattr(self, "_items_map", None)):
+            if mapping is not None:
+                try:
+                    mapping.close()
+                except BufferError:
+                    pass
+        self._file.close()
+        self._items_file.close()
+
+    def __enter__(self) -> "UsageArchive":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._reads
+
+    @property
+    def last_start(self) -> datetime | None:
+        """Start of the newest read, or None when empty."""
+        if not self._reads:
+            return None
+        return datetime.fromtimestamp(self._starts[self._reads - 1], self.tz)
+
+    def range(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> tuple[int, int]:
+        """Return the rows whose start_time is in [start, end) by bisection."""
+        lo = _timestamp(start)
+        hi = _timestamp(end)
+        return (
+            0 if lo is None else bisect_left(self._starts, lo),
+            self._reads if hi is None else bisect_left(self._starts, hi),
+        )
+
+    def _item_start(self, row: int) -> int:
+        if row >= self._reads:
+            return self._items
+        offset = _HEADER.size + row * _RECORD.size + 8
+        return int(_START.unpack_from(self._map, offset)[0])
+
+    def read(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        itemization: bool = True,
+    ) -> UsageColumns:
+        """Return the reads starting in [start, end) as UsageColumns."""
+        return self._read_rows(*self.range(start, end), itemization)
+
+    def _read_rows(self, lo: int, hi: int, itemization: bool = True) -> UsageColumns:
+        columns = UsageColumns(self.tz)
+        offset = _HEADER.size + lo * _RECORD.size
+        records = self._map[offset : offset + (hi - lo) * _RECORD.size]
+        item_starts = []
+        for (
+            ts,
+            item_start,
+            consumption,
+            cost,
+            duration,
+            temperature,
+        ) in _RECORD.iter_unpack(records):
+            columns.start.append(ts)
+            columns.end.append(ts + duration)
+            columns.consumption.append(consumption)
+            columns.cost.append(cost)
+            columns.temperature.append(temperature)
+            item_starts.append(item_start)
+        if not itemization or self._items_map is None or lo == hi:
+            return columns
+        first, last = item_starts[0], self._item_start(hi)
+        items = self._items_map[first * _ITEM.size : last * _ITEM.size]
+        row = 0
+        for i, (id, usage, cost, percentage, cost_percentage, code) in enumerate(
+            _ITEM.iter_unpack(items), first
+        ):
+            while row + 1 < len(item_starts) and item_starts[row + 1] <= i:
+                row += 1
+            columns._append_item(
+                row, id, _CATEGORIES[code], usage, cost, percentage, cost_percentage
+            )
+        return columns
+
+    def to_numpy(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> "dict[str, np.ndarray[Any, Any]]":
+        """Return the reads starting in [start, end) as views of the mapping.
+
+        Nothing is copied: each array is a strided view of the records.
+        duration is int32 seconds to end_time; temperature is float32. Rows that a
+        later append() replaces change in these views too.
+        """
+        np = _import("numpy")
+        lo, hi = self.range(start, end)
+        if lo == hi:
+            records = np.zeros(0, dtype=_record_dtype(np))
+        else:
+            records = np.frombuffer(
+                self._map,
+                dtype=_record_dtype(np),
+                count=hi - lo,
+                offset=_HEADER.size + lo * _RECORD.size,
+            )
+        return {
+            "start": records["start"].view("datetime64[s]"),
+            "duration": records["duration"],
+            "consumption": records["consumption"],
+            "cost": records["cost"],
+            "temperature": records["temperature"],
+        }
+
+    def itemization_numpy(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> "dict[str, np.ndarray[Any, Any]]":
+        """Return the itemization of the reads starting in [start, end).
+
+        Numeric columns are views of the mapping; row, relative to the first
+        read in range, and category are computed.
+        """
+        np = _import("numpy")
+        lo, hi = self.range(start, end)
+        first, last = self._item_start(lo), self._item_start(hi)
+        if first == last or self._items_map is None:
+            items = np.zeros(0, dtype=_item_dtype(np))
+        else:
+            items = np.frombuffer(
+                self._items_map,
+                dtype=_item_dtype(np),
+                count=last - first,
+                offset=first * _ITEM.size,
+            )
+        item_starts = self._item_starts_numpy(lo, hi)
+        return {
+            "row": np.searchsorted(item_starts, np.arange(first, last), "right") - 1,
+            "id": items["id"],
+            "category": np.array(_CATEGORIES, dtype=object)[items["code"]],
+            "usage": items["usage"],
+            "cost": items["cost"],
+            "percentage": items["percentage"],
+            "cost_percentage": items["cost_percentage"],
+        }
+
+    def _item_starts_numpy(self, lo: int, hi: int) -> "np.ndarray[Any, Any]":
+        np = _import("numpy")
+        if lo == hi:
+            return np.zeros(0, dtype=np.int64)
+        records = np.frombuffer(
+            self._map,
+            dtype=_record_dtype(np),
+            count=hi - lo,
+            offset=_HEADER.size + lo * _RECORD.size,
+        )
+        return records["item_start"]
+
+    def append(self, columns: UsageColumns) -> int:
+        """Add reads in time order and return how many were written.
+
+        Archived reads starting from the first to the last new read are
+        replaced, so fetching a window again refreshes partial reads. Reads
+        after the batch are kept; they are written again behind it, so a
+        backfill before the archived range rewrites everything after it.
+        """
+        n = len(columns)
+        if not n:
+            return 0
+        if any(a > b for a, b in zip(columns.start, columns.start[1:])):
+            raise ValueError("reads must be sorted by start_time")
+        try:
+            codes = [_CATEGORY_CODES[category] for category in columns.item_category]
+        except KeyError as err:
+            raise ValueError(f"Unknown itemization category {err}") from err
+        if self.tz is None or (
+            # A fixed offset is wrong half the year; prefer a zone once known.
+            isinstance(self.tz, timezone)
+            and isinstance(columns.tz, ZoneInfo)
+        ):
+            self.tz = columns.tz
+        row = bisect_left(self._starts, columns.start[0])
+        tail = bisect_right(self._starts, columns.start[-1])
+        if tail < self._reads:
+            merged = UsageColumns(columns.tz)
+            merged.extend(columns)
+            merged.extend(self._read_rows(tail, self._reads))
+            columns = merged
+            codes += [
+                _CATEGORY_CODES[category]
+                for category in columns.item_category[len(codes) :]
+            ]
+        item_base = self._item_start(row)
+        if row < self._reads:
+            # Drop the reads being replaced first, so a crash cannot leave
+            # them pointing at overwritten itemization.
+            self._reads, self._items = row, item_base
+            self._write_header()
+
+        self._items_file.seek(item_base * _ITEM.size)
+        self._items_file.write(
+            b"".join(
+                _ITEM.pack(
+                    columns.item_id[i],
+                    columns.item_usage[i],
+                    columns.item_cost[i],
+                    columns.item_percentage[i],
+                    columns.item_cost_percentage[i],
+                    codes[i],
+                )
+                for i in range(len(codes))
+            )
+        )
+        self._items_file.flush()
+        os.fsync(self._items_file.fileno())
+
+        item_row = columns.item_row
+        records = []
+        item = 0
+        for i in range(len(columns)):
+            while item < len(item_row) and item_row[item] < i:
+                item += 1
+            records.append(
+                _RECORD.pack(
+                    columns.start[i],
+                    item_base + item,
+                    columns.consumption[i],
+                    columns.cost[i],
+                    columns.end[i] - columns.start[i],
+                    columns.temperature[i],
+                )
+            )
+        self._file.seek(_HEADER.size + row * _RECORD.size)
+        self._file.write(b"".join(records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._reads = row + len(columns)
+        self._items = item_base + len(codes)
+        self._write_header()
+        self._remap()
+        return n
+
+    def append_reads(self, reads: Iterable[CostRead]) -> int:
+        """Add CostReads, e.g. from async_get_usage_data; see append()."""
+        return self.append(UsageColumns.from_reads(reads, self.tz))
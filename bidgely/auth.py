@@ -0,0 +1,121 @@
+"""Bidgely access tokens and where to keep them between runs."""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from pydantic import TypeAdapter
+from pydantic.dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Meter:
+    """One metering endpoint of an account."""
+
+    endpoint_id: str
+    measurement: str
+    profile: str | None = None
+
+
+@dataclass(slots=True)
+class AccountInfo:
+    """The homes and meters an account has.
+
+    None means the utility does not say, so every home or measurement is
+    assumed to exist.
+    """
+
+    homes: list[int] | None
+    meters: list[Meter] | None
+
+    @property
+    def measurements(self) -> list[str] | None:
+        """The measurement types with a meter, e.g. ["ELECTRIC", "GAS"]."""
+        if self.meters is None:
+            return None
+        return list(dict.fromkeys(meter.measurement for meter in self.meters))
+
+    def has_measurement(self, measurement: str) -> bool:
+        """Whether a meter of this measurement type may exist."""
+        return self.meters is None or any(
+            meter.measurement == measurement for meter in self.meters
+        )
+
+    def has_home(self, home: int) -> bool:
+        """Whether this home may exist."""
+        return self.homes is None or home in self.homes
+
+
+@dataclass(slots=True)
+class AuthTokens:
+    """Bidgely credentials returned by a utility login.
+
+    account is what discovery found for the user, kept with the token so a
+    new process does not look it up again.
+    """
+
+    user_id: str
+    access_token: str
+    expires_at: datetime | None = None
+    refresh_token: str | None = None
+    account: AccountInfo | None = None
+
+    def expires_within(self, margin: timedelta) -> bool:
+        """Whether the token expires within margin from now.
+
+        Tokens without a known expiry are assumed to be valid.
+        """
+        if self.expires_at is None:
+            return False
+        return datetime.now(timezone.utc) >= self.expires_at - margin
+
+
+class TokenStore:
+    """Base class for persisting AuthTokens across process restarts."""
+
+    async def async_load(self, key: str) -> AuthTokens | None:
+        """Return the tokens stored under key, if any."""
+        raise NotImplementedError
+
+    async def async_save(self, key: str, tokens: AuthTokens) -> None:
+        """Store tokens under key."""
+        raise NotImplementedError
+
+
+_TOKENS = TypeAdapter(dict[str, AuthTokens])
+
+
+class FileTokenStore(TokenStore):
+    """Keep tokens for any number of accounts in one JSON file.
+
+    The file is replaced atomically and is only readable by its owner.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path: Path = Path(path)
+        self._lock = asyncio.Lock()
+
+    def _read(self) -> dict[str, AuthTokens]:
+        try:
+            return _TOKENS.validate_json(self.path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, key: str, tokens: AuthTokens) -> None:
+        data = self._read()
+        data[key] = tokens
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_TOKENS.dump_json(data))
+        os.replace(tmp, self.path)
+
+    async def async_load(self, key: str) -> AuthTokens | None:
+        loop = asyncio.get_running_loop()
+        return (await loop.run_in_executor(None, self._read)).get(key)
+
+    async def async_save(self, key: str, tokens: AuthTokens) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write, key, tokens)
@@ -1,20 +1,47 @@
 import asyncio
 import json
 import logging
-from datetime import date, datetime, timedelta
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterable, Sequence
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone, tzinfo
 from enum import Enum
-from itertools import chain
+from itertools import chain, islice, pairwise
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+from zoneinfo import ZoneInfo
 
 import aiohttp
+from pydantic import TypeAdapter
 from pydantic.dataclasses import dataclass
 from aiohttp.client_exceptions import ClientResponseError
 from aiohttp.web_exceptions import HTTPServerError
 
-from .exceptions import CannotConnect, InvalidAuth
+from .auth import AccountInfo, AuthTokens, Meter, TokenStore
+from . import decode
+from .cache import CacheKey, UsageCache
+from .coalesce import RequestCoalescer
+from .decode import parse_datetimes
+from .exceptions import CannotConnect, IncompleteData, InvalidAuth
+from .metrics import MetricsSink, get_metrics_sink
+from .retry import RETRY_STATUSES, RetryPolicy
+from .scheduler import RequestScheduler, parse_retry_after
+from .transport import API_PROFILE, TransportProfile, create_session
+from .utilities import get_utility, load_all_utilities
 from .utilities.base import UtilityBase
+from .utilities.cognito import CognitoPool
+
+if TYPE_CHECKING:
+    from .archive import UsageArchive
+    from .columnar import UsageColumns
 
 logger = logging.getLogger(__name__)
 DEBUG_LOG_RESPONSE = False
+BASE_URL = "https://naapi-read.bidgely.com"
+# Closed billing cycle breakdowns kept per client; least recently used go first.
+BREAKDOWN_CACHE_SIZE = 256
 
 
 class MeasurementType(Enum):
@@ -74,7 +101,10 @@ class MeasurementCategory(Enum):
 
 @dataclass(slots=True)
 class Forecast:
-    """Forecast data for an account."""
+    """Forecast data for an account.
+
+    fetched_at is when Bidgely last returned or confirmed this forecast.
+    """
 
     start_date: date
     end_date: date
@@ -85,6 +115,7 @@ class Forecast:
     forecasted_cost: float
     typical_usage: float
     typical_cost: float
+    fetched_at: datetime | None = None
 
     def __str__(self) -> str:
         s = f"""Forecast:
@@ -96,6 +127,7 @@ class Forecast:
     Cost to Date: ${self.cost_to_date:.2f}
     Forecasted Cost: ${self.forecasted_cost:.2f}
     Typical Cost: ${self.typical_cost:.2f}
+    Fetched At: {self.fetched_at}
             """
         return s
 
@@ -146,9 +178,50 @@ class CostRead:
         return self.start_time < other.start_time
 
 
+@dataclass(slots=True)
+class UsageResult:
+    """Reads from a multi-window fetch and the windows that could not be read."""
+
+    reads: list[CostRead]
+    failed: list[tuple[datetime, datetime]]
+
+    @property
+    def complete(self) -> bool:
+        """Whether every window was fetched."""
+        return not self.failed
+
+
+@dataclass(slots=True)
+class SyncResult:
+    """New reads since a watermark and the watermark to resume from.
+
+    watermark is the end of the latest finalized read; reads after it may
+    still change and are returned again by the next sync.
+    """
+
+    reads: list[CostRead]
+    watermark: datetime | None
+    failed: list[tuple[datetime, datetime]]
+
+
+@dataclass(slots=True)
+class BillingCycle:
+    """One billing period. end_time is its last second, as in CostRead."""
+
+    start_time: datetime
+    end_time: datetime
+
+    def contains(self, dt: datetime) -> bool:
+        """Whether dt falls within the cycle."""
+        return self.start_time <= dt <= self.end_time
+
+
 def get_supported_utilities() -> list[type["UtilityBase"]]:
-    """Return a list of all supported utilities."""
-    return [cls for cls in UtilityBase.__subclasses__()]
+    """Return a list of all supported utilities.
+
+    This imports every utility; use utility_names() to list them cheaply.
+    """
+    return load_all_utilities()
 
 
 def _aggregate_to_mode(agg: AggregateType | str) -> str:
@@ -163,12 +236,341 @@ def _aggregate_to_mode(agg: AggregateType | str) -> str:
     return mode
 
 
+def _cycle_boundaries(cycles: Iterable[BillingCycle]) -> list[float]:
+    """Return the sorted epoch seconds at which billing cycles start or end."""
+    edges = set()
+    for cycle in cycles:
+        edges.add(cycle.start_time.timestamp())
+        edges.add(cycle.end_time.timestamp() + 1)
+    return sorted(edges)
+
+
+def _split_at(
+    windows: list[tuple[datetime, datetime]], edges: list[float]
+) -> list[tuple[datetime, datetime]]:
+    """Split every window at the edges that fall strictly inside it."""
+    result = []
+    for w_start, w_end in windows:
+        lo, hi = w_start.timestamp(), w_end.timestamp()
+        for edge in edges[bisect_right(edges, lo) : bisect_left(edges, hi)]:
+            cut = datetime.fromtimestamp(edge, w_start.tzinfo)
+            result.append((w_start, cut))
+            w_start = cut
+        result.append((w_start, w_end))
+    return result
+
+
+def _next_month(dt: datetime) -> datetime:
+    """Return midnight on the first day of the month after dt."""
+    first = dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if first.month == 12:
+        return first.replace(year=first.year + 1, month=1)
+    return first.replace(month=first.month + 1)
+
+
+def _next_day(dt: datetime) -> datetime:
+    """Return midnight on the day after dt."""
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def _plan_windows(
+    agg: AggregateType,
+    start: datetime,
+    end: datetime,
+    cycles: list[BillingCycle] | None = None,
+) -> list[tuple[datetime, datetime]]:
+    """Split [start, end) into disjoint windows sized to one usage-chart-data call.
+
+    Bidgely returns one day of hourly reads or one month of daily reads per
+    request, so HOUR windows break on midnight and DAY windows on the first
+    of the month. The first and last windows are clipped to start and end.
+    MONTH (year mode) returns the whole range in one call.
+
+    With billing cycles, DAY windows also break where a cycle starts, and
+    MONTH splits once at the latest cycle boundary before end, so no window
+    straddles closed cycles and the open one and closed ones can be cached
+    for good.
+    """
+    if end <= start:
+        return []
+    match agg:
+        case AggregateType.MONTH:
+            edges = _cycle_boundaries(cycles or ())
+            inside = edges[: bisect_left(edges, end.timestamp())]
+            return _split_at([(start, end)], inside[-1:])
+        case AggregateType.DAY:
+            step = _next_month
+        case AggregateType.HOUR:
+            step = _next_day
+    windows = []
+    w_start = start
+    while w_start < end:
+        w_end = min(step(w_start), end)
+        windows.append((w_start, w_end))
+        w_start = w_end
+    if cycles and agg == AggregateType.DAY:
+        windows = _split_at(windows, _cycle_boundaries(cycles))
+    return windows
+
+
+def _breakdown_windows(
+    start: datetime, end: datetime, cycles: list[BillingCycle]
+) -> list[tuple[datetime, datetime]]:
+    """Split [start, end) into one window per billing cycle.
+
+    Without cycles the windows are calendar months.
+    """
+    if end <= start:
+        return []
+    if cycles:
+        edges = _cycle_boundaries(cycles)
+    else:
+        edges = []
+        edge = _next_month(start)
+        while edge < end:
+            edges.append(edge.timestamp())
+            edge = _next_month(edge)
+    return _split_at([(start, end)], edges)
+
+
+def _max_age(cache_control: str | None) -> int | None:
+    """Return the max-age of a Cache-Control header; no-cache means 0."""
+    if cache_control is None:
+        return None
+    directives = [d.strip().lower() for d in cache_control.split(",")]
+    if "no-cache" in directives or "no-store" in directives:
+        return 0
+    for directive in directives:
+        name, _, value = directive.partition("=")
+        if name == "max-age" and value.isdigit():
+            return int(value)
+    return None
+
+
+def _merge_reads(reads: Iterable[CostRead]) -> list[CostRead]:
+    """Return reads sorted by start_time with duplicates dropped.
+
+    When the same interval comes back more than once, a read with data wins
+    over an empty one. Gaps between consecutive reads are logged.
+    """
+    unique: dict[datetime, CostRead] = {}
+    for read in reads:
+        seen = unique.get(read.start_time)
+        if seen is None or (seen.consumption is None and read.consumption is not None):
+            unique[read.start_time] = read
+    result = sorted(unique.values())
+    if logger.isEnabledFor(logging.DEBUG):
+        for prev, cur in pairwise(result):
+            if cur.start_time - prev.end_time > timedelta(seconds=1):
+                logger.debug(
+                    "Gap in reads from %s to %s", prev.end_time, cur.start_time
+                )
+    return result
+
+
+_COST_READS = TypeAdapter(list[CostRead])
+
+
+def _debug_response(result: Any) -> None:
+    """Dump a response body, only when DEBUG_LOG_RESPONSE and debug are on."""
+    if DEBUG_LOG_RESPONSE and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Fetched: %s", json.dumps(result, indent=2))
+
+
+def _parse_items(details: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Turn Bidgely itemization entries into Itemization fields."""
+    return [
+        {
+            "id": item["id"],
+            "category": item["category"],
+            "usage": int(item["usage"]),
+            "cost": int(item["cost"]),
+            "percentage": int(item["percentage"]),
+            "cost_percentage": int(item["costPercentage"]),
+        }
+        for item in details
+    ]
+
+
+def _parse_payload(
+    payload: list[dict[str, Any]], skip_itemization: bool
+) -> list[CostRead]:
+    """Turn a usage-chart-data payload into CostReads.
+
+    Timestamps are parsed a column at a time and the whole list is
+    validated in a single pydantic call instead of one per read.
+    """
+    times = parse_datetimes(
+        chain(
+            (read["intervalStartDate"] for read in payload),
+            (read["intervalEndDate"] for read in payload),
+        )
+    )
+    starts, ends = times[: len(payload)], times[len(payload) :]
+    rows = []
+    for read, start, end in zip(payload, starts, ends):
+        details = read["itemizationDetailsList"]
+        if not skip_itemization and details is not None:
+            items = _parse_items(details)
+        else:
+            items = None
+        rows.append(
+            {
+                "start_time": start,
+                "end_time": end,
+                "consumption": read["consumption"],
+                "cost": read["cost"],
+                "temperature": read["temperature"],
+                "itemization": items,
+            }
+        )
+    return _COST_READS.validate_python(rows)
+
+
+_CYCLE_LISTS = ("payload", "billingCycles", "cycles", "data")
+_CYCLE_STARTS = (
+    "start",
+    "startTime",
+    "startDate",
+    "billingStartTs",
+    "bcStartDate",
+    "billStart",
+    "t0",
+)
+_CYCLE_ENDS = (
+    "end",
+    "endTime",
+    "endDate",
+    "billingEndTs",
+    "bcEndDate",
+    "billEnd",
+    "t1",
+)
+
+
+def _cycle_time(value: Any, tz: tzinfo, end: bool) -> datetime:
+    """Parse epoch seconds or milliseconds, or an ISO 8601 date or datetime.
+
+    A bare end date means the whole day, so it becomes its last second.
+    """
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if isinstance(value, str):
+        dt = datetime.fromisoformat(value)
+        if len(value) == 10 and end:
+            dt += timedelta(days=1, seconds=-1)
+        return dt if dt.tzinfo is not None else dt.replace(tzinfo=tz)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value, tz)
+    raise ValueError(f"Not a time: {value!r}")
+
+
+def _cycle_bounds(entry: Any) -> tuple[Any, Any]:
+    if isinstance(entry, (list, tuple)) and len(entry) == 2:
+        return entry[0], entry[1]
+    if isinstance(entry, dict):
+        if "value" in entry and not isinstance(entry["value"], (str, int, float)):
+            return _cycle_bounds(entry["value"])
+        start = next(
+            (entry[k] for k in _CYCLE_STARTS if entry.get(k) is not None), None
+        )
+        end = next((entry[k] for k in _CYCLE_ENDS if entry.get(k) is not None), None)
+        return start, end
+    return None, None
+
+
+def _parse_billing_cycles(result: Any, tz: tzinfo) -> list[BillingCycle]:
+    """Turn a billing-cycle response into cycles, oldest first.
+
+    The spec gives no schema, so this accepts the list bare or under one of
+    a few keys, entries as [start, end] pairs, {"key": ..., "value": [start,
+    end]} or objects with start and end fields, a mapping of start to end,
+    and times as epoch seconds, milliseconds or ISO 8601. Entries that do not
+    parse are skipped. When some cycle ends where the next starts, every end
+    is taken as exclusive.
+    """
+    while isinstance(result, dict):
+        inner = next((result[k] for k in _CYCLE_LISTS if k in result), None)
+        if inner is None:
+            result = list(result.items())
+            break
+        result = inner
+    if not isinstance(result, list):
+        return []
+    cycles: dict[datetime, datetime] = {}
+    for entry in result:
+        start, end = _cycle_bounds(entry)
+        try:
+            start_time = _cycle_time(start, tz, False)
+            end_time = _cycle_time(end, tz, True)
+        except (TypeError, ValueError):
+            logger.debug("Skipping billing cycle %r", entry)
+            continue
+        if end_time > start_time:
+            cycles[start_time] = end_time
+    exclusive = any(end_time in cycles for end_time in cycles.values())
+    last_second = timedelta(seconds=1 if exclusive else 0)
+    return [
+        BillingCycle(start_time=start_time, end_time=cycles[start_time] - last_second)
+        for start_time in sorted(cycles)
+    ]
+
+
+_HOME_LISTS = ("homes", "homeIds", "homeIdList", "homeAccounts")
+_HOME_IDS = ("homeId", "hid", "id")
+# Bidgely's endpoints name electricity differently from usage-chart-data.
+_MEASUREMENTS = {"ELECTRICITY": "ELECTRIC"}
+
+
+def _parse_homes(result: Any) -> list[int] | None:
+    """Return the home ids in a /v2.0/users response, or None if it has none.
+
+    The response is not documented, so a list of ids or of objects with an
+    id under any of a few usual names is accepted.
+    """
+    payload = result.get("payload", result) if isinstance(result, dict) else None
+    if not isinstance(payload, dict):
+        return None
+    for name in _HOME_LISTS:
+        entries = payload.get(name)
+        if not isinstance(entries, list):
+            continue
+        homes = set()
+        for entry in entries:
+            if isinstance(entry, dict):
+                entry = next((entry[k] for k in _HOME_IDS if k in entry), None)
+            try:
+                homes.add(int(entry))
+            except (TypeError, ValueError):
+                continue
+        if homes:
+            return sorted(homes)
+    return None
+
+
+def _parse_meters(result: Any) -> list[Meter] | None:
+    """Return the meters in an endpoints response, or None if it has none."""
+    payload = result.get("payload") if isinstance(result, dict) else result
+    if not isinstance(payload, list):
+        return None
+    meters = []
+    for entry in payload:
+        if not isinstance(entry, dict) or "measurementType" not in entry:
+            continue
+        kind = str(entry["measurementType"]).upper()
+        meters.append(
+            Meter(
+                endpoint_id=str(entry.get("endpointId", "")),
+                measurement=_MEASUREMENTS.get(kind, kind),
+                profile=entry.get("profile"),
+            )
+        )
+    return meters or None
+
+
 def _select_utility(name: str) -> type[UtilityBase]:
     """Return the utility with the given name."""
-    for utility in UtilityBase.__subclasses__():
-        if name.lower() in [utility.name().lower(), utility.__name__.lower()]:
-            return utility
-    raise ValueError(f"Utility {name} not found")
+    return get_utility(name)
 
 
 class Bidgely:
@@ -176,43 +578,421 @@ class Bidgely:
 
     def __init__(
         self,
-        session: aiohttp.ClientSession,
+        session: aiohttp.ClientSession | None,
         utility: str,
         username: str,
         password: str,
         account_id: str,
+        scheduler: RequestScheduler | None = None,
+        retry: RetryPolicy | None = None,
+        cache: UsageCache | None = None,
+        settlement_lag: timedelta = timedelta(days=2),
+        cache_ttl: timedelta = timedelta(hours=1),
+        token_store: TokenStore | None = None,
+        refresh_margin: timedelta = timedelta(minutes=5),
+        max_in_flight: int | None = None,
+        base_url: str = BASE_URL,
+        metrics: MetricsSink | None = None,
+        align_to_cycles: bool = False,
+        coalescer: RequestCoalescer | None = None,
+        transport: TransportProfile | None = None,
+        forecast_ttl: timedelta = timedelta(hours=1),
+        discover: bool = False,
+        cognito_pool: CognitoPool | None = None,
     ) -> None:
-        self.session: aiohttp.ClientSession = session
+        """Create a client for one account.
+
+        With session None the client creates its own from transport, or
+        API_PROFILE, and closes it in async_close; create the client inside
+        a running event loop then. On a session passed in, transport still
+        sets each request's timeouts and Accept-Encoding.
+
+        Requests are paced by the scheduler shared by every client on the same
+        session unless a scheduler is passed explicitly.
+
+        With a cache, windows ending more than settlement_lag ago are stored
+        forever; newer windows are kept for cache_ttl.
+
+        Tokens are refreshed refresh_margin before they expire. A token_store
+        keeps them across restarts so a new process can skip the login.
+
+        max_in_flight caps how many windows of this account are queued on the
+        shared scheduler at once, so one large backfill cannot starve other
+        accounts on the same session.
+
+        base_url points the client at another NA Read API host, such as the
+        stand-in server under benchmarks/.
+
+        Request latency, bytes, status codes, retries, parse and validation
+        time and login duration go to metrics, or to the process-wide sink
+        from bidgely.metrics when it is None.
+
+        align_to_cycles fetches the account's billing cycles before planning
+        windows, so windows line up with bills and only cycles that closed
+        more than settlement_lag ago are cached forever. Utilities without
+        the billing-cycle endpoint fall back to calendar windows.
+
+        Identical concurrent async_fetch and async_get_forecast calls share one
+        request through the coalescer, by default the one shared by every
+        client on the session. Give it max_entries to also reuse results for
+        its ttl.
+
+        Forecasts are kept for forecast_ttl, or until the next local midnight
+        when Bidgely recomputes them if that is sooner, and then revalidated.
+
+        discover looks up the account's homes and meters after login, see
+        async_discover, and skips requests for ones it does not have.
+
+        Utilities that sign in through AWS Cognito log in and refresh on
+        cognito_pool, or on the process-wide pool from
+        bidgely.utilities.cognito when it is None.
+        """
+        self._owns_session: bool = session is None
+        self.session: aiohttp.ClientSession = (
+            session
+            if session is not None
+            else create_session(transport if transport is not None else API_PROFILE)
+        )
+        self.transport: TransportProfile | None = transport
+        self._request_options: dict[str, Any] = (
+            {"timeout": transport.timeout()} if transport is not None else {}
+        )
+        self.base_url: str = base_url.rstrip("/")
+        self._metrics: MetricsSink | None = metrics
+        self.scheduler: RequestScheduler = (
+            scheduler
+            if scheduler is not None
+            else RequestScheduler.for_session(self.session)
+        )
+        self.retry: RetryPolicy = retry if retry is not None else RetryPolicy()
+        self.coalescer: RequestCoalescer = (
+            coalescer
+            if coalescer is not None
+            else RequestCoalescer.for_session(self.session)
+        )
+        self.cache: UsageCache | None = cache
+        self.settlement_lag: timedelta = settlement_lag
+        self.cache_ttl: timedelta = cache_ttl
         self.utility: type[UtilityBase] = _select_utility(utility)
         self.username: str = username
         self.password: str = password
         self.account_id: str = account_id
         self.user_id: str | None = None
         self.access_token: str | None = None
+        self.tokens: AuthTokens | None = None
+        self.discover: bool = discover
+        self.account: AccountInfo | None = None
+        self.token_store: TokenStore | None = token_store
+        self.refresh_margin: timedelta = refresh_margin
+        self.cognito_pool: CognitoPool | None = cognito_pool
+        self._auth_lock = asyncio.Lock()
+        self.watermarks: dict[tuple[str, str], datetime] = {}
+        self._window_semaphore: asyncio.Semaphore | None = (
+            asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        )
+        self.align_to_cycles: bool = align_to_cycles
+        # (measurement, home) -> cycles and when to fetch them again.
+        self._billing_cycles: dict[
+            tuple[str, int], tuple[list[BillingCycle], datetime]
+        ] = {}
+        # (measurement, start, end) -> breakdown of a closed billing cycle.
+        self._breakdowns: OrderedDict[
+            tuple[str, int, int], list[CostRead]
+        ] = OrderedDict()
+        self.forecast_ttl: timedelta = forecast_ttl
+        # (user_id, home, measurement) -> forecast, when it expires, and the
+        # ETag and Last-Modified to revalidate it with.
+        self._forecasts: dict[
+            tuple[str | None, int, str],
+            tuple[Forecast, datetime, str | None, str | None],
+        ] = {}
         return None
 
+    async def __aenter__(self) -> "Bidgely":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close the session if the client created it."""
+        if self._owns_session:
+            await self.session.close()
+
+    def _headers(self, token: str | None) -> dict[str, str]:
+        headers = self.transport.headers() if self.transport is not None else {}
+        headers["authorization"] = f"Bearer {token}"
+        return headers
+
+    @property
+    def metrics(self) -> MetricsSink:
+        """The sink this client reports to."""
+        return self._metrics if self._metrics is not None else get_metrics_sink()
+
+    @property
+    def _token_key(self) -> str:
+        return f"{self.utility.__name__}:{self.username}:{self.account_id}"
+
+    def _set_tokens(self, tokens: AuthTokens) -> None:
+        if tokens.account is None:
+            tokens.account = self.account
+        else:
+            self.account = tokens.account
+        self.tokens = tokens
+        self.user_id = tokens.user_id
+        self.access_token = tokens.access_token
+
     async def async_login(self) -> None:
+        """Login, reusing a stored token while it is still valid.
+
+        An expired stored token is renewed with its refresh token when it has
+        one; a full login is the fallback.
+        """
+        tokens = None
+        if self.token_store is not None:
+            tokens = await self.token_store.async_load(self._token_key)
+        if tokens is None:
+            await self._async_full_login()
+        elif tokens.expires_within(self.refresh_margin):
+            logger.debug("Stored token expired for user-id: %s", tokens.user_id)
+            self._set_tokens(tokens)
+            await self._async_reauth(tokens.access_token)
+        else:
+            logger.debug("Using stored token for user-id: %s", tokens.user_id)
+            self._set_tokens(tokens)
+        if self.discover and self.account is None:
+            await self.async_discover()
+        return None
+
+    async def async_discover(self, refresh: bool = False) -> AccountInfo:
+        """Look up the account's homes and meters, once.
+
+        Reads /v2.0/users/{user-id} and /v2.0/users/{user-id}/endpoints. What
+        an endpoint cannot tell, for example on utilities that do not serve
+        it, is left as None and assumed to exist. The result is kept in
+        account and saved with the tokens in the token store.
+        """
+        if self.account is not None and not refresh:
+            return self.account
+        url = f"{self.base_url}/v2.0/users/{self.user_id}"
+        user, endpoints = await asyncio.gather(
+            self._async_get_optional_json(url, "users"),
+            self._async_get_optional_json(f"{url}/endpoints", "endpoints"),
+        )
+        self.account = AccountInfo(
+            homes=None if user is None else _parse_homes(user),
+            meters=None if endpoints is None else _parse_meters(endpoints),
+        )
+        logger.debug("Account of user %s: %s", self.user_id, self.account)
+        if self.tokens is not None:
+            self.tokens.account = self.account
+            if self.token_store is not None:
+                await self.token_store.async_save(self._token_key, self.tokens)
+        return self.account
+
+    async def _async_get_optional_json(self, url: str, endpoint: str) -> Any:
+        """GET an endpoint some utilities lack, returning None if it fails.
+
+        Utilities that forbid it answer 401 or 403, which is not worth a
+        re-login, so InvalidAuth also means it is not available.
+        """
         try:
-            self.user_id, self.access_token = await self.utility.async_login(
-                self.session, self.username, self.password, self.account_id
+            return await self._async_get_json(url, {}, endpoint, reauth=False)
+        except (CannotConnect, InvalidAuth) as err:
+            logger.debug("No answer from %s: %s", url, err)
+            return None
+
+    def _home(self, home: int | None) -> int:
+        """Return home, defaulting to the first discovered home or home 1."""
+        if home is not None:
+            return home
+        if self.account is not None and self.account.homes:
+            return self.account.homes[0]
+        return 1
+
+    def _exists(self, measurement: str, home: int | None = None) -> bool:
+        """Whether discovery allows that the home and measurement exist.
+
+        Without a home only the measurement is checked, for data such as
+        usage that is not kept per home.
+        """
+        account = self.account
+        if account is None:
+            return True
+        if account.has_measurement(measurement) and (
+            home is None or account.has_home(home)
+        ):
+            return True
+        logger.debug("Skipping home %s %s: not on the account", home, measurement)
+        return False
+
+    async def _async_full_login(self) -> None:
+        labels = {"utility": self.utility.__name__, "result": "error"}
+        started = time.perf_counter()
+        try:
+            tokens = await self.utility.async_login_tokens(
+                self.session,
+                self.username,
+                self.password,
+                self.account_id,
+                pool=self.cognito_pool,
             )
+            labels["result"] = "ok"
+        except InvalidAuth:
+            labels["result"] = "invalid_auth"
+            raise
         except ClientResponseError as err:
             if err.status in (401, 403):
+                labels["result"] = "invalid_auth"
                 raise InvalidAuth(err)
             else:
                 raise CannotConnect(err)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise CannotConnect(err) from err
+        finally:
+            self.metrics.observe(
+                "bidgely_login_seconds", time.perf_counter() - started, labels
+            )
+        self._set_tokens(tokens)
+        if self.token_store is not None:
+            await self.token_store.async_save(self._token_key, tokens)
+        return None
+
+    async def _async_reauth(self, stale_token: str | None) -> None:
+        """Replace stale_token, once, however many callers ask concurrently.
+
+        The refresh token is tried first and a full login is the fallback,
+        however the refresh fails.
+        Callers that were waiting on the lock find the token already replaced
+        and return straight away.
+        """
+        async with self._auth_lock:
+            if self.access_token != stale_token:
+                return None
+            refresh_token = self.tokens.refresh_token if self.tokens else None
+            if refresh_token is not None:
+                try:
+                    tokens = await self.utility.async_refresh(
+                        self.session,
+                        refresh_token,
+                        self.account_id,
+                        pool=self.cognito_pool,
+                    )
+                except (
+                    NotImplementedError,
+                    InvalidAuth,
+                    CannotConnect,
+                    aiohttp.ClientError,
+                    asyncio.TimeoutError,
+                ) as err:
+                    logger.debug("Token refresh failed, logging in again: %r", err)
+                    self.metrics.increment(
+                        "bidgely_token_refresh_total", 1.0, {"result": "failed"}
+                    )
+                else:
+                    self.metrics.increment(
+                        "bidgely_token_refresh_total", 1.0, {"result": "ok"}
+                    )
+                    self._set_tokens(tokens)
+                    if self.token_store is not None:
+                        await self.token_store.async_save(self._token_key, tokens)
+                    return None
+            await self._async_full_login()
         return None
 
+    async def _async_ensure_token(self) -> None:
+        """Refresh the token ahead of its expiry."""
+        if self.tokens is not None and self.tokens.expires_within(self.refresh_margin):
+            await self._async_reauth(self.access_token)
+
     async def async_get_forecast(
-        self, measurement: str = "ELECTRIC", home: int = 1
+        self,
+        measurement: str = "ELECTRIC",
+        home: int | None = None,
+        refresh: bool = False,
     ) -> Forecast:
         """Get current and forecasted usage and cost for the current monthly bill.
 
         If you are only an electric customer, bidgely will return electric results
         if you ask for gas forecasts.
+
+        Forecasts are cached per home and measurement; see forecast_ttl. A
+        Cache-Control max-age from Bidgely takes precedence. Once expired, or
+        with refresh, the forecast is revalidated with If-None-Match or
+        If-Modified-Since when Bidgely sent an ETag or Last-Modified, so an
+        unchanged forecast costs a 304. fetched_at tells how fresh it is.
+
+        home defaults to the first discovered home, or home 1. A home or
+        measurement that discovery did not find raises CannotConnect without
+        a request.
+        """
+        home = self._home(home)
+        if not self._exists(measurement, home):
+            raise CannotConnect(f"Home {home} has no {measurement} meter")
+        cached = self._forecasts.get((self.user_id, home, measurement))
+        if (
+            cached is not None
+            and not refresh
+            and datetime.now(timezone.utc) < cached[1]
+        ):
+            return cached[0]
+        return await self.coalescer.run(
+            (self.user_id, "billprojections", measurement, home),
+            lambda: self._async_fetch_forecast(measurement, home),
+        )
+
+    async def async_get_forecasts(
+        self,
+        homes: Iterable[int] | None = None,
+        measurements: Iterable[str] = ("ELECTRIC", "GAS"),
+    ) -> dict[tuple[int, str], Forecast]:
+        """Get the forecast of every home and measurement concurrently.
+
+        homes defaults to the discovered homes, or home 1. Returns forecasts
+        keyed by (home, measurement); pairs that discovery did not find are
+        skipped and pairs that fail are logged and left out.
         """
+        if homes is None:
+            homes = self.account.homes if self.account is not None else None
+        pairs = [
+            (home, measurement)
+            for home in homes or (1,)
+            for measurement in measurements
+            if self._exists(measurement, home)
+        ]
+        results = await asyncio.gather(
+            *(
+                self.async_get_forecast(measurement, home)
+                for home, measurement in pairs
+            ),
+            return_exceptions=True,
+        )
+        forecasts = {}
+        for pair, res in zip(pairs, results):
+            if isinstance(res, (CannotConnect, HTTPServerError, aiohttp.ClientError)):
+                logger.debug("No forecast for home %s %s: %r", pair[0], pair[1], res)
+            elif isinstance(res, BaseException):
+                raise res
+            else:
+                forecasts[pair] = res
+        return forecasts
+
+    def _forecast_expires(self, now: datetime, cache_control: str | None) -> datetime:
+        """Return when a forecast fetched at now should be revalidated."""
+        max_age = _max_age(cache_control)
+        if max_age is not None:
+            return now + timedelta(seconds=max_age)
+        local = now.astimezone(ZoneInfo(self.utility.timezone()))
+        return min(now + self.forecast_ttl, _next_day(local))
+
+    async def _async_fetch_forecast(self, measurement: str, home: int) -> Forecast:
         url = (
-            "https://naapi-read.bidgely.com"
+            f"{self.base_url}"
             "/2.1/users/"
             f"{self.user_id}"
             "/homes/"
@@ -224,43 +1004,394 @@ class Bidgely:
         else:
             unit = UnitOfMeasure("CCF")
         ps = {"measurement-type": measurement, "convert-to-kwh": "true"}
-        h = {"authorization": f"Bearer {self.access_token}"}
-        async with self.session.get(url, params=ps, headers=h) as resp:
-            result = await resp.json()
-            if DEBUG_LOG_RESPONSE:
-                logger.debug(f"Fetched: {json.dumps(result, indent=2)}")
-            if resp.status == 200:
-                forecast = Forecast(
-                    start_date=date.fromisoformat(result["billStartDateFormatted"]),
-                    end_date=date.fromisoformat(result["billEndDateFormatted"]),
-                    unit_of_measure=unit,
-                    usage_to_date=result["currentConsumption"],
-                    cost_to_date=result["currentPrice"],
-                    forecasted_usage=result["projectionConsumption"],
-                    forecasted_cost=result["projectionPrice"],
-                    typical_usage=result["averageBillingConsumption"],
-                    typical_cost=result["averageBillingPrice"],
-                )
-            else:
-                logger.debug(f"Have you entered the correct home? home={home}")
-                raise HTTPServerError
+        await self._async_ensure_token()
+        key = (self.user_id, home, measurement)
+        cached = self._forecasts.get(key)
+        h = self._headers(self.access_token)
+        if cached is not None:
+            if cached[2] is not None:
+                h["If-None-Match"] = cached[2]
+            if cached[3] is not None:
+                h["If-Modified-Since"] = cached[3]
+        async with self.scheduler.slot():
+            started = time.perf_counter()
+            try:
+                async with self.session.get(
+                    url, params=ps, headers=h, **self._request_options
+                ) as resp:
+                    self.scheduler.observe(
+                        resp.status, parse_retry_after(resp.headers.get("Retry-After"))
+                    )
+                    body = await resp.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                self._observe_request("billprojections", "error", started)
+                raise CannotConnect(err) from err
+            self._observe_request("billprojections", str(resp.status), started, body)
+        now = datetime.now(timezone.utc)
+        expires = self._forecast_expires(now, resp.headers.get("Cache-Control"))
+        if resp.status == 304 and cached is not None:
+            logger.debug("Forecast for home %s %s unchanged", home, measurement)
+            forecast = replace(cached[0], fetched_at=now)
+            self._forecasts[key] = (forecast, expires, cached[2], cached[3])
+            return forecast
+        if resp.status != 200:
+            logger.debug("Have you entered the correct home? home=%s", home)
+            logger.debug("Forecast status %s: %r", resp.status, body[:200])
+            raise HTTPServerError
+        try:
+            result = decode.loads(body)
+        except ValueError as err:
+            raise CannotConnect(f"Invalid JSON from {url}: {err}")
+        _debug_response(result)
 
+        start_date = result.get("billStartDateFormatted")
+        end_date = result.get("billEndDateFormatted")
+        if start_date is not None and end_date is not None:
+            bill = (date.fromisoformat(start_date), date.fromisoformat(end_date))
+        else:
+            bill = await self._async_current_cycle(measurement, home)
+        forecast = Forecast(
+            start_date=bill[0],
+            end_date=bill[1],
+            unit_of_measure=unit,
+            usage_to_date=result["currentConsumption"],
+            cost_to_date=result["currentPrice"],
+            forecasted_usage=result["projectionConsumption"],
+            forecasted_cost=result["projectionPrice"],
+            typical_usage=result["averageBillingConsumption"],
+            typical_cost=result["averageBillingPrice"],
+            fetched_at=now,
+        )
+        self._forecasts[key] = (
+            forecast,
+            expires,
+            resp.headers.get("ETag"),
+            resp.headers.get("Last-Modified"),
+        )
         return forecast
 
-    async def async_fetch(
+    async def _async_current_cycle(
+        self, measurement: str, home: int
+    ) -> tuple[date, date]:
+        """Return the dates of the open billing cycle, for a forecast without them."""
+        now = datetime.now(ZoneInfo(self.utility.timezone()))
+        for cycle in reversed(await self.async_get_billing_cycles(measurement, home)):
+            if cycle.contains(now):
+                return cycle.start_time.date(), cycle.end_time.date()
+        raise CannotConnect("Forecast has no bill dates and no billing cycle is open")
+
+    async def async_get_billing_cycles(
+        self,
+        measurement: str = "ELECTRIC",
+        home: int | None = None,
+        refresh: bool = False,
+    ) -> list[BillingCycle]:
+        """Return the billing cycles of a home, oldest first.
+
+        home defaults to the first discovered home, or home 1. Closed cycles
+        never change, so the list is kept until the newest cycle ends, or for
+        cache_ttl when it has already ended.
+        """
+        return await self._async_billing_cycles(measurement, home, refresh)
+
+    async def _async_billing_cycles(
+        self,
+        measurement: str,
+        home: int | None,
+        refresh: bool = False,
+        reauth: bool = True,
+    ) -> list[BillingCycle]:
+        home = self._home(home)
+        if not self._exists(measurement, home):
+            return []
+        key = (measurement, home)
+        now = datetime.now(ZoneInfo(self.utility.timezone()))
+        cached = self._billing_cycles.get(key)
+        if cached is not None and not refresh and now < cached[1]:
+            return cached[0]
+        url = (
+            f"{self.base_url}"
+            "/billingdata/users/"
+            f"{self.user_id}"
+            "/homes/"
+            f"{home}"
+            "/billingcycles"
+        )
+        ps = {
+            "measurement-type": measurement,
+            "t0": "0",
+            "t1": f"{int(now.timestamp())}",
+        }
+        result = await self._async_get_json(url, ps, reauth=reauth)
+        _debug_response(result)
+        cycles = _parse_billing_cycles(result, now.tzinfo or ZoneInfo("UTC"))
+        expires = now + self.cache_ttl
+        if cycles:
+            expires = max(expires, cycles[-1].end_time + timedelta(seconds=1))
+        self._billing_cycles[key] = (cycles, expires)
+        logger.debug("Found %d billing cycles for user: %s", len(cycles), self.user_id)
+        return cycles
+
+    async def async_get_utility_billing_cycles(
+        self, pilot_id: int, code: str
+    ) -> list[BillingCycle]:
+        """Return a utility's published cycles for one billing-cycle code.
+
+        Uses /2.1/utilityBillingCycles, which is keyed by the utility's
+        Bidgely pilot id rather than the account, so it is not cached.
+        """
+        url = (
+            f"{self.base_url}"
+            "/2.1/utilityBillingCycles/utility/"
+            f"{pilot_id}"
+            "/identifier/"
+            f"{code}"
+        )
+        result = await self._async_get_json(url, {})
+        _debug_response(result)
+        return _parse_billing_cycles(result, ZoneInfo(self.utility.timezone()))
+
+    def _cached_cycles(
+        self, measurement: str, home: int | None = None
+    ) -> list[BillingCycle]:
+        """Return the cycles fetched so far, without a request."""
+        cached = self._billing_cycles.get((measurement, self._home(home)))
+        return cached[0] if cached is not None else []
+
+    async def async_plan_windows(
+        self, measurement: str, mode: AggregateType, start: datetime, end: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        """Return the windows async_get_usage_data requests for this range.
+
+        They line up with billing cycles when align_to_cycles is set.
+        """
+        if not self.align_to_cycles or mode == AggregateType.HOUR:
+            return _plan_windows(mode, start, end)
+        cycles = await self._async_cycles_or_calendar(measurement)
+        return _plan_windows(mode, start, end, cycles)
+
+    async def _async_cycles_or_calendar(
+        self, measurement: str, home: int | None = None
+    ) -> list[BillingCycle]:
+        """Return the billing cycles, or none where the utility lacks them.
+
+        Utilities without the billing-cycle endpoint answer 401 or 403. That
+        is not worth a re-login, and is remembered for the client's lifetime;
+        other failures are tried again after cache_ttl.
+        """
+        home = self._home(home)
+        now = datetime.now(ZoneInfo(self.utility.timezone()))
+        try:
+            return await self._async_billing_cycles(measurement, home, reauth=False)
+        except InvalidAuth as err:
+            logger.debug("Billing cycles not available, using calendar: %s", err)
+            expires = datetime.max.replace(tzinfo=now.tzinfo)
+        except CannotConnect as err:
+            logger.debug("No billing cycles, using calendar windows: %s", err)
+            expires = now + self.cache_ttl
+        self._billing_cycles[(measurement, home)] = ([], expires)
+        return []
+
+    async def async_fetch_columns(
+        self,
+        measurement: str,
+        mode: AggregateType | str,
+        start: datetime | None,
+        end: datetime | None,
+        skip_itemization: bool = True,
+    ) -> "UsageColumns":
+        """Like async_fetch, but fill UsageColumns straight from the payload."""
+        from .columnar import UsageColumns
+
+        payload = await self._async_fetch_payload(
+            measurement, mode, start, end, skip_itemization
+        )
+        return UsageColumns.from_payload(
+            payload, skip_itemization, ZoneInfo(self.utility.timezone())
+        )
+
+    async def async_get_usage_columns(
+        self,
+        measurement: str,
+        mode: AggregateType = AggregateType.MONTH,
+        start: datetime = datetime.fromtimestamp(967231641),
+        end: datetime | None = None,
+        skip_itemization: bool = True,
+    ) -> "UsageColumns":
+        """Like async_get_usage_data, but return one UsageColumns.
+
+        Windows are concatenated in time order. A window that still fails
+        after retries raises CannotConnect.
+        """
+        from .columnar import UsageColumns
+
+        if end is None:
+            end = datetime.now() - timedelta(days=1)
+        tasks = [
+            self.async_fetch_columns(
+                measurement, mode, w_start, w_end, skip_itemization
+            )
+            for w_start, w_end in await self.async_plan_windows(
+                measurement, mode, start, end
+            )
+        ]
+        result = UsageColumns(ZoneInfo(self.utility.timezone()))
+        for columns in await asyncio.gather(*tasks):
+            result.extend(columns)
+        return result
+
+    def rollup(
+        self,
+        columns: "UsageColumns",
+        mode: AggregateType,
+        cycles: Sequence[BillingCycle | tuple[datetime, datetime]] | None = None,
+    ) -> "UsageColumns":
+        """Aggregate already fetched columns, e.g. HOUR reads, into mode.
+
+        cycles may be the list async_get_billing_cycles returns. Buckets
+        follow the utility's timezone; see bidgely.rollup.rollup.
+        """
+        from .rollup import rollup
+
+        return rollup(columns, mode, self.utility.timezone(), cycles)
+
+    def _cache_ttl(
+        self, end: datetime, cycles: list[BillingCycle] | None = None
+    ) -> timedelta | None:
+        """Return how long a window ending at end may be cached.
+
+        None means forever: the window closed more than settlement_lag ago
+        and, given billing cycles, so did the cycle it belongs to, since an
+        open bill can still be revised.
+        """
+        settled = (datetime.now(end.tzinfo) - self.settlement_lag).timestamp()
+        ts = end.timestamp()
+        if ts > settled:
+            return self.cache_ttl
+        if cycles and ts > cycles[0].start_time.timestamp():
+            closed = [
+                cycle.end_time.timestamp() + 1
+                for cycle in cycles
+                if cycle.end_time.timestamp() + 1 <= settled
+            ]
+            if not closed or ts > closed[-1]:
+                return self.cache_ttl
+        return None
+
+    def _observe_request(
+        self, endpoint: str, status: str, started: float, body: bytes = b""
+    ) -> None:
+        """Report one HTTP attempt that began at perf_counter() started."""
+        labels = {"endpoint": endpoint, "status": status}
+        elapsed = time.perf_counter() - started
+        self.metrics.observe("bidgely_request_seconds", elapsed, labels)
+        if body:
+            self.metrics.increment(
+                "bidgely_response_bytes_total", len(body), {"endpoint": endpoint}
+            )
+
+    async def _async_get_json(
+        self,
+        url: str,
+        params: dict[str, str],
+        endpoint: str | None = None,
+        reauth: bool = True,
+    ) -> Any:
+        """GET a Bidgely endpoint, retrying transient failures.
+
+        429 and 5xx responses, connection errors and timeouts are retried with
+        the client's RetryPolicy, honouring Retry-After. The first 401/403
+        triggers a single re-login and a retry, a second raises InvalidAuth;
+        without reauth the first does. Anything else, or running out of
+        attempts, raises CannotConnect. endpoint labels its metrics and
+        defaults to the last part of url.
+        """
+        await self._async_ensure_token()
+        if endpoint is None:
+            endpoint = url.rsplit("/", 1)[-1]
+        attempt = 0
+        reauthed = not reauth
+        while True:
+            retry_after = None
+            token = self.access_token
+            h = self._headers(token)
+            try:
+                async with self.scheduler.slot():
+                    started = time.perf_counter()
+                    status = "error"
+                    body = b""
+                    try:
+                        async with self.session.get(
+                            url, params=params, headers=h, **self._request_options
+                        ) as resp:
+                            status = str(resp.status)
+                            retry_after = parse_retry_after(
+                                resp.headers.get("Retry-After")
+                            )
+                            self.scheduler.observe(resp.status, retry_after)
+                            resp.raise_for_status()
+                            body = await resp.read()
+                    finally:
+                        self._observe_request(endpoint, status, started, body)
+                started = time.perf_counter()
+                try:
+                    result = decode.loads(body)
+                except ValueError as err:
+                    raise CannotConnect(f"Invalid JSON from {url}: {err}")
+                self.metrics.observe(
+                    "bidgely_decode_seconds",
+                    time.perf_counter() - started,
+                    {"endpoint": endpoint},
+                )
+                return result
+            except ClientResponseError as err:
+                if err.status in (401, 403):
+                    if not reauthed:
+                        reauthed = True
+                        self.metrics.increment(
+                            "bidgely_reauth_total", 1.0, {"endpoint": endpoint}
+                        )
+                        await self._async_reauth(token)
+                        continue
+                    logger.debug("Failed to read data from Bidgely due to InvalidAuth")
+                    raise InvalidAuth(err)
+                if err.status not in RETRY_STATUSES:
+                    raise CannotConnect(err)
+                error: Exception = err
+                reason = str(err.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                error = err
+                reason = type(err).__name__
+            attempt += 1
+            if attempt >= self.retry.attempts:
+                raise CannotConnect(error)
+            self.metrics.increment(
+                "bidgely_retries_total", 1.0, {"endpoint": endpoint, "reason": reason}
+            )
+            delay = self.retry.delay(attempt - 1, retry_after)
+            logger.debug("Retrying %s in %.2fs after: %r", url, delay, error)
+            await asyncio.sleep(delay)
+
+    async def _async_fetch_payload(
         self,
         measurement: str,
         mode: AggregateType | str,
         start: datetime | None,
         end: datetime | None,
         skip_itemization: bool | None = True,
-    ) -> list[CostRead]:
+    ) -> list[dict[str, Any]]:
+        """Return the raw usage-chart-data payload, from the cache if possible.
+
+        A measurement that discovery did not find has no reads.
+        """
+        if not self._exists(measurement):
+            return []
         if start is None:
             start = datetime.fromtimestamp(967231641)
         if end is None:
             end = datetime.now()
         url = (
-            "https://naapi-read.bidgely.com"
+            f"{self.base_url}"
             "/v2.0/dashboard/users/"
             f"{self.user_id}"
             "/usage-chart-data"
@@ -274,113 +1405,408 @@ class Bidgely:
             "skip-itemization": str(skip_itemization).lower(),
             "skip-ongoing-cycle": "true" if not skip_itemization else "false",
         }
-        h = {"authorization": f"Bearer {self.access_token}"}
+        key = CacheKey(
+            user_id=str(self.user_id),
+            measurement=measurement,
+            mode=ps["mode"],
+            start=int(start.timestamp()),
+            end=int(end.timestamp()),
+            itemization=not skip_itemization,
+        )
+        payload: list[dict[str, Any]] | None = None
+        if self.cache is not None:
+            payload = await self.cache.async_get(key)
+            self.metrics.increment(
+                "bidgely_cache_requests_total",
+                1.0,
+                {"result": "miss" if payload is None else "hit"},
+            )
+        if payload is None:
+            reads = await self._async_get_json(url, ps)
+            _debug_response(reads)
+            logger.debug("Successful read from Bidgely for user: %s", self.user_id)
+            payload = reads["payload"]
+            if self.cache is not None:
+                await self.cache.async_set(
+                    key, payload, self._cache_ttl(end, self._cached_cycles(measurement))
+                )
+        else:
+            logger.debug(
+                "Cache hit for user %s from %s to %s", self.user_id, start, end
+            )
+        return payload
 
-        result: list[CostRead] = []
-        try:
-            async with self.session.get(url, params=ps, headers=h) as resp:
-                reads = await resp.json()
-                if DEBUG_LOG_RESPONSE:
-                    logger.debug(f"Fetched: {json.dumps(result, indent=2)}")
-                logger.debug(f"Successful read from Bidgely for user: {self.user_id}")
-                for read in reads["payload"]:
-                    if (
-                        not skip_itemization
-                        and read["itemizationDetailsList"] is not None
-                    ):
-                        items = []
-                        for item in read["itemizationDetailsList"]:
-                            items.append(
-                                Itemization(
-                                    id=item["id"],
-                                    category=item["category"],
-                                    usage=int(item["usage"]),
-                                    cost=int(item["cost"]),
-                                    percentage=int(item["percentage"]),
-                                    cost_percentage=int(item["costPercentage"]),
-                                )
-                            )
-                    else:
-                        items = None
-                    result.append(
-                        CostRead(
-                            start_time=datetime.fromisoformat(
-                                read["intervalStartDate"]
-                            ),
-                            end_time=datetime.fromisoformat(read["intervalEndDate"]),
-                            consumption=read["consumption"],
-                            cost=read["cost"],
-                            temperature=read["temperature"],
-                            itemization=items,
-                        )
-                    )
-        except ClientResponseError as err:
-            if err.status in (401, 403):
-                logger.debug("Failed to read data from Bidgely due to InvalidAuth")
-                raise InvalidAuth(err)
-            else:
-                raise CannotConnect(err)
+    async def async_fetch(
+        self,
+        measurement: str,
+        mode: AggregateType | str,
+        start: datetime | None,
+        end: datetime | None,
+        skip_itemization: bool | None = True,
+    ) -> list[CostRead]:
+        """Fetch and parse one usage-chart-data window.
 
-        return result
+        Identical concurrent calls for the account share one request through
+        the client's RequestCoalescer.
+        """
+        key = (
+            self.user_id,
+            "usage-chart-data",
+            measurement,
+            str(mode),
+            None if start is None else int(start.timestamp()),
+            None if end is None else int(end.timestamp()),
+            bool(skip_itemization),
+        )
+        return await self.coalescer.run(
+            key,
+            lambda: self._async_fetch_reads(
+                measurement, mode, start, end, skip_itemization
+            ),
+        )
+
+    async def _async_fetch_reads(
+        self,
+        measurement: str,
+        mode: AggregateType | str,
+        start: datetime | None,
+        end: datetime | None,
+        skip_itemization: bool | None,
+    ) -> list[CostRead]:
+        started = time.perf_counter()
+        payload = await self._async_fetch_payload(
+            measurement, mode, start, end, skip_itemization
+        )
+        labels = {"mode": str(mode)}
+        validating = time.perf_counter()
+        reads = _parse_payload(payload, bool(skip_itemization))
+        done = time.perf_counter()
+        self.metrics.observe("bidgely_validate_seconds", done - validating, labels)
+        self.metrics.observe("bidgely_window_seconds", done - started, labels)
+        self.metrics.increment("bidgely_reads_total", len(reads), labels)
+        return reads
+
+    async def _async_fetch_window(
+        self,
+        measurement: str,
+        mode: AggregateType,
+        start: datetime,
+        end: datetime,
+        skip_itemization: bool,
+    ) -> list[CostRead]:
+        """async_fetch one window, within this account's max_in_flight."""
+        if self._window_semaphore is None:
+            return await self.async_fetch(
+                measurement, mode, start, end, skip_itemization
+            )
+        async with self._window_semaphore:
+            return await self.async_fetch(
+                measurement, mode, start, end, skip_itemization
+            )
+
+    async def async_get_usage_result(
+        self,
+        measurement: str,
+        mode: AggregateType = AggregateType.MONTH,
+        start: datetime = datetime.fromtimestamp(967231641),
+        end: datetime | None = None,
+        skip_itemization: bool = True,
+        windows: list[tuple[datetime, datetime]] | None = None,
+    ) -> UsageResult:
+        """Fetch usage window by window, keeping whatever succeeded.
+
+        Windows that still fail after retries are listed in UsageResult.failed
+        and can be passed back as windows to re-request only those intervals.
+        InvalidAuth is not recoverable per window and is raised.
+        """
+        if end is None:
+            end = datetime.now() - timedelta(days=1)
+        if windows is None:
+            windows = await self.async_plan_windows(measurement, mode, start, end)
+        tasks = [
+            self._async_fetch_window(
+                measurement, mode, w_start, w_end, skip_itemization
+            )
+            for w_start, w_end in windows
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        reads: list[list[CostRead]] = []
+        failed: list[tuple[datetime, datetime]] = []
+        for window, res in zip(windows, results):
+            if isinstance(res, CannotConnect):
+                logger.debug("Window %s to %s failed: %s", window[0], window[1], res)
+                failed.append(window)
+            elif isinstance(res, BaseException):
+                raise res
+            else:
+                reads.append(res)
+        return UsageResult(reads=_merge_reads(chain(*reads)), failed=failed)
 
     async def async_get_usage_data(
         self,
         measurement: str,
         mode: AggregateType = AggregateType.MONTH,
         start: datetime = datetime.fromtimestamp(967231641),
-        end: datetime = datetime.now() - timedelta(days=1),
+        end: datetime | None = None,
         skip_itemization: bool = True,
     ) -> list[CostRead]:
         """
-        Only the year mode uses start. All others base results on end.
         The most up to date data you can retrieve is up to noon on the previous day.
+
+        The range is split into disjoint windows (see _plan_windows) so each
+        interval is requested once, and the reads are returned sorted by
+        start_time with duplicates removed.
+
+        :raises IncompleteData: if some windows failed; the error carries the
+            UsageResult with the reads that did arrive.
         """
-        result = []
+        result = await self.async_get_usage_result(
+            measurement, mode, start, end, skip_itemization
+        )
+        if result.failed:
+            raise IncompleteData(result)
+        return result.reads
 
-        match mode:
-            case AggregateType.MONTH:
-                results = await self.async_fetch(
-                    measurement, mode, start, end, skip_itemization
-                )
-            case AggregateType.DAY:
-                n_months = (end - start).days // 30
-                tasks = []
-                for i in range(n_months):
-                    days = 30 * (i + 1)
-                    single = self.async_fetch(
-                        measurement,
-                        mode,
-                        start,
-                        start + timedelta(days=days),
-                    )
-                    tasks.append(single)
-                result = await asyncio.gather(*tasks)
-                results = list(chain(*result))
-            case AggregateType.HOUR:
-                n_days = (end - start).days
-                tasks = []
-                for i in range(n_days):
-                    single = self.async_fetch(
-                        measurement,
-                        mode,
-                        start,
-                        start + timedelta(days=i + 1),
+    async def async_update_archive(
+        self,
+        archive: "UsageArchive",
+        measurement: str,
+        mode: AggregateType = AggregateType.HOUR,
+        start: datetime = datetime.fromtimestamp(967231641),
+        end: datetime | None = None,
+        skip_itemization: bool = True,
+    ) -> int:
+        """Append reads newer than the archive holds and return how many.
+
+        The newest archived read is fetched again and replaced, since it may
+        have been partial. start only applies to an empty archive.
+        """
+        from .columnar import UsageColumns
+
+        if end is None:
+            end = datetime.now() - timedelta(days=1)
+        last = archive.last_start
+        if last is not None:
+            # Naive datetimes are local time, as elsewhere in this class.
+            start = last if end.tzinfo else last.astimezone().replace(tzinfo=None)
+        reads = await self.async_get_usage_data(
+            measurement, mode, start, end, skip_itemization
+        )
+        return archive.append(
+            UsageColumns.from_reads(
+                [read for read in reads if last is None or read.start_time >= last],
+                ZoneInfo(self.utility.timezone()),
+            )
+        )
+
+    async def aiter_usage_batches(
+        self,
+        measurement: str,
+        mode: AggregateType = AggregateType.MONTH,
+        start: datetime = datetime.fromtimestamp(967231641),
+        end: datetime | None = None,
+        skip_itemization: bool = True,
+        lookahead: int = 4,
+    ) -> AsyncIterator[list[CostRead]]:
+        """Yield each window's reads in time order as soon as it is fetched.
+
+        At most lookahead windows are fetched ahead of the consumer, so peak
+        memory depends on lookahead rather than on the date range. A window
+        that still fails after retries raises CannotConnect. end defaults to
+        this time yesterday.
+
+        :raises ValueError: if lookahead is less than 1.
+        """
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1")
+        if end is None:
+            end = datetime.now() - timedelta(days=1)
+        windows = iter(await self.async_plan_windows(measurement, mode, start, end))
+        pending: deque[asyncio.Task[list[CostRead]]] = deque()
+
+        def schedule() -> None:
+            for w_start, w_end in islice(windows, lookahead - len(pending)):
+                pending.append(
+                    asyncio.ensure_future(
+                        self._async_fetch_window(
+                            measurement, mode, w_start, w_end, skip_itemization
+                        )
                     )
-                    tasks.append(single)
-                result = await asyncio.gather(*tasks)
-                results = list(chain(*result))
-        return results
+                )
+
+        last_start: datetime | None = None
+        try:
+            schedule()
+            while pending:
+                reads = _merge_reads(await pending.popleft())
+                schedule()
+                if last_start is not None:
+                    reads = [read for read in reads if read.start_time > last_start]
+                if reads:
+                    last_start = reads[-1].start_time
+                    yield reads
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def aiter_usage(
+        self,
+        measurement: str,
+        mode: AggregateType = AggregateType.MONTH,
+        start: datetime = datetime.fromtimestamp(967231641),
+        end: datetime | None = None,
+        skip_itemization: bool = True,
+        lookahead: int = 4,
+    ) -> AsyncIterator[CostRead]:
+        """Yield reads one at a time, in time order; see aiter_usage_batches."""
+        async for batch in self.aiter_usage_batches(
+            measurement, mode, start, end, skip_itemization, lookahead
+        ):
+            for read in batch:
+                yield read
+
+    async def async_sync(
+        self,
+        measurement: str,
+        mode: AggregateType = AggregateType.DAY,
+        since: datetime | None = None,
+        lookback: timedelta = timedelta(days=30),
+    ) -> SyncResult:
+        """Fetch only reads newer than the last finalized read.
+
+        since defaults to the watermark from the previous sync of this
+        measurement and mode, or lookback before now on the first run. Naive
+        datetimes are local time, as elsewhere. Reads ending more than
+        settlement_lag ago are finalized and move the watermark; it never
+        moves past a window that failed, so a later sync picks those intervals
+        up again.
+        """
+        key = (measurement, str(mode))
+        if since is None:
+            since = self.watermarks.get(key)
+        now = datetime.now(ZoneInfo(self.utility.timezone()))
+        if since is None:
+            since = now - lookback
+        elif since.tzinfo is None:
+            since = since.astimezone()
+        result = await self.async_get_usage_result(measurement, mode, since, now)
+        limit = now - self.settlement_lag
+        if result.failed:
+            limit = min(limit, min(w_start for w_start, _ in result.failed))
+        if result.reads and result.reads[0].start_time.tzinfo is None:
+            since = since.astimezone().replace(tzinfo=None)
+            limit = limit.astimezone().replace(tzinfo=None)
+        reads = [read for read in result.reads if read.start_time >= since]
+
+        watermark = self.watermarks.get(key)
+        for read in reads:
+            if read.end_time > limit or read.consumption is None:
+                break
+            watermark = read.end_time
+        if watermark is not None:
+            self.watermarks[key] = watermark
+        return SyncResult(reads=reads, watermark=watermark, failed=result.failed)
 
     async def async_get_breakdown(
         self,
         start: datetime = datetime.fromtimestamp(967231641),
-        end: datetime = datetime.now() - timedelta(days=1),
+        end: datetime | None = None,
+        measurement: str = "ELECTRIC",
+        home: int | None = None,
+        max_in_flight: int = 4,
+        current_period: bool = False,
     ) -> list[CostRead]:
-        result = await self.async_fetch(
-            "ELECTRIC",
-            AggregateType.MONTH,
-            start,
-            end,
-            skip_itemization=False,
+        """Return one read with its itemization per billing cycle.
+
+        With align_to_cycles each billing cycle overlapping start to end is
+        requested on its own, and otherwise each calendar month, as are the
+        months of utilities without billing cycles. At most max_in_flight are
+        in flight, so a failure only costs that window. Windows that closed
+        more than settlement_lag ago never change and are kept by the client.
+        home defaults to the first discovered home, or home 1.
+
+        current_period instead reads only the category totals of the latest
+        itemized period from the much smaller itemization-widget-data, and
+        ignores start and end. The read has no consumption or cost.
+
+        :raises IncompleteData: if some cycles failed; the error carries the
+            UsageResult with the reads that did arrive.
+        """
+        if end is None:
+            end = datetime.now() - timedelta(days=1)
+        home = self._home(home)
+        if not self._exists(measurement, home):
+            return []
+        if current_period:
+            return await self.coalescer.run(
+                (self.user_id, "itemization-widget-data", measurement),
+                lambda: self._async_fetch_itemization_widget(measurement),
+            )
+        cycles = []
+        if self.align_to_cycles:
+            cycles = await self._async_cycles_or_calendar(measurement, home)
+        windows = _breakdown_windows(start, end, cycles)
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def fetch(w_start: datetime, w_end: datetime) -> list[CostRead]:
+            key = (measurement, int(w_start.timestamp()), int(w_end.timestamp()))
+            cached = self._breakdowns.get(key)
+            if cached is not None:
+                self._breakdowns.move_to_end(key)
+                return cached
+            async with semaphore:
+                reads = await self._async_fetch_window(
+                    measurement, AggregateType.MONTH, w_start, w_end, False
+                )
+            if self._cache_ttl(w_end, cycles) is None:
+                self._breakdowns[key] = reads
+                while len(self._breakdowns) > BREAKDOWN_CACHE_SIZE:
+                    self._breakdowns.popitem(last=False)
+            return reads
+
+        results = await asyncio.gather(
+            *(fetch(w_start, w_end) for w_start, w_end in windows),
+            return_exceptions=True,
+        )
+        reads: list[list[CostRead]] = []
+        failed: list[tuple[datetime, datetime]] = []
+        for window, res in zip(windows, results):
+            if isinstance(res, CannotConnect):
+                logger.debug("Breakdown %s to %s failed: %s", window[0], window[1], res)
+                failed.append(window)
+            elif isinstance(res, BaseException):
+                raise res
+            else:
+                reads.append(res)
+        merged = _merge_reads(chain(*reads))
+        if failed:
+            raise IncompleteData(UsageResult(reads=merged, failed=failed))
+        return merged
+
+    async def _async_fetch_itemization_widget(self, measurement: str) -> list[CostRead]:
+        url = (
+            f"{self.base_url}"
+            "/v2.0/dashboard/users/"
+            f"{self.user_id}"
+            "/itemization-widget-data"
+        )
+        ps = {"measurement-type": measurement, "date-format": "DATE_TIME"}
+        result = await self._async_get_json(url, ps)
+        _debug_response(result)
+        details = (result.get("payload") or {}).get("itemizationDetails") or {}
+        if details.get("startTs") is None or details.get("endTs") is None:
+            raise CannotConnect("itemization-widget-data has no billing period")
+        tz = ZoneInfo(self.utility.timezone())
+        items = details.get(measurement.lower())
+        return _COST_READS.validate_python(
+            [
+                {
+                    "start_time": datetime.fromtimestamp(details["startTs"], tz),
+                    "end_time": datetime.fromtimestamp(details["endTs"], tz),
+                    "consumption": None,
+                    "cost": None,
+                    "temperature": None,
+                    "itemization": _parse_items(items) if items else None,
+                }
+            ]
         )
-        return result
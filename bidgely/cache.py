@@ -0,0 +1,135 @@
+"""Caches for usage-chart-data payloads."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from pydantic.dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Identifies one usage-chart-data request."""
+
+    user_id: str
+    measurement: str
+    mode: str
+    start: int
+    end: int
+    itemization: bool
+
+
+class UsageCache:
+    """Base class for a store of raw usage-chart-data payloads.
+
+    Entries stored with ttl=None never expire; use that for intervals that
+    can no longer change.
+    """
+
+    async def async_get(self, key: CacheKey) -> list[dict[str, Any]] | None:
+        """Return the cached payload, or None if missing or expired."""
+        raise NotImplementedError
+
+    async def async_set(
+        self, key: CacheKey, payload: list[dict[str, Any]], ttl: timedelta | None
+    ) -> None:
+        """Store a payload for key."""
+        raise NotImplementedError
+
+
+class MemoryCache(UsageCache):
+    """Process-local cache, mostly useful for tests and short-lived scripts."""
+
+    def __init__(self) -> None:
+        self._entries: dict[CacheKey, tuple[list[dict[str, Any]], float | None]] = {}
+
+    async def async_get(self, key: CacheKey) -> list[dict[str, Any]] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        payload, expires = entry
+        if expires is not None and expires <= time.time():
+            del self._entries[key]
+            return None
+        return payload
+
+    async def async_set(
+        self, key: CacheKey, payload: list[dict[str, Any]], ttl: timedelta | None
+    ) -> None:
+        expires = None if ttl is None else time.time() + ttl.total_seconds()
+        self._entries[key] = (payload, expires)
+
+
+class SQLiteCache(UsageCache):
+    """On-disk cache backed by a single SQLite file.
+
+    Queries run in the default executor so the event loop is never blocked
+    on disk I/O.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path: Path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                " user_id TEXT, measurement TEXT, mode TEXT,"
+                " start INTEGER, end INTEGER, itemization INTEGER,"
+                " payload TEXT NOT NULL, expires REAL,"
+                " PRIMARY KEY (user_id, measurement, mode, start, end, itemization))"
+            )
+
+    def _get(self, key: CacheKey) -> list[dict[str, Any]] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires FROM usage WHERE user_id = ? AND"
+                " measurement = ? AND mode = ? AND start = ? AND end = ? AND"
+                " itemization = ?",
+                _key_params(key),
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        payload: list[dict[str, Any]] = json.loads(row[0])
+        return payload
+
+    def _set(
+        self, key: CacheKey, payload: list[dict[str, Any]], ttl: timedelta | None
+    ) -> None:
+        expires = None if ttl is None else time.time() + ttl.total_seconds()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO usage VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*_key_params(key), json.dumps(payload), expires),
+            )
+
+    async def async_get(self, key: CacheKey) -> list[dict[str, Any]] | None:
+        return await asyncio.get_running_loop().run_in_executor(None, self._get, key)
+
+    async def async_set(
+        self, key: CacheKey, payload: list[dict[str, Any]], ttl: timedelta | None
+    ) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._set, key, payload, ttl
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _key_params(key: CacheKey) -> tuple[str, str, str, int, int, int]:
+    return (
+        key.user_id,
+        key.measurement,
+        key.mode,
+        key.start,
+        key.end,
+        int(key.itemization),
+    )
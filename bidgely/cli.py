@@ -0,0 +1,255 @@
+"""The bidgely command: resumable bulk export of usage for many accounts.
+
+    bidgely export -c accounts.json -o out/ --mode hour --start 2019-01-01
+
+writes one file (or Parquet directory) per account and measurement into
+out/ and records progress in out/checkpoint.json after every chunk.
+Running the same command again skips the windows already written; without
+--start and --end it continues the date range the export was started for.
+"""
+
+import argparse
+import asyncio
+import csv
+import logging
+import sys
+import time
+from collections import deque
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+from .auth import FileTokenStore
+from .bidgely import BASE_URL, AggregateType, Bidgely
+from .columnar import UsageColumns
+from .export import WRITERS, Checkpoint, Window
+from .fleet import BidgelyFleet, Credentials
+from .scheduler import RequestScheduler
+from .transport import BACKFILL_PROFILE
+
+logger = logging.getLogger(__name__)
+
+_CREDENTIALS = TypeAdapter(list[Credentials])
+
+
+def load_credentials(path: Path) -> list[Credentials]:
+    """Read accounts from a JSON list or a CSV file with a header row.
+
+    Each account has utility, username, password and account_id.
+    """
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="") as f:
+            return _CREDENTIALS.validate_python(list(csv.DictReader(f)))
+    return _CREDENTIALS.validate_json(path.read_bytes())
+
+
+def _span(args: argparse.Namespace, stored: Window | None) -> tuple[datetime, datetime]:
+    """Return the range to export, taking omitted ends from the checkpoint."""
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = args.start or (
+        datetime.fromtimestamp(stored[0]) if stored else today - timedelta(days=365)
+    )
+    end = args.end or (datetime.fromtimestamp(stored[1]) if stored else today)
+    return start, end
+
+
+async def _export_account(
+    client: Bidgely,
+    args: argparse.Namespace,
+    checkpoint: Checkpoint,
+    measurement: str,
+) -> int:
+    """Export one account and measurement, returning the rows written."""
+    if client.account is not None and not client.account.has_measurement(measurement):
+        logger.info("Account %s has no %s meter", client.account_id, measurement)
+        return 0
+    name = f"{client.utility.__name__}-{client.account_id}-{measurement}-{args.mode}"
+    key = f"{name}.{args.format}"
+    start, end = _span(args, None if args.restart else checkpoint.span(key))
+    checkpoint.start(key, (int(start.timestamp()), int(end.timestamp())), args.restart)
+    writer = WRITERS[args.format](args.output / key)
+    writer.resume(checkpoint.state(key))
+    done = checkpoint.done(key)
+    windows = [
+        window
+        for window in await client.async_plan_windows(
+            measurement, args.mode, start, end
+        )
+        if (int(window[0].timestamp()), int(window[1].timestamp())) not in done
+    ]
+    logger.info("%s: %d windows to fetch, %d done", key, len(windows), len(done))
+    pending: deque[tuple[tuple[datetime, datetime], asyncio.Task[UsageColumns]]]
+    pending = deque()
+    queue = iter(windows)
+    written: list[tuple[int, int]] = []
+    rows = 0
+    committed = time.monotonic()
+
+    def schedule() -> None:
+        while len(pending) < args.max_in_flight:
+            window = next(queue, None)
+            if window is None:
+                return
+            task = asyncio.ensure_future(
+                client.async_fetch_columns(measurement, args.mode, *window)
+            )
+            pending.append((window, task))
+
+    try:
+        schedule()
+        while pending:
+            window, task = pending.popleft()
+            columns = await task
+            schedule()
+            rows += writer.write(columns)
+            written.append((int(window[0].timestamp()), int(window[1].timestamp())))
+            if (
+                writer.buffered >= args.chunk_rows
+                or time.monotonic() - committed >= args.checkpoint_interval
+                or not pending
+            ):
+                checkpoint.record(key, written, writer.commit())
+                written = []
+                committed = time.monotonic()
+    finally:
+        for _, task in pending:
+            task.cancel()
+    return rows
+
+
+async def _export(args: argparse.Namespace) -> int:
+    credentials = load_credentials(args.credentials)
+    args.output.mkdir(parents=True, exist_ok=True)
+    checkpoint = Checkpoint(args.output / "checkpoint.json")
+    token_store = FileTokenStore(args.tokens) if args.tokens else None
+    failures = 0
+    async with BidgelyFleet(
+        credentials,
+        max_accounts=args.parallel,
+        max_in_flight=args.max_in_flight,
+        transport=BACKFILL_PROFILE,
+        scheduler=RequestScheduler(args.max_concurrency, args.rate_limit),
+        token_store=token_store,
+        align_to_cycles=args.align_to_cycles,
+        discover=args.discover,
+        base_url=args.base_url,
+    ) as fleet:
+
+        async def export(client: Bidgely) -> int:
+            return sum(
+                [
+                    await _export_account(client, args, checkpoint, measurement)
+                    for measurement in args.measurement
+                ]
+            )
+
+        async for result in fleet.aiter_map(export):
+            account = result.credentials.account_id
+            if result.ok:
+                logger.info("Account %s: %d rows", account, result.value)
+            else:
+                failures += 1
+                logger.error("Account %s failed: %s", account, result.error)
+    return failures
+
+
+def _datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point of the bidgely console script."""
+    parser = argparse.ArgumentParser(prog="bidgely", description=__doc__.split("\n")[0])
+    parser.add_argument("-v", "--verbose", action="store_true")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser(
+        "export",
+        help="export usage for every account in a credentials file",
+        description="Rerun the same command to resume an interrupted export.",
+    )
+    export.add_argument(
+        "-c",
+        "--credentials",
+        type=Path,
+        required=True,
+        help="JSON list or CSV of utility, username, password, account_id",
+    )
+    export.add_argument("-o", "--output", type=Path, default=Path("bidgely-export"))
+    export.add_argument("-f", "--format", choices=sorted(WRITERS), default="csv")
+    export.add_argument(
+        "--mode",
+        type=AggregateType,
+        choices=list(AggregateType),
+        default=AggregateType.DAY,
+    )
+    export.add_argument(
+        "--measurement",
+        action="append",
+        choices=["ELECTRIC", "GAS"],
+        help="repeat for several; defaults to ELECTRIC",
+    )
+    export.add_argument(
+        "--start",
+        type=_datetime,
+        help="ISO date or datetime; defaults to the checkpoint's, else a year ago",
+    )
+    export.add_argument(
+        "--end",
+        type=_datetime,
+        help="ISO date or datetime; defaults to the checkpoint's, else midnight today",
+    )
+    export.add_argument(
+        "-j", "--parallel", type=int, default=4, help="accounts exported at once"
+    )
+    export.add_argument(
+        "--max-in-flight", type=int, default=4, help="windows in flight per account"
+    )
+    export.add_argument("--max-concurrency", type=int, default=8)
+    export.add_argument(
+        "--rate-limit", type=float, default=10.0, help="requests per second"
+    )
+    export.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=5_000,
+        help="rows buffered before they are written and checkpointed",
+    )
+    export.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=10.0,
+        help="seconds between checkpoints, however few rows are buffered",
+    )
+    export.add_argument("--tokens", type=Path, help="file to keep login tokens in")
+    export.add_argument("--align-to-cycles", action="store_true")
+    export.add_argument(
+        "--discover",
+        action="store_true",
+        help="skip measurements an account has no meter for",
+    )
+    export.add_argument("--base-url", default=BASE_URL, help=argparse.SUPPRESS)
+    export.add_argument(
+        "--restart", action="store_true", help="ignore and replace the checkpoint"
+    )
+    args = parser.parse_args(argv)
+    args.measurement = args.measurement or ["ELECTRIC"]
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    try:
+        failures = asyncio.run(_export(args))
+    except (OSError, ValueError) as err:
+        logger.error("%s", err)
+        return 2
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; rerun the same command to resume")
+        return 130
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Share one request between identical concurrent calls."""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import timedelta
+from typing import Any, TypeVar
+
+import aiohttp
+
+from .metrics import get_metrics_sink
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_COALESCERS: "weakref.WeakKeyDictionary[aiohttp.ClientSession, RequestCoalescer]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class RequestCoalescer:
+    """Run each distinct request once while identical calls wait for it.
+
+    Calls with the same key that arrive while a request is in flight share
+    its result, or its exception. With max_entries, results are also kept
+    in an LRU for ttl so calls shortly after reuse them too. Shared results
+    are the same objects for every caller, so treat them as read-only.
+    """
+
+    def __init__(
+        self, max_entries: int = 0, ttl: timedelta = timedelta(seconds=30)
+    ) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        self.max_entries: int = max_entries
+        self.ttl: timedelta = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.shared: int = 0
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        self._waiters: dict[Hashable, int] = {}
+        self._results: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    @classmethod
+    def for_session(
+        cls,
+        session: aiohttp.ClientSession,
+        max_entries: int = 0,
+        ttl: timedelta = timedelta(seconds=30),
+    ) -> "RequestCoalescer":
+        """Return the coalescer shared by every client on this session.
+
+        As with RequestScheduler.for_session, the settings only apply the
+        first time a coalescer is created for the session.
+        """
+        coalescer = _COALESCERS.get(session)
+        if coalescer is None:
+            coalescer = cls(max_entries=max_entries, ttl=ttl)
+            _COALESCERS[session] = coalescer
+        return coalescer
+
+    def _count(self, result: str) -> None:
+        get_metrics_sink().increment(
+            "bidgely_coalesce_requests_total", 1.0, {"result": result}
+        )
+
+    def _cached(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._results.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._results[key]
+            return False, None
+        self._results.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if not self.max_entries:
+            return
+        self._results[key] = (time.monotonic() + self.ttl.total_seconds(), value)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Return the result for key, calling factory only if nobody else is.
+
+        The request is cancelled only when every caller waiting on it is.
+        """
+        found, value = self._cached(key)
+        if found:
+            self.hits += 1
+            self._count("hit")
+            return value
+        task = self._in_flight.get(key)
+        if task is None:
+            self.misses += 1
+            self._count("miss")
+            task = asyncio.ensure_future(self._run(key, factory))
+            self._in_flight[key] = task
+            self._waiters[key] = 0
+        else:
+            self.shared += 1
+            self._count("shared")
+            logger.debug("Sharing in-flight request %s", key)
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._in_flight.get(key) is task:
+                self._waiters[key] -= 1
+                if not self._waiters[key]:
+                    task.cancel()
+            raise
+
+    async def _run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        try:
+            value = await factory()
+        finally:
+            self._in_flight.pop(key, None)
+            self._waiters.pop(key, None)
+        self._store(key, value)
+        return value
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop the cached result for key, or every cached result."""
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key, None)
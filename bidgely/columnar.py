@@ -0,0 +1,313 @@
+"""Column-oriented storage for usage reads.
+
+Numeric columns live in contiguous array.array buffers, so NumPy can wrap
+them without copying. NumPy, pandas and pyarrow are optional and only
+imported by the export methods that need them.
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from datetime import datetime, tzinfo
+from itertools import chain
+from typing import TYPE_CHECKING, Any
+
+from .bidgely import CostRead, Itemization, MeasurementCategory
+from .decode import parse_datetimes
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+NAN = math.nan
+
+
+def _import(name: str) -> Any:
+    try:
+        return __import__(name)
+    except ImportError as err:
+        raise ImportError(
+            f"{name} is required for this export; install bidgely[columnar]"
+        ) from err
+
+
+def _float(value: float | None) -> float:
+    return NAN if value is None else float(value)
+
+
+def _optional(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+class UsageColumns:
+    """Usage reads stored as columns instead of one CostRead per row.
+
+    Times are epoch seconds, shown in tz; without one, the offset of the
+    first timestamp is used for every row, which is wrong across a DST
+    change, so pass the utility's zone. Missing consumption, cost and
+    temperature are NaN. Itemization is a long-format table where item_row
+    is the index of the read each entry belongs to. Indexing or iterating
+    builds CostReads on demand, so code written for list[CostRead] keeps
+    working.
+    """
+
+    def __init__(self, tz: tzinfo | None = None) -> None:
+        self.tz: tzinfo | None = tz
+        self.start = array("q")
+        self.end = array("q")
+        self.consumption = array("d")
+        self.cost = array("d")
+        self.temperature = array("d")
+        self.item_row = array("q")
+        self.item_id = array("q")
+        self.item_category: list[str] = []
+        self.item_usage = array("q")
+        self.item_cost = array("q")
+        self.item_percentage = array("q")
+        self.item_cost_percentage = array("q")
+        self._item_offsets: list[int] | None = None
+
+    @classmethod
+    def from_payload(
+        cls,
+        payload: Iterable[dict[str, Any]],
+        skip_itemization: bool = True,
+        tz: tzinfo | None = None,
+    ) -> "UsageColumns":
+        """Build columns straight from a usage-chart-data payload."""
+        columns = cls(tz)
+        columns.append_payload(payload, skip_itemization)
+        return columns
+
+    @classmethod
+    def from_reads(
+        cls, reads: Iterable[CostRead], tz: tzinfo | None = None
+    ) -> "UsageColumns":
+        """Build columns from existing CostReads."""
+        columns = cls(tz)
+        for read in reads:
+            if columns.tz is None and not columns.start:
+                columns.tz = read.start_time.tzinfo
+            row = len(columns.start)
+            columns.start.append(int(read.start_time.timestamp()))
+            columns.end.append(int(read.end_time.timestamp()))
+            columns.consumption.append(_float(read.consumption))
+            columns.cost.append(_float(read.cost))
+            columns.temperature.append(_float(read.temperature))
+            for item in read.itemization or ():
+                columns._append_item(
+                    row,
+                    item.id,
+                    str(item.category),
+                    item.usage,
+                    item.cost,
+                    item.percentage,
+                    item.cost_percentage,
+                )
+        return columns
+
+    def _append_item(
+        self,
+        row: int,
+        id: int,
+        category: str,
+        usage: int,
+        cost: int,
+        percentage: int,
+        cost_percentage: int,
+    ) -> None:
+        self.item_row.append(row)
+        self.item_id.append(id)
+        self.item_category.append(category)
+        self.item_usage.append(usage)
+        self.item_cost.append(cost)
+        self.item_percentage.append(percentage)
+        self.item_cost_percentage.append(cost_percentage)
+        self._item_offsets = None
+
+    def append_payload(
+        self, payload: Iterable[dict[str, Any]], skip_itemization: bool = True
+    ) -> None:
+        """Append the reads of a usage-chart-data payload."""
+        payload = list(payload)
+        times = parse_datetimes(
+            chain(
+                (read["intervalStartDate"] for read in payload),
+                (read["intervalEndDate"] for read in payload),
+            )
+        )
+        if self.tz is None and not self.start and times:
+            self.tz = times[0].tzinfo
+        n = len(payload)
+        self.start.extend(int(dt.timestamp()) for dt in times[:n])
+        self.end.extend(int(dt.timestamp()) for dt in times[n:])
+        self.consumption.extend(_float(read["consumption"]) for read in payload)
+        self.cost.extend(_float(read["cost"]) for read in payload)
+        self.temperature.extend(_float(read["temperature"]) for read in payload)
+        if skip_itemization:
+            return
+        first_row = len(self.start) - n
+        for row, read in enumerate(payload, first_row):
+            if read["itemizationDetailsList"] is None:
+                continue
+            for item in read["itemizationDetailsList"]:
+                self._append_item(
+                    row,
+                    item["id"],
+                    item["category"],
+                    int(item["usage"]),
+                    int(item["cost"]),
+                    int(item["percentage"]),
+                    int(item["costPercentage"]),
+                )
+
+    def extend(self, other: "UsageColumns") -> None:
+        """Append every row of other."""
+        offset = len(self.start)
+        if self.tz is None and not self.start:
+            self.tz = other.tz
+        self.start.extend(other.start)
+        self.end.extend(other.end)
+        self.consumption.extend(other.consumption)
+        self.cost.extend(other.cost)
+        self.temperature.extend(other.temperature)
+        self.item_row.extend(array("q", (row + offset for row in other.item_row)))
+        self.item_id.extend(other.item_id)
+        self.item_category.extend(other.item_category)
+        self.item_usage.extend(other.item_usage)
+        self.item_cost.extend(other.item_cost)
+        self.item_percentage.extend(other.item_percentage)
+        self.item_cost_percentage.extend(other.item_cost_percentage)
+        self._item_offsets = None
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def slice(self, start: int, stop: int | None = None) -> "UsageColumns":
+        """Return rows start to stop, with their itemization, as new columns."""
+        stop = len(self.start) if stop is None else stop
+        result = UsageColumns(self.tz)
+        result.start = self.start[start:stop]
+        result.end = self.end[start:stop]
+        result.consumption = self.consumption[start:stop]
+        result.cost = self.cost[start:stop]
+        result.temperature = self.temperature[start:stop]
+        lo = bisect_left(self.item_row, start)
+        hi = bisect_left(self.item_row, stop)
+        result.item_row = array("q", (row - start for row in self.item_row[lo:hi]))
+        result.item_id = self.item_id[lo:hi]
+        result.item_category = self.item_category[lo:hi]
+        result.item_usage = self.item_usage[lo:hi]
+        result.item_cost = self.item_cost[lo:hi]
+        result.item_percentage = self.item_percentage[lo:hi]
+        result.item_cost_percentage = self.item_cost_percentage[lo:hi]
+        return result
+
+    def _datetime(self, ts: int) -> datetime:
+        return datetime.fromtimestamp(ts, self.tz)
+
+    def _items(self, row: int) -> list[Itemization] | None:
+        if self._item_offsets is None:
+            # item_row is sorted, so offsets[row]:offsets[row + 1] are its items.
+            offsets = [0] * (len(self.start) + 1)
+            for r in self.item_row:
+                offsets[r + 1] += 1
+            for i in range(len(self.start)):
+                offsets[i + 1] += offsets[i]
+            self._item_offsets = offsets
+        lo, hi = self._item_offsets[row], self._item_offsets[row + 1]
+        if lo == hi:
+            return None
+        return [
+            Itemization(
+                id=self.item_id[i],
+                category=MeasurementCategory(self.item_category[i]),
+                usage=self.item_usage[i],
+                cost=self.item_cost[i],
+                percentage=self.item_percentage[i],
+                cost_percentage=self.item_cost_percentage[i],
+            )
+            for i in range(lo, hi)
+        ]
+
+    def __getitem__(self, row: int) -> CostRead:
+        if row < 0:
+            row += len(self.start)
+        temperature = _optional(self.temperature[row])
+        return CostRead(
+            start_time=self._datetime(self.start[row]),
+            end_time=self._datetime(self.end[row]),
+            consumption=_optional(self.consumption[row]),
+            cost=_optional(self.cost[row]),
+            temperature=None if temperature is None else int(temperature),
+            itemization=self._items(row),
+        )
+
+    def __iter__(self) -> Iterator[CostRead]:
+        for row in range(len(self.start)):
+            yield self[row]
+
+    def to_numpy(self) -> "dict[str, np.ndarray[Any, Any]]":
+        """Return the read columns as NumPy arrays sharing this buffer.
+
+        The arrays are views, and while any of them is alive extend and
+        append_payload raise BufferError, since the buffers cannot be
+        resized. Copy the arrays, or drop them, before appending more reads.
+        """
+        np = _import("numpy")
+        return {
+            "start": np.frombuffer(self.start, dtype=np.int64).view("datetime64[s]"),
+            "end": np.frombuffer(self.end, dtype=np.int64).view("datetime64[s]"),
+            "consumption": np.frombuffer(self.consumption, dtype=np.float64),
+            "cost": np.frombuffer(self.cost, dtype=np.float64),
+            "temperature": np.frombuffer(self.temperature, dtype=np.float64),
+        }
+
+    def itemization_numpy(self) -> "dict[str, np.ndarray[Any, Any]]":
+        """Return the itemization table as NumPy arrays; views, as in to_numpy."""
+        np = _import("numpy")
+        return {
+            "row": np.frombuffer(self.item_row, dtype=np.int64),
+            "id": np.frombuffer(self.item_id, dtype=np.int64),
+            "category": np.array(self.item_category, dtype=object),
+            "usage": np.frombuffer(self.item_usage, dtype=np.int64),
+            "cost": np.frombuffer(self.item_cost, dtype=np.int64),
+            "percentage": np.frombuffer(self.item_percentage, dtype=np.int64),
+            "cost_percentage": np.frombuffer(self.item_cost_percentage, dtype=np.int64),
+        }
+
+    def to_pandas(self) -> "pd.DataFrame":
+        """Return the reads as a DataFrame with UTC start/end columns.
+
+        The numeric columns are views, as in to_numpy.
+        """
+        pd = _import("pandas")
+        frame = pd.DataFrame(self.to_numpy(), copy=False)
+        frame["start"] = frame["start"].dt.tz_localize("UTC")
+        frame["end"] = frame["end"].dt.tz_localize("UTC")
+        return frame
+
+    def itemization_pandas(self) -> "pd.DataFrame":
+        """Return the itemization table as a DataFrame; views, as in to_numpy."""
+        pd = _import("pandas")
+        return pd.DataFrame(self.itemization_numpy(), copy=False)
+
+    def to_arrow(self) -> "pa.Table":
+        """Return the reads as an Arrow table.
+
+        Numeric columns are not copied, so the same caveat as for to_numpy
+        applies while the table is alive.
+        """
+        pa = _import("pyarrow")
+        columns = self.to_numpy()
+        return pa.table(
+            {
+                "start": pa.array(columns["start"], pa.timestamp("s", tz="UTC")),
+                "end": pa.array(columns["end"], pa.timestamp("s", tz="UTC")),
+                "consumption": columns["consumption"],
+                "cost": columns["cost"],
+                "temperature": columns["temperature"],
+            }
+        )
@@ -0,0 +1,37 @@
+"""JSON decoding and timestamp parsing for Bidgely payloads.
+
+orjson is used when it is installed and the standard library otherwise.
+"""
+
+import json
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any
+
+Loads = Callable[[bytes], Any]
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _loads: Loads = json.loads
+    BACKEND = "json"
+else:
+    _loads = orjson.loads
+    BACKEND = "orjson"
+
+
+def loads(data: bytes) -> Any:
+    """Decode a JSON response body with the active backend."""
+    return _loads(data)
+
+
+def set_loads(func: Loads, name: str = "custom") -> None:
+    """Use func (e.g. ujson.loads) to decode every Bidgely response."""
+    global _loads, BACKEND
+    _loads = func
+    BACKEND = name
+
+
+def parse_datetimes(values: Iterable[str]) -> list[datetime]:
+    """Parse a column of ISO 8601 strings."""
+    return list(map(datetime.fromisoformat, values))
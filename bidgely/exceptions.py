@@ -1,5 +1,7 @@
 """Exceptions."""
 
+from typing import Any
+
 
 class CannotConnect(Exception):
     """Error to indicate we cannot connect."""
@@ -7,3 +9,14 @@ class CannotConnect(Exception):
 
 class InvalidAuth(Exception):
     """Error to indicate there is invalid auth."""
+
+
+class IncompleteData(CannotConnect):
+    """Error to indicate some windows of a fetch failed.
+
+    The reads that did arrive and the failed windows are in result.
+    """
+
+    def __init__(self, result: Any) -> None:
+        super().__init__(f"{len(result.failed)} window(s) could not be fetched")
+        self.result = result
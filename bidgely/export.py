@@ -0,0 +1,248 @@
+"""Chunked, resumable export of usage to CSV, NDJSON or Parquet.
+
+A writer buffers UsageColumns and writes them out when commit() is called.
+It returns a small state that a Checkpoint stores along with the windows
+written so far. After a crash, resume(state) drops whatever was written
+after the last checkpoint, so the next run can append without duplicates.
+"""
+
+import csv
+import json
+import math
+import os
+import tempfile
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .columnar import UsageColumns, _import
+
+FIELDS = ("start", "end", "consumption", "cost", "temperature")
+
+Window = tuple[int, int]
+
+
+def _value(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+class ExportWriter:
+    """Base class for writers of one account's reads."""
+
+    extension = ""
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self._buffer = UsageColumns()
+        # Start of the newest row written, to drop repeats at window edges.
+        self._last: int | None = None
+
+    @property
+    def buffered(self) -> int:
+        """Rows written since the last commit."""
+        return len(self._buffer)
+
+    def write(self, columns: UsageColumns) -> int:
+        """Queue rows for the next commit and return how many were new.
+
+        Windows are written in time order; rows starting no later than the
+        last row written are repeats from the previous window and dropped.
+        """
+        if self._last is not None:
+            columns = columns.slice(bisect_right(columns.start, self._last))
+        if columns:
+            self._last = columns.start[-1]
+        self._buffer.extend(columns)
+        return len(columns)
+
+    def _state(self, state: dict[str, int]) -> dict[str, int]:
+        if self._last is not None:
+            state["last"] = self._last
+        return state
+
+    def resume(self, state: dict[str, int]) -> None:
+        """Discard output written after the commit that returned state."""
+        raise NotImplementedError
+
+    def commit(self) -> dict[str, int]:
+        """Write the queued rows durably and return the state to checkpoint."""
+        raise NotImplementedError
+
+    def _rows(self) -> list[tuple[str, str, float | None, float | None, Any]]:
+        buffer = self._buffer
+        times = [datetime.fromtimestamp(ts, buffer.tz) for ts in buffer.start]
+        ends = [datetime.fromtimestamp(ts, buffer.tz) for ts in buffer.end]
+        rows = []
+        for i in range(len(buffer)):
+            temperature = _value(buffer.temperature[i])
+            rows.append(
+                (
+                    times[i].isoformat(),
+                    ends[i].isoformat(),
+                    _value(buffer.consumption[i]),
+                    _value(buffer.cost[i]),
+                    None if temperature is None else int(temperature),
+                )
+            )
+        return rows
+
+
+class _AppendWriter(ExportWriter):
+    """A single file that grows by appending; state is its committed size."""
+
+    def resume(self, state: dict[str, int]) -> None:
+        self._last = state.get("last")
+        size = state.get("size", 0)
+        if self.path.exists():
+            with open(self.path, "r+b") as f:
+                f.truncate(size)
+        elif size:
+            raise FileNotFoundError(f"{self.path} is missing; start over")
+
+    def _append(self, f: Any) -> None:
+        raise NotImplementedError
+
+    def commit(self) -> dict[str, int]:
+        if self.buffered:
+            with open(self.path, "a", newline="") as f:
+                self._append(f)
+                f.flush()
+                os.fsync(f.fileno())
+            self._buffer = UsageColumns()
+        size = self.path.stat().st_size if self.path.exists() else 0
+        return self._state({"size": size})
+
+
+class CsvWriter(_AppendWriter):
+    """Comma-separated values with a header row; missing values are empty."""
+
+    extension = "csv"
+
+    def _append(self, f: Any) -> None:
+        writer = csv.writer(f)
+        if f.tell() == 0:
+            writer.writerow(FIELDS)
+        writer.writerows(
+            ["" if value is None else value for value in row] for row in self._rows()
+        )
+
+
+class NdjsonWriter(_AppendWriter):
+    """One JSON object per line; missing values are null."""
+
+    extension = "ndjson"
+
+    def _append(self, f: Any) -> None:
+        f.writelines(
+            json.dumps(dict(zip(FIELDS, row)), separators=(",", ":")) + "\n"
+            for row in self._rows()
+        )
+
+
+class ParquetWriter(ExportWriter):
+    """A directory of Parquet files, one per commit; state is the file count.
+
+    Needs pyarrow (bidgely[columnar]). Read the directory as one dataset,
+    e.g. with pandas.read_parquet(path).
+    """
+
+    extension = "parquet"
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._parts = 0
+
+    def _part(self, n: int) -> Path:
+        return self.path / f"part-{n:05d}.parquet"
+
+    def resume(self, state: dict[str, int]) -> None:
+        self._last = state.get("last")
+        self._parts = state.get("parts", 0)
+        if self.path.exists():
+            for part in self.path.glob("part-*.parquet"):
+                if int(part.stem.split("-")[1]) >= self._parts:
+                    part.unlink()
+
+    def commit(self) -> dict[str, int]:
+        if self.buffered:
+            parquet = _import("pyarrow.parquet").parquet
+            self.path.mkdir(parents=True, exist_ok=True)
+            part = self._part(self._parts)
+            tmp = part.with_suffix(".tmp")
+            parquet.write_table(self._buffer.to_arrow(), tmp)
+            os.replace(tmp, part)
+            self._parts += 1
+            self._buffer = UsageColumns()
+        return self._state({"parts": self._parts})
+
+
+WRITERS: dict[str, type[ExportWriter]] = {
+    "csv": CsvWriter,
+    "ndjson": NdjsonWriter,
+    "parquet": ParquetWriter,
+}
+
+
+class Checkpoint:
+    """Per-export progress in a JSON file: windows written and writer state.
+
+    Exports are identified by a key, e.g. utility, account, measurement and
+    mode. The file is replaced atomically on every record().
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path: Path = Path(path)
+        try:
+            self._data: dict[str, Any] = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            self._data = {}
+
+    def start(self, key: str, span: Window, restart: bool = False) -> None:
+        """Begin or continue the export key covering span.
+
+        A checkpoint for a different span raises ValueError, since its
+        windows would not line up; pass restart to drop it instead.
+        """
+        entry = self._data.get(key)
+        if entry is not None and not restart and tuple(entry["span"]) != span:
+            raise ValueError(
+                f"{key} was started for another date range; "
+                "use the same start and end, or restart"
+            )
+        if entry is None or restart:
+            self._data[key] = {"span": list(span), "done": [], "state": {}}
+            self._save()
+
+    def span(self, key: str) -> Window | None:
+        """Return the span key was started for, or None if it was not."""
+        entry = self._data.get(key)
+        return (entry["span"][0], entry["span"][1]) if entry is not None else None
+
+    def done(self, key: str) -> set[Window]:
+        """Return the windows of key that are written."""
+        entry = self._data.get(key)
+        return {(s, e) for s, e in entry["done"]} if entry is not None else set()
+
+    def state(self, key: str) -> dict[str, int]:
+        """Return the writer state of the last record() for key."""
+        entry = self._data.get(key)
+        return dict(entry["state"]) if entry is not None else {}
+
+    def record(self, key: str, windows: list[Window], state: dict[str, int]) -> None:
+        """Mark windows of key as written with the writer now at state."""
+        entry = self._data[key]
+        entry["done"].extend([list(window) for window in windows])
+        entry["state"] = state
+        self._save()
+
+    def _save(self) -> None:
+        directory = os.fspath(self.path.parent)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
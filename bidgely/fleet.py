@@ -0,0 +1,192 @@
+"""Running many Bidgely accounts on one session."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from datetime import datetime, timedelta
+from types import TracebackType
+from typing import Any
+
+import aiohttp
+from aiohttp.web_exceptions import HTTPServerError
+from pydantic.dataclasses import dataclass
+
+from .bidgely import AggregateType, Bidgely
+from .exceptions import CannotConnect, InvalidAuth
+from .login import LoginManager
+from .transport import BACKFILL_PROFILE, TransportProfile, create_session
+
+logger = logging.getLogger(__name__)
+
+# Expected failures of one account. Any other exception is also kept to
+# its account, but logged with a traceback since it points at a bug.
+ACCOUNT_ERRORS = (InvalidAuth, CannotConnect, HTTPServerError)
+
+
+@dataclass(slots=True)
+class Credentials:
+    """Login details for one account."""
+
+    utility: str
+    username: str
+    password: str
+    account_id: str
+
+
+@dataclass(slots=True)
+class AccountResult:
+    """Outcome of one fleet call for one account.
+
+    Exactly one of value and error is set.
+    """
+
+    credentials: Credentials
+    value: Any = None
+    error: Any = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call succeeded."""
+        return self.error is None
+
+
+class BidgelyFleet:
+    """Run logins and usage/forecast calls for many accounts at once.
+
+    Every account shares one aiohttp session, and so one connection pool and
+    one RequestScheduler. At most max_accounts accounts are worked on at the
+    same time and each account keeps at most max_in_flight windows queued,
+    so large backfills take turns instead of starving small ones. Results
+    are yielded as soon as each account finishes.
+
+    Without a session the fleet creates one from transport, BACKFILL_PROFILE
+    by default, and closes it in async_close. Create the fleet inside a
+    running event loop then. transport is also passed to every client.
+    A cognito_pool among the client kwargs is also the pool the fleet's
+    LoginManager prefills and times logins on.
+    """
+
+    def __init__(
+        self,
+        credentials: Iterable[Credentials],
+        session: aiohttp.ClientSession | None = None,
+        max_accounts: int = 16,
+        max_in_flight: int = 2,
+        transport: TransportProfile | None = None,
+        **client_kwargs: Any,
+    ) -> None:
+        self.credentials: list[Credentials] = list(credentials)
+        self._owns_session: bool = session is None
+        self.session: aiohttp.ClientSession = (
+            session
+            if session is not None
+            else create_session(
+                transport if transport is not None else BACKFILL_PROFILE
+            )
+        )
+        self.max_accounts: int = max_accounts
+        self.clients: list[Bidgely] = [
+            Bidgely(
+                self.session,
+                cred.utility,
+                cred.username,
+                cred.password,
+                cred.account_id,
+                max_in_flight=max_in_flight,
+                transport=transport,
+                **client_kwargs,
+            )
+            for cred in self.credentials
+        ]
+        self.login_manager = LoginManager(
+            max_concurrency=max_accounts, pool=client_kwargs.get("cognito_pool")
+        )
+
+    async def __aenter__(self) -> "BidgelyFleet":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close the session if the fleet created it."""
+        if self._owns_session:
+            await self.session.close()
+
+    async def async_login(self) -> list[AccountResult]:
+        """Log every account in, returning one result per account in order."""
+        errors = await self.login_manager.async_login_all(self.clients)
+        return [
+            AccountResult(credentials=cred, value=None, error=err)
+            for cred, err in zip(self.credentials, errors)
+        ]
+
+    async def _aiter(
+        self, call: Callable[[Bidgely], Awaitable[Any]]
+    ) -> AsyncIterator[AccountResult]:
+        """Run call for every account and yield results as they complete."""
+        semaphore = asyncio.Semaphore(self.max_accounts)
+
+        async def run(cred: Credentials, client: Bidgely) -> AccountResult:
+            async with semaphore:
+                try:
+                    if client.access_token is None:
+                        await client.async_login()
+                    value = await call(client)
+                except ACCOUNT_ERRORS as err:
+                    logger.debug("Account %s failed: %r", cred.account_id, err)
+                    return AccountResult(credentials=cred, error=err)
+                except Exception as err:
+                    logger.warning(
+                        "Account %s failed: %r", cred.account_id, err, exc_info=True
+                    )
+                    return AccountResult(credentials=cred, error=err)
+            return AccountResult(credentials=cred, value=value)
+
+        tasks = [
+            asyncio.ensure_future(run(cred, client))
+            for cred, client in zip(self.credentials, self.clients)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def aiter_map(
+        self, call: Callable[[Bidgely], Awaitable[Any]]
+    ) -> AsyncIterator[AccountResult]:
+        """Run call for every logged-in client, yielding results as they finish."""
+        return self._aiter(call)
+
+    def aiter_usage_data(
+        self,
+        measurement: str,
+        mode: AggregateType = AggregateType.MONTH,
+        start: datetime = datetime.fromtimestamp(967231641),
+        end: datetime | None = None,
+        skip_itemization: bool = True,
+    ) -> AsyncIterator[AccountResult]:
+        """Yield each account's UsageResult as soon as it is complete.
+
+        Failed windows are reported in the UsageResult rather than as an
+        account error, so they can be retried on their own.
+        """
+        end_time = end if end is not None else datetime.now() - timedelta(days=1)
+        return self._aiter(
+            lambda client: client.async_get_usage_result(
+                measurement, mode, start, end_time, skip_itemization
+            )
+        )
+
+    def aiter_forecast(
+        self, measurement: str = "ELECTRIC", home: int | None = None
+    ) -> AsyncIterator[AccountResult]:
+        """Yield each account's Forecast as soon as it arrives."""
+        return self._aiter(lambda client: client.async_get_forecast(measurement, home))
@@ -0,0 +1,62 @@
+"""Logging in many accounts at once."""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from .bidgely import Bidgely
+from .exceptions import CannotConnect, InvalidAuth
+from .utilities.cognito import CognitoPool, get_cognito_pool
+
+logger = logging.getLogger(__name__)
+
+
+class LoginManager:
+    """Log in a fleet of Bidgely clients with bounded concurrency.
+
+    Logins share a CognitoPool, so each region's Cognito client is built
+    once and SRP calls run on its dedicated thread pool. pool should be the
+    clients' cognito_pool; None means the process-wide pool, which clients
+    without one log in on. The manager prefills SRP key pairs on pool and
+    times logins into its stats.
+    """
+
+    def __init__(
+        self, max_concurrency: int = 16, pool: CognitoPool | None = None
+    ) -> None:
+        self.pool: CognitoPool = pool if pool is not None else get_cognito_pool()
+        self.max_concurrency: int = max_concurrency
+
+    async def async_login_all(
+        self, clients: Iterable[Bidgely]
+    ) -> list[Exception | None]:
+        """Log every client in and return the error for each, or None.
+
+        One account failing, however it fails, does not stop the others.
+        """
+        clients = list(clients)
+        # Each login needs a fresh SRP key pair; generate them ahead of time so
+        # the logins themselves only pop one.
+        self.pool.prefill_srp(len(clients))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def login(client: Bidgely) -> Exception | None:
+            async with semaphore:
+                try:
+                    with self.pool.stats.timed("login"):
+                        await client.async_login()
+                except (InvalidAuth, CannotConnect) as err:
+                    logger.debug("Login failed for %s: %r", client.username, err)
+                    return err
+                except Exception as err:
+                    logger.warning(
+                        "Login failed for %s: %r", client.username, err, exc_info=True
+                    )
+                    return err
+            return None
+
+        return list(await asyncio.gather(*(login(client) for client in clients)))
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per-stage login latency: cognito_client, srp, bidgely_token, sso."""
+        return self.pool.stats.summary()
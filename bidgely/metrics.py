@@ -0,0 +1,212 @@
+"""Client instrumentation: a pluggable metrics sink and a Prometheus exporter.
+
+Bidgely clients and logins report to a MetricsSink. The default sink drops
+everything, so instrumentation costs one method call when it is not used.
+PrometheusSink aggregates in memory and renders the Prometheus text format
+or OpenMetrics, which can be written to a file for node_exporter's textfile
+collector or served by any HTTP framework.
+"""
+
+import bisect
+import math
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+Labels = Mapping[str, str]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class MetricsSink:
+    """Receives measurements. The base class discards them."""
+
+    def observe(self, name: str, value: float, labels: Labels | None = None) -> None:
+        """Record one value, e.g. a duration in seconds, of a histogram."""
+
+    def increment(
+        self, name: str, value: float = 1.0, labels: Labels | None = None
+    ) -> None:
+        """Add value to a counter; counter names end in _total."""
+
+
+def _label_key(labels: Labels | None) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Sequence[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * buckets
+        self.sum = 0.0
+        self.count = 0
+
+
+class PrometheusSink(MetricsSink):
+    """Aggregate counters and histograms in memory and render them as text.
+
+    Safe to call from threads, e.g. login stages timed in the Cognito pool.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self._counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+        self._histograms: dict[str, dict[tuple[tuple[str, str], ...], _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, labels: Labels | None = None) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(len(self.buckets))
+            if index < len(self.buckets):
+                histogram.counts[index] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    def increment(
+        self, name: str, value: float = 1.0, labels: Labels | None = None
+    ) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Return every metric in the Prometheus text format or OpenMetrics."""
+        lines: list[str] = []
+        with self._lock:
+            for name, counters in sorted(self._counters.items()):
+                family = name.removesuffix("_total") if openmetrics else name
+                lines.append(f"# TYPE {family} counter")
+                for key, total in sorted(counters.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(total)}")
+            for name, histograms in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(histograms.items()):
+                    cumulative = 0
+                    bounds = (*self.buckets, float("inf"))
+                    counts = (
+                        *histogram.counts,
+                        histogram.count - sum(histogram.counts),
+                    )
+                    for bound, count in zip(bounds, counts):
+                        cumulative += count
+                        labels = _format_labels((*key, ("le", _format_value(bound))))
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = _format_labels(key)
+                    lines.append(f"{name}_sum{labels} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{labels} {histogram.count}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | os.PathLike[str], openmetrics: bool = False) -> None:
+        """Atomically write render() to path, e.g. for a textfile collector."""
+        directory = os.path.dirname(os.fspath(path)) or "."
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".prom.tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render(openmetrics))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+_SINK: MetricsSink = MetricsSink()
+
+
+def get_metrics_sink() -> MetricsSink:
+    """Return the process-wide sink used when a client is not given one."""
+    return _SINK
+
+
+def set_metrics_sink(sink: MetricsSink) -> None:
+    """Replace the process-wide sink, e.g. with a PrometheusSink."""
+    global _SINK
+    _SINK = sink
+
+
+def trace_config(sink: MetricsSink | None = None) -> aiohttp.TraceConfig:
+    """Return an aiohttp TraceConfig reporting every request on a session.
+
+    Pass it to ClientSession(trace_configs=[...]) to time every request,
+    including logins, with labels for method, host and status.
+    """
+    config = aiohttp.TraceConfig()
+
+    def target() -> MetricsSink:
+        return sink if sink is not None else get_metrics_sink()
+
+    async def on_start(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        ctx.start = time.perf_counter()
+
+    async def on_end(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        labels = {
+            "method": params.method,
+            "host": params.url.host or "",
+            "status": str(params.response.status),
+        }
+        target().observe(
+            "bidgely_http_request_seconds", time.perf_counter() - ctx.start, labels
+        )
+
+    async def on_exception(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        labels = {
+            "method": params.method,
+            "host": params.url.host or "",
+            "error": type(params.exception).__name__,
+        }
+        target().increment("bidgely_http_errors_total", 1.0, labels)
+
+    async def on_chunk(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+        labels = {"host": params.url.host or ""}
+        target().increment(
+            "bidgely_http_response_bytes_total", len(params.chunk), labels
+        )
+
+    config.on_request_start.append(on_start)
+    config.on_request_end.append(on_end)
+    config.on_request_exception.append(on_exception)
+    config.on_response_chunk_received.append(on_chunk)
+    return config
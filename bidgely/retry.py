@@ -0,0 +1,29 @@
+"""Retry policy for transient Bidgely failures."""
+
+import random
+
+from pydantic.dataclasses import dataclass
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(slots=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    attempts counts the first try, so attempts=1 disables retries.
+    """
+
+    attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return how long to wait before retry number attempt (0-based).
+
+        A Retry-After from the server wins over the computed backoff, but is
+        capped at max_delay so a server asking for hours cannot stall a fetch.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
@@ -0,0 +1,228 @@
+"""Aggregate fine-grained reads into days, months or billing cycles locally.
+
+A single HOUR backfill can serve every AggregateType without asking Bidgely
+again. Bucket boundaries are local midnights in the utility's timezone, so
+days are 23 or 25 hours long across DST changes. NumPy is used for the
+column sums when it is installed, with a pure Python fallback.
+"""
+
+import math
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from .bidgely import AggregateType, BillingCycle, CostRead
+from .columnar import UsageColumns
+
+NAN = math.nan
+
+Cycles = Sequence[BillingCycle | tuple[datetime, datetime]]
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _tz(timezone: str | tzinfo) -> tzinfo:
+    return ZoneInfo(timezone) if isinstance(timezone, str) else timezone
+
+
+def _midnight(day: date, tz: tzinfo) -> int:
+    return int(datetime.combine(day, time(0), tzinfo=tz).timestamp())
+
+
+def bucket_edges(
+    first: int, last: int, mode: AggregateType, timezone: str | tzinfo
+) -> list[int]:
+    """Return epoch-second bucket boundaries covering first through last.
+
+    DAY buckets start at local midnight and MONTH buckets at midnight on the
+    first of the month. HOUR buckets are 3600 s apart, aligned to the hour.
+    """
+    if mode == AggregateType.HOUR:
+        return list(range(first - first % 3600, last + 3601, 3600))
+    tz = _tz(timezone)
+    day = datetime.fromtimestamp(first, tz).date()
+    if mode == AggregateType.MONTH:
+        day = day.replace(day=1)
+    edges = [_midnight(day, tz)]
+    while edges[-1] <= last:
+        if mode == AggregateType.MONTH:
+            day = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            day += timedelta(days=1)
+        edges.append(_midnight(day, tz))
+    return edges
+
+
+def cycle_edges(cycles: Cycles) -> tuple[list[int], list[bool]]:
+    """Return bucket boundaries for BillingCycles or (start, end) pairs.
+
+    end is the cycle's last second, as in CostRead.end_time. The second list
+    says which buckets are cycles; the others are gaps between cycles.
+    """
+    spans = [
+        (cycle.start_time, cycle.end_time) if isinstance(cycle, BillingCycle) else cycle
+        for cycle in cycles
+    ]
+    edges: list[int] = []
+    keep: list[bool] = []
+    for start, end in sorted(spans):
+        first, after = int(start.timestamp()), int(end.timestamp()) + 1
+        if edges and first > edges[-1]:
+            edges.append(first)
+            keep.append(False)
+        elif not edges:
+            edges.append(first)
+        # Overlapping cycles start where the previous one ended.
+        if after > edges[-1]:
+            edges.append(after)
+            keep.append(True)
+    return edges, keep
+
+
+def _assign(starts: Sequence[int], edges: Sequence[int]) -> list[int]:
+    """Return the bucket of every start, or -1 when it is outside edges."""
+    last = len(edges) - 1
+    rows = []
+    for ts in starts:
+        i = bisect_right(edges, ts) - 1
+        rows.append(i if i < last else -1)
+    return rows
+
+
+def _sums(
+    rows: Sequence[int], values: Sequence[float], n: int
+) -> tuple[list[float], list[int]]:
+    """Return the per-bucket sum and count of the values that are not NaN."""
+    sums = [0.0] * n
+    counts = [0] * n
+    for row, value in zip(rows, values):
+        if row >= 0 and not math.isnan(value):
+            sums[row] += value
+            counts[row] += 1
+    return sums, counts
+
+
+def _numpy_sums(
+    np: Any, rows: Any, values: Sequence[float], n: int
+) -> tuple[list[float], list[int]]:
+    column = np.frombuffer(values, dtype=np.float64)
+    mask = (rows >= 0) & ~np.isnan(column)
+    sums = np.bincount(rows[mask], weights=column[mask], minlength=n)
+    counts = np.bincount(rows[mask], minlength=n)
+    return sums.tolist(), counts.tolist()
+
+
+def rollup(
+    columns: UsageColumns,
+    mode: AggregateType,
+    timezone: str | tzinfo,
+    cycles: Cycles | None = None,
+) -> UsageColumns:
+    """Aggregate columns into mode buckets in timezone.
+
+    Reads belong to the bucket their start time falls in. Consumption and
+    cost are summed and temperature is averaged, skipping missing values;
+    a bucket with none is missing too. Itemization usage and cost are
+    summed per appliance and the percentages recomputed from the totals.
+    With cycles, MONTH buckets are the billing cycles instead of calendar
+    months and reads outside every cycle are dropped. Empty buckets are
+    left out.
+    """
+    tz = _tz(timezone)
+    result = UsageColumns(tz)
+    if not columns:
+        return result
+    if cycles is not None and mode == AggregateType.MONTH:
+        edges, keep = cycle_edges(cycles)
+    else:
+        edges = bucket_edges(min(columns.start), max(columns.start), mode, tz)
+        keep = [True] * (len(edges) - 1)
+    n = len(keep)
+
+    np = _numpy()
+    if np is not None:
+        indexes = np.frombuffer(columns.start, dtype=np.int64)
+        buckets = np.searchsorted(np.asarray(edges, dtype=np.int64), indexes, "right")
+        buckets -= 1
+        buckets[buckets >= n] = -1
+        rows: list[int] = buckets.tolist()
+        consumption, used = _numpy_sums(np, buckets, columns.consumption, n)
+        cost, costed = _numpy_sums(np, buckets, columns.cost, n)
+        temperature, measured = _numpy_sums(np, buckets, columns.temperature, n)
+        present = np.bincount(buckets[buckets >= 0], minlength=n).tolist()
+    else:
+        rows = _assign(columns.start, edges)
+        consumption, used = _sums(rows, columns.consumption, n)
+        cost, costed = _sums(rows, columns.cost, n)
+        temperature, measured = _sums(rows, columns.temperature, n)
+        present = [0] * n
+        for row in rows:
+            if row >= 0:
+                present[row] += 1
+
+    out: list[int] = [-1] * n
+    for bucket in range(n):
+        if not present[bucket] or not keep[bucket]:
+            continue
+        out[bucket] = len(result.start)
+        result.start.append(edges[bucket])
+        result.end.append(edges[bucket + 1] - 1)
+        result.consumption.append(consumption[bucket] if used[bucket] else NAN)
+        result.cost.append(cost[bucket] if costed[bucket] else NAN)
+        result.temperature.append(
+            round(temperature[bucket] / measured[bucket]) if measured[bucket] else NAN
+        )
+    if columns.item_row:
+        _rollup_items(columns, [out[row] if row >= 0 else -1 for row in rows], result)
+    return result
+
+
+def _rollup_items(
+    columns: UsageColumns, rows: Sequence[int], result: UsageColumns
+) -> None:
+    """Sum itemization per output row and appliance into result."""
+    totals: dict[tuple[int, int, str], list[int]] = {}
+    for i, read in enumerate(columns.item_row):
+        row = rows[read]
+        if row < 0:
+            continue
+        entry = totals.setdefault(
+            (row, columns.item_id[i], columns.item_category[i]), [0, 0]
+        )
+        entry[0] += columns.item_usage[i]
+        entry[1] += columns.item_cost[i]
+    usage_total = [0] * len(result.start)
+    cost_total = [0] * len(result.start)
+    for (row, _, _), (usage, cost) in totals.items():
+        usage_total[row] += usage
+        cost_total[row] += cost
+    # item_row must stay sorted for UsageColumns to find a row's items.
+    for (row, item_id, category), (usage, cost) in sorted(totals.items()):
+        result._append_item(
+            row,
+            item_id,
+            category,
+            usage,
+            cost,
+            round(100 * usage / usage_total[row]) if usage_total[row] else 0,
+            round(100 * cost / cost_total[row]) if cost_total[row] else 0,
+        )
+
+
+def rollup_reads(
+    reads: Iterable[CostRead],
+    mode: AggregateType,
+    timezone: str | tzinfo,
+    cycles: Cycles | None = None,
+) -> list[CostRead]:
+    """Like rollup, for CostReads."""
+    columns = UsageColumns.from_reads(reads, _tz(timezone))
+    return list(rollup(columns, mode, timezone, cycles))
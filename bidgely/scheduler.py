@@ -0,0 +1,125 @@
+"""Request scheduling for Bidgely's NA API."""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+_SCHEDULERS: "weakref.WeakKeyDictionary[aiohttp.ClientSession, RequestScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class RequestScheduler:
+    """Cap in-flight requests and apply an adaptive token-bucket rate limit.
+
+    The rate is halved whenever Bidgely answers with 429 or 5xx and grows back
+    towards the configured limit on every success (AIMD), so a throttled
+    backfill slows down instead of piling up failed requests. A Retry-After
+    pauses every request, for at most max_pause seconds, the same cap as
+    RetryPolicy.max_delay.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        rate_limit: float = 10.0,
+        burst: int | None = None,
+        min_rate: float = 0.5,
+        max_pause: float = 30.0,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if rate_limit <= 0:
+            raise ValueError("rate_limit must be positive")
+        self.max_concurrency: int = max_concurrency
+        self.rate_limit: float = rate_limit
+        self.min_rate: float = min(min_rate, rate_limit)
+        self.rate: float = rate_limit
+        self.max_pause: float = max_pause
+        self.burst: int = burst if burst is not None else max_concurrency
+        self._tokens: float = float(self.burst)
+        self._updated: float = time.monotonic()
+        self._paused_until: float = 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def for_session(
+        cls,
+        session: aiohttp.ClientSession,
+        max_concurrency: int = 8,
+        rate_limit: float = 10.0,
+    ) -> "RequestScheduler":
+        """Return the scheduler shared by every client on this session.
+
+        The limits only apply the first time a scheduler is created for the
+        session; later calls return the existing one.
+        """
+        scheduler = _SCHEDULERS.get(session)
+        if scheduler is None:
+            scheduler = cls(max_concurrency=max_concurrency, rate_limit=rate_limit)
+            _SCHEDULERS[session] = scheduler
+        return scheduler
+
+    async def _acquire_token(self) -> None:
+        """Wait until the bucket has a token and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(
+                    float(self.burst), self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a concurrency slot and a rate token for one request."""
+        async with self._semaphore:
+            await self._acquire_token()
+            yield
+
+    def observe(self, status: int, retry_after: float | None = None) -> None:
+        """Adjust the rate from the status of a finished request."""
+        if status == 429 or status >= 500:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after is not None:
+                self._paused_until = max(
+                    self._paused_until,
+                    time.monotonic() + min(retry_after, self.max_pause),
+                )
+            logger.debug(
+                "Throttled by Bidgely (%s), rate now %.2f/s", status, self.rate
+            )
+        elif status < 400 and self.rate < self.rate_limit:
+            self.rate = min(self.rate_limit, self.rate + self.rate_limit / 20)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds from a Retry-After header, if any."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,56 @@
+"""Appending to a UsageArchive must never drop reads outside the new batch."""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from bidgely import CostRead, UsageArchive
+from bidgely.bidgely import Itemization, MeasurementCategory
+
+TZ = ZoneInfo("America/Toronto")
+FIRST = datetime(2024, 1, 1, tzinfo=TZ)
+
+
+def _reads(days: range, consumption: float = 1.0) -> list[CostRead]:
+    return [
+        CostRead(
+            start_time=FIRST + timedelta(days=day),
+            end_time=FIRST + timedelta(days=day + 1, seconds=-1),
+            consumption=consumption + day,
+            cost=0.1,
+            temperature=day % 30,
+            itemization=[
+                Itemization(
+                    id=day,
+                    category=MeasurementCategory.LIGHTING,
+                    usage=day,
+                    cost=1,
+                    percentage=100,
+                    cost_percentage=100,
+                )
+            ]
+            if day % 2
+            else None,
+        )
+        for day in days
+    ]
+
+
+def test_backfill_before_archived_reads(tmp_path: Path) -> None:
+    with UsageArchive(tmp_path / "usage.bda") as archive:
+        archive.append_reads(_reads(range(100, 300)))
+        assert archive.append_reads(_reads(range(10))) == 10
+        assert len(archive) == 210
+        assert list(archive.read()) == _reads(range(10)) + _reads(range(100, 300))
+    with UsageArchive(tmp_path / "usage.bda") as archive:
+        assert len(archive) == 210
+
+
+def test_middle_window_replaced_in_place(tmp_path: Path) -> None:
+    with UsageArchive(tmp_path / "usage.bda") as archive:
+        archive.append_reads(_reads(range(200)))
+        archive.append_reads(_reads(range(50, 60), consumption=5.0))
+        assert len(archive) == 200
+        assert list(archive.read()) == (
+            _reads(range(50)) + _reads(range(50, 60), 5.0) + _reads(range(60, 200))
+        )
@@ -0,0 +1,41 @@
+"""aiter_usage_batches argument checks and its call-time end default."""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+
+from bidgely import AggregateType, Bidgely
+
+
+def _batches(**kwargs: Any) -> list[Any]:
+    async def run() -> list[Any]:
+        async with Bidgely(
+            None, "HydroOttawa", "user@example.com", "password", "1"
+        ) as client:
+            planned: list[Any] = []
+
+            async def plan(*args: Any) -> list[tuple[datetime, datetime]]:
+                planned.append(args)
+                return []
+
+            client.async_plan_windows = plan  # type: ignore[method-assign,assignment]
+            async for _ in client.aiter_usage_batches(
+                "ELECTRIC", AggregateType.DAY, **kwargs
+            ):
+                pass
+            return planned
+
+    return asyncio.run(run())
+
+
+def test_lookahead_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        _batches(lookahead=0)
+
+
+def test_end_defaults_to_yesterday_at_call_time() -> None:
+    (args,) = _batches()
+    yesterday = datetime.now() - timedelta(days=1)
+    assert abs(args[3] - yesterday) < timedelta(seconds=5)
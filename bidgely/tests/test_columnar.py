@@ -0,0 +1,44 @@
+"""UsageColumns must keep each row's local time across DST changes."""
+
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from bidgely import UsageArchive
+from bidgely.columnar import UsageColumns
+
+TZ = ZoneInfo("America/Toronto")
+PAYLOAD = [
+    {
+        "intervalStartDate": start,
+        "intervalEndDate": end,
+        "consumption": 1.0,
+        "cost": 0.1,
+        "temperature": None,
+        "itemizationDetailsList": None,
+    }
+    for start, end in (
+        ("2024-01-01T00:00:00-05:00", "2024-01-01T23:59:59-05:00"),
+        ("2024-07-01T00:00:00-04:00", "2024-07-01T23:59:59-04:00"),
+    )
+]
+
+
+def test_rows_keep_their_offset_in_a_zone() -> None:
+    columns = UsageColumns.from_payload(PAYLOAD, tz=TZ)
+    assert [read.start_time.isoformat() for read in columns] == [
+        "2024-01-01T00:00:00-05:00",
+        "2024-07-01T00:00:00-04:00",
+    ]
+
+
+def test_archive_records_the_zone(tmp_path: Path) -> None:
+    with UsageArchive(tmp_path / "usage.bda") as archive:
+        archive.append(UsageColumns.from_payload(PAYLOAD))
+        archive.append(UsageColumns.from_payload(PAYLOAD[1:], tz=TZ))
+    with UsageArchive(tmp_path / "usage.bda") as archive:
+        assert archive.tz == TZ
+        assert [read.start_time for read in archive.read()] == [
+            datetime(2024, 1, 1, tzinfo=TZ),
+            datetime(2024, 7, 1, tzinfo=TZ),
+        ]
@@ -0,0 +1,89 @@
+"""One account failing must not cancel the rest of a fleet."""
+
+import asyncio
+from typing import Any
+
+import aiohttp
+
+from bidgely import BidgelyFleet, Credentials, LoginManager
+from bidgely.utilities.cognito import CognitoPool, LoginStats, get_cognito_pool
+
+CREDENTIALS = [
+    Credentials(
+        utility="HydroOttawa",
+        username=f"user{n}@example.com",
+        password="password",
+        account_id=str(n),
+    )
+    for n in range(4)
+]
+
+
+def _forecast(client: Any) -> Any:
+    async def forecast(measurement: str = "ELECTRIC", home: int = 1) -> str:
+        await asyncio.sleep(0.01)
+        if client.account_id == "1":
+            raise aiohttp.ClientConnectionError("connection reset")
+        return f"forecast {client.account_id}"
+
+    return forecast
+
+
+def test_transport_error_stays_with_its_account() -> None:
+    async def run() -> list[Any]:
+        async with BidgelyFleet(CREDENTIALS) as fleet:
+            for client in fleet.clients:
+                client.access_token = "token"
+                client.async_get_forecast = _forecast(client)  # type: ignore[method-assign]
+            return [result async for result in fleet.aiter_forecast()]
+
+    results = {result.credentials.account_id: result for result in asyncio.run(run())}
+    assert sorted(results) == ["0", "1", "2", "3"]
+    assert isinstance(results["1"].error, aiohttp.ClientConnectionError)
+    for account in ("0", "2", "3"):
+        assert results[account].ok
+        assert results[account].value == f"forecast {account}"
+
+
+def test_login_all_keeps_unexpected_errors_per_account() -> None:
+    async def run() -> list[Exception | None]:
+        async with BidgelyFleet(CREDENTIALS) as fleet:
+            for client in fleet.clients:
+
+                async def login(client: Any = client) -> None:
+                    if client.account_id == "2":
+                        raise asyncio.TimeoutError()
+
+                client.async_login = login  # type: ignore[method-assign]
+            return await LoginManager().async_login_all(fleet.clients)
+
+    errors = asyncio.run(run())
+    assert [type(err) for err in errors] == [
+        type(None),
+        type(None),
+        asyncio.TimeoutError,
+        type(None),
+    ]
+
+
+def test_login_manager_leaves_the_global_pool() -> None:
+    before = get_cognito_pool()
+    pool = CognitoPool(max_workers=1)
+    try:
+        assert LoginManager(pool=pool).pool is pool
+        assert get_cognito_pool() is before
+    finally:
+        pool.close()
+
+
+def test_login_stats_are_bounded() -> None:
+    stats = LoginStats(max_samples=3)
+    for seconds in range(10):
+        stats.record("login", float(seconds))
+    assert list(stats.stages["login"]) == [7.0, 8.0, 9.0]
+    assert stats.summary()["login"] == {
+        "count": 10,
+        "mean": 4.5,
+        "p50": 8.0,
+        "max": 9.0,
+    }
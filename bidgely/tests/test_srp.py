@@ -0,0 +1,18 @@
+"""A key pair fill must wait for a running fill instead of giving up."""
+
+import threading
+
+from bidgely.utilities import aws_srp
+
+
+def test_fill_waits_for_running_fill() -> None:
+    with aws_srp._key_pairs_filling:
+        aws_srp._key_pairs.clear()
+        thread = threading.Thread(target=aws_srp.fill_key_pairs, args=(4,))
+        thread.start()
+        thread.join(0.05)
+        assert thread.is_alive()
+        assert not aws_srp._key_pairs
+    thread.join()
+    assert len(aws_srp._key_pairs) == 4
+    aws_srp._key_pairs.clear()
@@ -0,0 +1,76 @@
+"""Incremental sync against reads that carry the utility's timezone."""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from bidgely import AggregateType, Bidgely, CostRead, UsageResult
+
+TZ = ZoneInfo("America/Toronto")
+
+
+def _sync(reads: list[CostRead], since: datetime | None = None) -> Any:
+    async def run() -> Any:
+        async with Bidgely(
+            None, "HydroOttawa", "user@example.com", "password", "1"
+        ) as client:
+
+            async def usage(*args: Any, **kwargs: Any) -> UsageResult:
+                return UsageResult(reads=reads, failed=[])
+
+            client.async_get_usage_result = usage  # type: ignore[method-assign]
+            result = await client.async_sync("ELECTRIC", AggregateType.DAY, since)
+            return result, client.watermarks
+
+    return asyncio.run(run())
+
+
+def _daily_reads(days: int) -> list[CostRead]:
+    today = datetime.now(TZ).replace(hour=0, minute=0, second=0, microsecond=0)
+    return [
+        CostRead(
+            start_time=today - timedelta(days=n),
+            end_time=today - timedelta(days=n - 1, seconds=1),
+            consumption=10.0,
+            cost=1.0,
+            temperature=None,
+            itemization=None,
+        )
+        for n in range(days, 0, -1)
+    ]
+
+
+def test_first_sync_without_since() -> None:
+    reads = _daily_reads(10)
+    result, watermarks = _sync(reads)
+    assert result.reads == reads
+    assert result.watermark is not None
+    assert watermarks[("ELECTRIC", str(AggregateType.DAY))] == result.watermark
+
+
+def test_naive_since_is_local_time() -> None:
+    reads = _daily_reads(10)
+    since = reads[5].start_time.astimezone().replace(tzinfo=None)
+    result, _ = _sync(reads, since)
+    assert result.reads == reads[5:]
+
+
+def test_naive_reads() -> None:
+    reads = [
+        CostRead(
+            start_time=read.start_time.astimezone().replace(tzinfo=None),
+            end_time=read.end_time.astimezone().replace(tzinfo=None),
+            consumption=read.consumption,
+            cost=read.cost,
+            temperature=None,
+            itemization=None,
+        )
+        for read in _daily_reads(10)
+    ]
+    first, _ = _sync(reads)
+    assert first.reads == reads
+    watermark = first.watermark
+    assert watermark is not None and watermark.tzinfo is None
+    second, _ = _sync(reads, watermark)
+    assert second.reads == [read for read in reads if read.start_time >= watermark]
@@ -0,0 +1,71 @@
+"""The SSO token must match the original py3rijndael implementation byte for byte."""
+
+import base64
+import json
+import random
+import string
+from collections import OrderedDict
+
+import pytest
+from py3rijndael import RijndaelCbc, ZeroPadding  # type: ignore[import-untyped]
+
+from bidgely.utilities.hydroottawa import (
+    TOKEN_IV,
+    TOKEN_KEY,
+    _encrypt,
+    create_bidgely_payload,
+    create_bidgely_token,
+    create_bidgely_tokens,
+)
+
+
+def _legacy_cipher() -> RijndaelCbc:
+    return RijndaelCbc(
+        key=TOKEN_KEY, iv=TOKEN_IV, padding=ZeroPadding(32), block_size=32
+    )
+
+
+def legacy_token(payload: OrderedDict[str, str]) -> str:
+    """create_bidgely_token as it was, with a new cipher per token."""
+    text = json.dumps(payload, separators=(",", ":")).encode()
+    result = _legacy_cipher().encrypt(text.ljust(32, b"\x1b"))
+    return base64.b64encode(result).decode()
+
+
+def _token(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_letters + string.digits + "-_", k=length))
+
+
+def _payloads() -> list[OrderedDict[str, str]]:
+    rng = random.Random(0)
+    return [
+        create_bidgely_payload("", "", ""),
+        create_bidgely_payload("1", "", ""),
+        *(
+            create_bidgely_payload(
+                str(1000000 + i), _token(rng, 800 + i), _token(rng, 1300 + 3 * i)
+            )
+            for i in range(32)
+        ),
+    ]
+
+
+def test_empty_payload() -> None:
+    assert create_bidgely_token(OrderedDict()) == legacy_token(OrderedDict())
+
+
+@pytest.mark.parametrize("payload", _payloads())
+def test_token_matches_legacy(payload: OrderedDict[str, str]) -> None:
+    assert create_bidgely_token(payload) == legacy_token(payload)
+
+
+def test_tokens_match_legacy() -> None:
+    payloads = _payloads()
+    assert create_bidgely_tokens(payloads) == [legacy_token(p) for p in payloads]
+    assert create_bidgely_tokens([]) == []
+
+
+@pytest.mark.parametrize("length", [0, 1, 31, 32, 33, 63, 64, 65, 200])
+def test_encrypt_matches_legacy_at_block_edges(length: int) -> None:
+    text = bytes(random.Random(length).randrange(1, 256) for _ in range(length))
+    assert _encrypt(text) == _legacy_cipher().encrypt(text)
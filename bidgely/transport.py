@@ -0,0 +1,159 @@
+"""HTTP transport settings and a session factory for Bidgely's NA API.
+
+A TransportProfile holds the connection pool, DNS cache, timeout and
+compression settings. create_session builds an aiohttp.ClientSession from
+one and counts how often pooled connections are reused, so a fleet sharing
+one session can check its pool stays warm.
+"""
+
+import weakref
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from pydantic.dataclasses import dataclass
+
+from .metrics import get_metrics_sink
+
+_STATS: "weakref.WeakKeyDictionary[aiohttp.ClientSession, ConnectionStats]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _accept_encoding() -> str:
+    """The encodings aiohttp can decode here; br needs the brotli package."""
+    try:
+        from aiohttp.compression_utils import HAS_BROTLI
+    except ImportError:  # pragma: no cover - aiohttp < 3.9
+        HAS_BROTLI = False
+    return "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+
+@dataclass(frozen=True, slots=True)
+class TransportProfile:
+    """Connection pool and timeout settings for requests to Bidgely.
+
+    limit caps open connections in the pool and limit_per_host those to one
+    host, so a fleet cannot open hundreds of sockets to naapi-read.
+    Connections idle for keepalive_timeout seconds are closed; DNS answers
+    are cached for ttl_dns_cache seconds. Timeouts are in seconds and None
+    disables one. compress asks for gzip, deflate and, when brotli is
+    installed, br responses, which shrinks itemization payloads severalfold.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 16
+    keepalive_timeout: float = 30.0
+    ttl_dns_cache: int | None = 300
+    total_timeout: float | None = 30.0
+    connect_timeout: float | None = 10.0
+    read_timeout: float | None = 20.0
+    compress: bool = True
+
+    def timeout(self) -> aiohttp.ClientTimeout:
+        """Return the ClientTimeout for one request."""
+        return aiohttp.ClientTimeout(
+            total=self.total_timeout,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+
+    def headers(self) -> dict[str, str]:
+        """Return headers to send with every request."""
+        return {"Accept-Encoding": _accept_encoding()} if self.compress else {}
+
+    def connector(self) -> aiohttp.TCPConnector:
+        """Return a new connector with the pool settings.
+
+        Create it inside a running event loop.
+        """
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.ttl_dns_cache is not None,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+
+
+# Short API calls: fail fast so retries kick in.
+API_PROFILE = TransportProfile()
+# Backfills of many large windows: more parallel connections and time to
+# read big itemization responses.
+BACKFILL_PROFILE = TransportProfile(
+    limit_per_host=32,
+    keepalive_timeout=60.0,
+    total_timeout=120.0,
+    read_timeout=60.0,
+)
+
+
+class ConnectionStats:
+    """Count new and reused connections and DNS cache hits on a session."""
+
+    def __init__(self) -> None:
+        self.created: int = 0
+        self.reused: int = 0
+        self.dns_hits: int = 0
+        self.dns_misses: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """The share of requests that got a pooled connection."""
+        total = self.created + self.reused
+        return self.reused / total if total else 0.0
+
+    def _count(self, event: str) -> None:
+        get_metrics_sink().increment("bidgely_connections_total", 1.0, {"event": event})
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a TraceConfig that updates these counts."""
+        config = aiohttp.TraceConfig()
+
+        async def on_create(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+            self.created += 1
+            self._count("created")
+
+        async def on_reuse(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+            self.reused += 1
+            self._count("reused")
+
+        async def on_dns_hit(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+            self.dns_hits += 1
+
+        async def on_dns_miss(session: Any, ctx: SimpleNamespace, params: Any) -> None:
+            self.dns_misses += 1
+
+        config.on_connection_create_end.append(on_create)
+        config.on_connection_reuseconn.append(on_reuse)
+        config.on_dns_cache_hit.append(on_dns_hit)
+        config.on_dns_cache_miss.append(on_dns_miss)
+        return config
+
+
+def create_session(
+    profile: TransportProfile = API_PROFILE,
+    trace_configs: list[aiohttp.TraceConfig] | None = None,
+    **kwargs: Any,
+) -> aiohttp.ClientSession:
+    """Return a ClientSession set up with profile.
+
+    Extra keyword arguments go to ClientSession. Create the session inside
+    a running event loop and close it when done; connection_stats(session)
+    returns its reuse counts.
+    """
+    stats = ConnectionStats()
+    session = aiohttp.ClientSession(
+        connector=profile.connector(),
+        timeout=profile.timeout(),
+        headers=profile.headers(),
+        trace_configs=[*(trace_configs or ()), stats.trace_config()],
+        **kwargs,
+    )
+    _STATS[session] = stats
+    return session
+
+
+def connection_stats(session: aiohttp.ClientSession) -> ConnectionStats | None:
+    """Return the reuse counts of a session from create_session, else None."""
+    return _STATS.get(session)
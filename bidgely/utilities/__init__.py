@@ -1,16 +1,100 @@
-"""Directory of all supported utility websites that use Bidgely NA-Read API."""
+"""Directory of all supported utility websites that use Bidgely NA-Read API.
+
+Utilities are registered by name and only imported, together with their
+dependencies, the first time they are selected. Third-party packages can
+add utilities through the ``bidgely.utilities`` entry point group, where the
+entry point name is the utility name and the object is its UtilityBase
+subclass.
+"""
+from importlib import import_module
+from importlib.metadata import entry_points
 
 from .base import UtilityBase
 
-__all__ = ["UtilityBase"]
+__all__ = [
+    "UtilityBase",
+    "get_utility",
+    "load_all_utilities",
+    "register_utility",
+    "utility_names",
+]
 
-# Import all modules in the current directory.
-from importlib import import_module
-from pathlib import Path
-
-for f in Path(__file__).parent.glob("*.py"):
-    module_name = f.stem
-    if (not module_name.startswith("_")) and (module_name not in globals()):
-        import_module(f".{module_name}", __package__)
-    del f, module_name
-del import_module, Path
+ENTRY_POINT_GROUP = "bidgely.utilities"
+
+# Lower-cased name -> "module:Class", replaced by the class once imported.
+_REGISTRY: dict[str, str | type[UtilityBase]] = {}
+
+
+def register_utility(
+    target: str | type[UtilityBase], *names: str, replace: bool = False
+) -> None:
+    """Register a utility class, or a lazy "module:Class" path, under names."""
+    for name in names:
+        key = name.lower()
+        if not replace and key in _REGISTRY and _REGISTRY[key] != target:
+            raise ValueError(f"Utility {name} is already registered")
+        _REGISTRY[key] = target
+
+
+def _load(key: str) -> type[UtilityBase]:
+    target = _REGISTRY[key]
+    if not isinstance(target, str):
+        return target
+    module_name, _, class_name = target.partition(":")
+    utility: type[UtilityBase] = getattr(import_module(module_name), class_name)
+    # Every alias of the same path now gets the class.
+    for alias, other in list(_REGISTRY.items()):
+        if other == target:
+            _REGISTRY[alias] = utility
+    return utility
+
+
+def _load_entry_point(key: str) -> type[UtilityBase] | None:
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name.lower() == key:
+            utility: type[UtilityBase] = entry_point.load()
+            register_utility(
+                utility, entry_point.name, utility.name(), utility.__name__
+            )
+            return utility
+    return None
+
+
+def get_utility(name: str) -> type[UtilityBase]:
+    """Return the utility with the given name, importing it on first use."""
+    key = name.lower()
+    if key in _REGISTRY:
+        return _load(key)
+    utility = _load_entry_point(key)
+    if utility is not None:
+        return utility
+    # Subclasses defined without registering, e.g. in a script.
+    for utility in UtilityBase.__subclasses__():
+        if key in [utility.name().lower(), utility.__name__.lower()]:
+            return utility
+    raise ValueError(f"Utility {name} not found")
+
+
+def utility_names() -> list[str]:
+    """Return every name a utility can be selected by, without importing it."""
+    names = set(_REGISTRY)
+    names.update(ep.name.lower() for ep in entry_points(group=ENTRY_POINT_GROUP))
+    return sorted(names)
+
+
+def load_all_utilities() -> list[type[UtilityBase]]:
+    """Import and return every registered utility."""
+    utilities: list[type[UtilityBase]] = []
+    for name in utility_names():
+        utility = get_utility(name)
+        if utility not in utilities:
+            utilities.append(utility)
+    for utility in UtilityBase.__subclasses__():
+        if utility not in utilities:
+            utilities.append(utility)
+    return utilities
+
+
+register_utility(
+    "bidgely.utilities.hydroottawa:HydroOttawa", "Hydro Ottawa", "HydroOttawa"
+)
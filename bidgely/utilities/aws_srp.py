@@ -3,17 +3,28 @@
 import asyncio
 import base64
 import binascii
+import concurrent.futures
 import datetime
 import functools
 import hashlib
 import hmac
 import os
 import re
+import threading
+from collections import deque
 from typing import Any, Final
 
 import botocore
 import boto3
 
+try:
+    import gmpy2  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional accelerator
+    gmpy2 = None
+    BIG_INT_BACKEND = "int"
+else:
+    BIG_INT_BACKEND = "gmpy2"
+
 
 # https://github.com/aws/amazon-cognito-identity-js/blob/master/src/AuthenticationHelper.js#L22
 n_hex = (
@@ -37,6 +48,8 @@ n_hex = (
 # https://github.com/aws/amazon-cognito-identity-js/blob/master/src/AuthenticationHelper.js#L49
 G_HEX: Final[str] = "2"
 INFO_BITS: Final[bytearray] = bytearray("Caldera Derived Key", "utf-8")
+# Number of A values kept ready by prefill_key_pairs() unless told otherwise.
+KEY_POOL_SIZE: Final[int] = 64
 
 
 def hash_sha256(buf: bytes) -> str:
@@ -57,6 +70,13 @@ def long_to_hex(long_num: int) -> str:
     return "%x" % long_num
 
 
+def powmod(base: int, exp: int, mod: int) -> int:
+    """pow(base, exp, mod), using gmpy2 when it is installed."""
+    if gmpy2 is not None:
+        return int(gmpy2.powmod(base, exp, mod))
+    return pow(base, exp, mod)
+
+
 def get_random(nbytes: int) -> int:
     random_hex = binascii.hexlify(os.urandom(nbytes))
     return hex_to_long(random_hex)
@@ -93,6 +113,55 @@ def compute_hkdf(ikm: bytes, salt: bytes) -> bytes:
     return hmac_hash[:16]
 
 
+# The group is fixed, so N, g and k = H(N | g) are computed once per process.
+BIG_N: Final[int] = hex_to_long(n_hex)
+G: Final[int] = hex_to_long(G_HEX)
+K: Final[int] = hex_to_long(hex_hash("00" + n_hex + "0" + G_HEX))
+
+# Ready (a, A) pairs. Each pair is popped exactly once, never reused.
+_key_pairs: deque[tuple[int, int]] = deque()
+_key_pairs_filling = threading.Lock()
+
+
+def generate_key_pair() -> tuple[int, int]:
+    """
+    Generate a random private value a and the public value A = g^a%N
+    :return {Tuple} (small a, large A).
+    """
+    small_a = get_random(128) % BIG_N
+    big_a = powmod(G, small_a, BIG_N)
+    # safety check
+    if (big_a % BIG_N) == 0:
+        raise ValueError("Safety check for A failed")
+    return small_a, big_a
+
+
+def take_key_pair() -> tuple[int, int]:
+    """Pop a precomputed (a, A) pair, generating one if none are ready."""
+    try:
+        return _key_pairs.popleft()
+    except IndexError:
+        return generate_key_pair()
+
+
+def fill_key_pairs(count: int = KEY_POOL_SIZE) -> None:
+    """Generate (a, A) pairs until count are ready. Blocks; run it in a thread.
+
+    A call made while another fill is running waits for it, then tops the
+    queue up to its own count.
+    """
+    with _key_pairs_filling:
+        while len(_key_pairs) < count:
+            _key_pairs.append(generate_key_pair())
+
+
+def prefill_key_pairs(
+    executor: concurrent.futures.Executor, count: int = KEY_POOL_SIZE
+) -> concurrent.futures.Future[None]:
+    """Start generating (a, A) pairs on executor ahead of a batch of logins."""
+    return executor.submit(fill_key_pairs, count)
+
+
 def calculate_u(big_a: int, big_b: int) -> int:
     """
     Calculate the client's value U which is the hash of A and B
@@ -122,6 +191,7 @@ class AWSSRP(object):
         pool_region: str | None = None,
         client: str | None = None,
         client_secret: str | None = None,
+        executor: concurrent.futures.Executor | None = None,
     ):
         if pool_region is not None and client is not None:
             raise ValueError(
@@ -137,12 +207,12 @@ class AWSSRP(object):
         self.client = (
             client if client else boto3.client("cognito-idp", region_name=pool_region)
         )
-        self.big_n = hex_to_long(n_hex)
-        self.g = hex_to_long(G_HEX)
-        self.k = hex_to_long(hex_hash("00" + n_hex + "0" + G_HEX))
-        self.small_a_value = self.generate_random_small_a()
-        self.large_a_value = self.calculate_a()
+        self.big_n = BIG_N
+        self.g = G
+        self.k = K
+        self.small_a_value, self.large_a_value = take_key_pair()
         self.loop = loop
+        self.executor = executor
 
     def generate_random_small_a(self) -> int:
         """
@@ -159,7 +229,7 @@ class AWSSRP(object):
         :param {Long integer} a Randomly generated small A.
         :return {Long integer} Computed large A.
         """
-        big_a = pow(self.g, self.small_a_value, self.big_n)
+        big_a = powmod(self.g, self.small_a_value, self.big_n)
         # safety check
         if (big_a % self.big_n) == 0:
             raise ValueError("Safety check for A failed")
@@ -183,9 +253,9 @@ class AWSSRP(object):
         username_password_hash = hash_sha256(username_password.encode("utf-8"))
 
         x_value = hex_to_long(hex_hash(pad_hex(salt) + username_password_hash))
-        g_mod_pow_xn = pow(self.g, x_value, self.big_n)
-        int_value2 = server_b_value - self.k * g_mod_pow_xn
-        s_value = pow(int_value2, self.small_a_value + u_value * x_value, self.big_n)
+        g_mod_pow_xn = powmod(self.g, x_value, self.big_n)
+        int_value2 = (server_b_value - self.k * g_mod_pow_xn) % self.big_n
+        s_value = powmod(int_value2, self.small_a_value + u_value * x_value, self.big_n)
         hkdf = compute_hkdf(
             bytearray.fromhex(pad_hex(s_value)),
             bytearray.fromhex(pad_hex(long_to_hex(u_value))),
@@ -263,7 +333,7 @@ class AWSSRP(object):
         auth_params = self.get_auth_params()
 
         response = await self.loop.run_in_executor(
-            None,
+            self.executor,
             functools.partial(
                 boto_client.initiate_auth,
                 AuthFlow="USER_SRP_AUTH",
@@ -273,9 +343,16 @@ class AWSSRP(object):
         )
 
         if response["ChallengeName"] == self.PASSWORD_VERIFIER_CHALLENGE:
-            challenge_response = self.process_challenge(response["ChallengeParameters"])
+            # The challenge needs two 3072-bit modular exponentiations. Each
+            # pow() holds the GIL, so the executor only splits the stall into
+            # one pause per exponentiation; the loop is not freed meanwhile.
+            challenge_response = await self.loop.run_in_executor(
+                self.executor,
+                self.process_challenge,
+                response["ChallengeParameters"],
+            )
             tokens = await self.loop.run_in_executor(
-                None,
+                self.executor,
                 functools.partial(
                     boto_client.respond_to_auth_challenge,
                     ClientId=self.client_id,
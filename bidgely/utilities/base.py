@@ -1,6 +1,10 @@
 import aiohttp
 from pydantic import BaseModel
 
+from bidgely.auth import AuthTokens
+
+from .cognito import CognitoPool
+
 
 # https://www.bidgely.com/customers/
 class UtilityBase(BaseModel):
@@ -30,3 +34,37 @@ class UtilityBase(BaseModel):
         :raises InvalidAuth: if login information is incorrect
         """
         raise NotImplementedError
+
+    @classmethod
+    async def async_login_tokens(
+        cls,
+        session: aiohttp.ClientSession,
+        username: str,
+        password: str,
+        account_id: str,
+        pool: CognitoPool | None = None,
+    ) -> AuthTokens:
+        """Login to the utility website and return tokens with their expiry.
+
+        Utilities that know when their token expires, or can refresh it,
+        should override this. The default has no expiry or refresh token.
+        Utilities that sign in through AWS Cognito use pool, or the
+        process-wide one when it is None.
+        """
+        user_id, access_token = await cls.async_login(
+            session, username, password, account_id
+        )
+        return AuthTokens(user_id=user_id, access_token=access_token)
+
+    @staticmethod
+    async def async_refresh(
+        session: aiohttp.ClientSession,
+        refresh_token: str,
+        account_id: str,
+        pool: CognitoPool | None = None,
+    ) -> AuthTokens:
+        """Get a new Bidgely token without the password.
+
+        :raises InvalidAuth: if the refresh token is no longer valid
+        """
+        raise NotImplementedError
@@ -0,0 +1,127 @@
+"""Shared AWS Cognito clients and login thread pool."""
+
+import asyncio
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any
+
+from bidgely.metrics import get_metrics_sink
+
+
+class LoginStats:
+    """Durations of each login stage, in seconds.
+
+    Count, total and max cover every measurement; the median is taken over
+    the last max_samples of each stage, so memory stays bounded however long
+    the process runs.
+    """
+
+    def __init__(self, max_samples: int = 1024) -> None:
+        self.max_samples: int = max_samples
+        self.stages: dict[str, deque[float]] = {}
+        self._counts: Counter[str] = Counter()
+        self._totals: dict[str, float] = {}
+        self._maxima: dict[str, float] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add one measurement for stage and report it to the metrics sink."""
+        if stage not in self.stages:
+            self.stages[stage] = deque(maxlen=self.max_samples)
+        self.stages[stage].append(seconds)
+        self._counts[stage] += 1
+        self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+        self._maxima[stage] = max(self._maxima.get(stage, seconds), seconds)
+        get_metrics_sink().observe(
+            "bidgely_login_stage_seconds", seconds, {"stage": stage}
+        )
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Record how long the block takes under stage."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - t0)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Return count, mean, median and max for every stage."""
+        return {
+            stage: {
+                "count": self._counts[stage],
+                "mean": self._totals[stage] / self._counts[stage],
+                "p50": statistics.median(values),
+                "max": self._maxima[stage],
+            }
+            for stage, values in self.stages.items()
+        }
+
+
+class CognitoPool:
+    """One boto3 Cognito client per region and a bounded pool for its calls.
+
+    boto3 clients are thread-safe, so every login in the process can share
+    them instead of paying for client construction each time. endpoint_url
+    overrides the AWS endpoint, e.g. for a local stand-in.
+    """
+
+    def __init__(self, max_workers: int = 8, endpoint_url: str | None = None) -> None:
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bidgely-cognito"
+        )
+        self.stats = LoginStats()
+        self._clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.endpoint_url: str | None = endpoint_url
+
+    def _client(self, region: str) -> Any:
+        with self._lock:
+            if region not in self._clients:
+                import boto3
+
+                with self.stats.timed("cognito_client"):
+                    self._clients[region] = boto3.client(
+                        "cognito-idp", region, endpoint_url=self.endpoint_url
+                    )
+            return self._clients[region]
+
+    async def async_client(self, region: str) -> Any:
+        """Return the shared cognito-idp client for region."""
+        client = self._clients.get(region)
+        if client is not None:
+            return client
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, self._client, region
+        )
+
+    def prefill_srp(self, count: int) -> None:
+        """Start generating SRP key pairs for count upcoming logins."""
+        from .aws_srp import prefill_key_pairs
+
+        prefill_key_pairs(self.executor, count)
+
+    def close(self) -> None:
+        """Shut down the thread pool."""
+        self.executor.shutdown(wait=False)
+
+
+_POOL: CognitoPool | None = None
+
+
+def get_cognito_pool() -> CognitoPool:
+    """Return the process-wide pool, creating it on first use."""
+    global _POOL
+    if _POOL is None:
+        _POOL = CognitoPool()
+    return _POOL
+
+
+def set_cognito_pool(pool: CognitoPool) -> None:
+    """Replace the process-wide pool, e.g. to size it for a large fleet."""
+    global _POOL
+    _POOL = pool
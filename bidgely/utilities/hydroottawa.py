@@ -1,20 +1,41 @@
 import base64
+import functools
 import json
 import logging
 import re
+import struct
 from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import ClassVar
 
 import aiohttp
-import boto3
+from botocore.exceptions import (  # type: ignore[import-untyped]
+    BotoCoreError,
+    ClientError as BotoClientError,
+)
 from py3rijndael import RijndaelCbc, ZeroPadding
+from py3rijndael.constants import T1, T2, T3, T4, S
 
-from bidgely.exceptions import InvalidAuth
+from bidgely.auth import AuthTokens
+from bidgely.exceptions import CannotConnect, InvalidAuth
 
 from .aws_srp import AWSSRP
 from .base import UtilityBase
+from .cognito import CognitoPool, LoginStats, get_cognito_pool
 
 logger = logging.getLogger(__name__)
 
+REGION = "ca-central-1"
+POOL_ID = "ca-central-1_VYnwOhMBK"
+CLIENT_ID = "7scfcis6ecucktmp4aqi1jk6cb"
+SSO_URL = "https://usage.hydroottawa.com/api/v1/sso/dashboard"
+
+TOKEN_KEY = "tG@$=gQGyu_Lcqvt/4Vb6y4sWV6j-VmC"
+TOKEN_IV = "%rAn_BLzP+JwAAGGXe5PQ(ZrBgtpfUzq"
+BLOCK_SIZE = 32
+_WORDS = struct.Struct(">8I")
+
 
 def create_bidgely_payload(
     account_id: str, access_token: str, refresh_token: str
@@ -32,21 +53,166 @@ def create_bidgely_payload(
     )
 
 
-def create_bidgely_token(payload: OrderedDict[str, str]) -> str:
-    cipher = RijndaelCbc(
-        key="tG@$=gQGyu_Lcqvt/4Vb6y4sWV6j-VmC",
-        iv="%rAn_BLzP+JwAAGGXe5PQ(ZrBgtpfUzq",
-        padding=ZeroPadding(32),
-        block_size=32,
+@functools.cache
+def _token_cipher() -> RijndaelCbc:
+    "Rijndael-256 with the SSO key; the key schedule is built once."
+    return RijndaelCbc(
+        key=TOKEN_KEY,
+        iv=TOKEN_IV,
+        padding=ZeroPadding(BLOCK_SIZE),
+        block_size=BLOCK_SIZE,
+    )
+
+
+def _round(t: tuple[int, ...], k: list[int]) -> tuple[int, ...]:
+    "One full Rijndael round on a 256-bit block, whose rows shift by 1, 3 and 4."
+    t0, t1, t2, t3, t4, t5, t6, t7 = t
+    return (
+        T1[t0 >> 24]
+        ^ T2[(t1 >> 16) & 0xFF]
+        ^ T3[(t3 >> 8) & 0xFF]
+        ^ T4[t4 & 0xFF]
+        ^ k[0],
+        T1[t1 >> 24]
+        ^ T2[(t2 >> 16) & 0xFF]
+        ^ T3[(t4 >> 8) & 0xFF]
+        ^ T4[t5 & 0xFF]
+        ^ k[1],
+        T1[t2 >> 24]
+        ^ T2[(t3 >> 16) & 0xFF]
+        ^ T3[(t5 >> 8) & 0xFF]
+        ^ T4[t6 & 0xFF]
+        ^ k[2],
+        T1[t3 >> 24]
+        ^ T2[(t4 >> 16) & 0xFF]
+        ^ T3[(t6 >> 8) & 0xFF]
+        ^ T4[t7 & 0xFF]
+        ^ k[3],
+        T1[t4 >> 24]
+        ^ T2[(t5 >> 16) & 0xFF]
+        ^ T3[(t7 >> 8) & 0xFF]
+        ^ T4[t0 & 0xFF]
+        ^ k[4],
+        T1[t5 >> 24]
+        ^ T2[(t6 >> 16) & 0xFF]
+        ^ T3[(t0 >> 8) & 0xFF]
+        ^ T4[t1 & 0xFF]
+        ^ k[5],
+        T1[t6 >> 24]
+        ^ T2[(t7 >> 16) & 0xFF]
+        ^ T3[(t1 >> 8) & 0xFF]
+        ^ T4[t2 & 0xFF]
+        ^ k[6],
+        T1[t7 >> 24]
+        ^ T2[(t0 >> 16) & 0xFF]
+        ^ T3[(t2 >> 8) & 0xFF]
+        ^ T4[t3 & 0xFF]
+        ^ k[7],
+    )
+
+
+def _final_round(t: tuple[int, ...], k: list[int]) -> tuple[int, ...]:
+    "The last round, which has no MixColumns."
+    t0, t1, t2, t3, t4, t5, t6, t7 = t
+    return (
+        (
+            S[t0 >> 24] << 24
+            | S[(t1 >> 16) & 0xFF] << 16
+            | S[(t3 >> 8) & 0xFF] << 8
+            | S[t4 & 0xFF]
+        )
+        ^ k[0],
+        (
+            S[t1 >> 24] << 24
+            | S[(t2 >> 16) & 0xFF] << 16
+            | S[(t4 >> 8) & 0xFF] << 8
+            | S[t5 & 0xFF]
+        )
+        ^ k[1],
+        (
+            S[t2 >> 24] << 24
+            | S[(t3 >> 16) & 0xFF] << 16
+            | S[(t5 >> 8) & 0xFF] << 8
+            | S[t6 & 0xFF]
+        )
+        ^ k[2],
+        (
+            S[t3 >> 24] << 24
+            | S[(t4 >> 16) & 0xFF] << 16
+            | S[(t6 >> 8) & 0xFF] << 8
+            | S[t7 & 0xFF]
+        )
+        ^ k[3],
+        (
+            S[t4 >> 24] << 24
+            | S[(t5 >> 16) & 0xFF] << 16
+            | S[(t7 >> 8) & 0xFF] << 8
+            | S[t0 & 0xFF]
+        )
+        ^ k[4],
+        (
+            S[t5 >> 24] << 24
+            | S[(t6 >> 16) & 0xFF] << 16
+            | S[(t0 >> 8) & 0xFF] << 8
+            | S[t1 & 0xFF]
+        )
+        ^ k[5],
+        (
+            S[t6 >> 24] << 24
+            | S[(t7 >> 16) & 0xFF] << 16
+            | S[(t1 >> 8) & 0xFF] << 8
+            | S[t2 & 0xFF]
+        )
+        ^ k[6],
+        (
+            S[t7 >> 24] << 24
+            | S[(t0 >> 16) & 0xFF] << 16
+            | S[(t2 >> 8) & 0xFF] << 8
+            | S[t3 & 0xFF]
+        )
+        ^ k[7],
     )
+
+
+def _encrypt(text: bytes) -> bytes:
+    """Same output as RijndaelCbc.encrypt, working on 32-bit words.
+
+    py3rijndael builds every block byte by byte; this keeps its key schedule
+    and tables but unrolls each round over the block's eight words.
+    """
+    cipher = _token_cipher()
+    k_e = cipher.Ke
+    middle = k_e[1:-1]
+    text = cipher.padding.encode(text)
+    previous = _WORDS.unpack(TOKEN_IV.encode())
+    result = bytearray()
+    for offset in range(0, len(text), BLOCK_SIZE):
+        block = _WORDS.unpack_from(text, offset)
+        t = tuple(w ^ v ^ k for w, v, k in zip(block, previous, k_e[0]))
+        for k in middle:
+            t = _round(t, k)
+        previous = _final_round(t, k_e[-1])
+        result += _WORDS.pack(*previous)
+    return bytes(result)
+
+
+def create_bidgely_token(payload: OrderedDict[str, str]) -> str:
     text = json.dumps(payload, separators=(",", ":")).encode()
-    result = cipher.encrypt(text.ljust(32, b"\x1b"))
+    result = _encrypt(text.ljust(BLOCK_SIZE, b"\x1b"))
     return base64.b64encode(result).decode()
 
 
+def create_bidgely_tokens(payloads: Iterable[OrderedDict[str, str]]) -> list[str]:
+    "Encrypt many SSO payloads, e.g. for a fleet of logins, in one call."
+    return [create_bidgely_token(payload) for payload in payloads]
+
+
 class HydroOttawa(UtilityBase):
     "Hydro Ottawa."
 
+    # Where Cognito tokens are exchanged for a Bidgely session.
+    sso_url: ClassVar[str] = SSO_URL
+
     @staticmethod
     def name() -> str:
         """Distinct recognizable name of the utility."""
@@ -65,34 +231,111 @@ class HydroOttawa(UtilityBase):
         account_id: str,
     ) -> tuple[str, str]:
         "Returns user-id and token for Bidgely."
-        client = await session.loop.run_in_executor(
-            None,
-            boto3.client,
-            "cognito-idp",
-            "ca-central-1",
+        tokens = await HydroOttawa.async_login_tokens(
+            session, username, password, account_id
         )
+        return (tokens.user_id, tokens.access_token)
+
+    @classmethod
+    async def async_login_tokens(
+        cls,
+        session: aiohttp.ClientSession,
+        username: str,
+        password: str,
+        account_id: str,
+        pool: CognitoPool | None = None,
+    ) -> AuthTokens:
+        "Returns Bidgely tokens along with the Cognito refresh token."
+        if pool is None:
+            pool = get_cognito_pool()
+        client = await pool.async_client(REGION)
         aws = AWSSRP(
             username=username,
             password=password,
-            pool_id="ca-central-1_VYnwOhMBK",
-            client_id="7scfcis6ecucktmp4aqi1jk6cb",
+            pool_id=POOL_ID,
+            client_id=CLIENT_ID,
             client=client,
             loop=session.loop,
+            executor=pool.executor,
         )
-        tokens = await aws.authenticate_user()
+        try:
+            with pool.stats.timed("srp"):
+                tokens = await aws.authenticate_user()
+        except (
+            client.exceptions.NotAuthorizedException,
+            client.exceptions.UserNotFoundException,
+        ) as err:
+            raise InvalidAuth(err)
+        except (BotoCoreError, BotoClientError) as err:
+            raise CannotConnect(err) from err
         auth_result = tokens["AuthenticationResult"]
-
-        payload = create_bidgely_payload(
+        return await _async_sso(
+            session,
+            pool.stats,
+            cls.sso_url,
             account_id,
             auth_result["AccessToken"],
             auth_result["RefreshToken"],
+            auth_result["ExpiresIn"],
         )
+
+    @staticmethod
+    async def async_refresh(
+        session: aiohttp.ClientSession,
+        refresh_token: str,
+        account_id: str,
+        pool: CognitoPool | None = None,
+    ) -> AuthTokens:
+        "Trade the Cognito refresh token for a new Bidgely token."
+        if pool is None:
+            pool = get_cognito_pool()
+        client = await pool.async_client(REGION)
+        try:
+            with pool.stats.timed("refresh"):
+                tokens = await session.loop.run_in_executor(
+                    pool.executor,
+                    functools.partial(
+                        client.initiate_auth,
+                        AuthFlow="REFRESH_TOKEN_AUTH",
+                        AuthParameters={"REFRESH_TOKEN": refresh_token},
+                        ClientId=CLIENT_ID,
+                    ),
+                )
+        except client.exceptions.NotAuthorizedException as err:
+            raise InvalidAuth(err)
+        except (BotoCoreError, BotoClientError) as err:
+            raise CannotConnect(err) from err
+        auth_result = tokens["AuthenticationResult"]
+        return await _async_sso(
+            session,
+            pool.stats,
+            HydroOttawa.sso_url,
+            account_id,
+            auth_result["AccessToken"],
+            refresh_token,
+            auth_result["ExpiresIn"],
+        )
+
+
+async def _async_sso(
+    session: aiohttp.ClientSession,
+    stats: LoginStats,
+    sso_url: str,
+    account_id: str,
+    access_token: str,
+    refresh_token: str,
+    expires_in: int,
+) -> AuthTokens:
+    "Exchange Cognito tokens for a Bidgely user-id and bearer token."
+    with stats.timed("bidgely_token"):
+        payload = create_bidgely_payload(account_id, access_token, refresh_token)
         bidgely_token = create_bidgely_token(payload)
 
-        body = {"sessionToken": bidgely_token}
+    body = {"sessionToken": bidgely_token}
 
+    with stats.timed("sso"):
         async with session.post(
-            "https://usage.hydroottawa.com/api/v1/sso/dashboard",
+            sso_url,
             data=body,
             allow_redirects=False,
         ) as resp:
@@ -102,12 +345,17 @@ class HydroOttawa(UtilityBase):
                 if r is not None:
                     user_id = r.group(1)
                     bearer_token = r.group(2)
-                    logger.debug(f"Successful token retrieved for user-id: {user_id}")
+                    logger.debug("Successful token retrieved for user-id: %s", user_id)
                 else:
-                    logger.debug(f"Bidgely login failed for {username}")
+                    logger.debug("Bidgely login failed for account %s", account_id)
                     raise InvalidAuth  # InvalidAuth
             else:
-                logger.debug(f"Bidgely login failed for {username}")
+                logger.debug("Bidgely login failed for account %s", account_id)
                 raise InvalidAuth  # InvalidAuth()
 
-        return (user_id, bearer_token)
+    return AuthTokens(
+        user_id=user_id,
+        access_token=bearer_token,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+        refresh_token=refresh_token,
+    )